@@ -0,0 +1,60 @@
+# Capture latency: one-shot camera per burst vs. a persistent CameraService.
+# Runs on the simulated backend, so no camera is needed:
+#   python -m benchmarks.bench_capture
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from src.camera.camera_service import CameraService, SimulatedBackend
+
+
+def first_frame_latency(camera: CameraService, raw_dir: Path, burst_count: int, interval_s: float) -> float:
+    t0 = time.perf_counter()
+    camera.capture_burst(raw_dir, burst_count=1, interval_s=interval_s)
+    first = time.perf_counter() - t0
+    if burst_count > 1:
+        camera.capture_burst(raw_dir, burst_count=burst_count - 1, interval_s=interval_s)
+    return first
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--events", type=int, default=10)
+    ap.add_argument("--burst-count", type=int, default=6)
+    ap.add_argument("--interval-s", type=float, default=0.15)
+    ap.add_argument("--warmup-s", type=float, default=0.1)
+    ap.add_argument("--open-cost-s", type=float, default=0.25,
+                    help="simulated open/configure/start cost of the real camera")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_dir = Path(tmp)
+
+        # One-shot: open + configure + warm-up on every event (old behaviour)
+        one_shot = []
+        for _ in range(args.events):
+            t0 = time.perf_counter()
+            time.sleep(args.open_cost_s)
+            cam = CameraService(SimulatedBackend(), warmup_s=args.warmup_s)
+            cam.start()
+            cam.capture_burst(raw_dir, burst_count=1, interval_s=args.interval_s)
+            one_shot.append(time.perf_counter() - t0)
+            cam.close()
+
+        # Persistent: opened once, bursts served straight away
+        persistent = []
+        with CameraService(SimulatedBackend(), warmup_s=args.warmup_s) as cam:
+            for _ in range(args.events):
+                persistent.append(first_frame_latency(cam, raw_dir, args.burst_count, args.interval_s))
+
+    print(f"trigger -> first frame, median over {args.events} events")
+    print(f"  one-shot camera : {statistics.median(one_shot) * 1000:8.1f} ms")
+    print(f"  CameraService   : {statistics.median(persistent) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
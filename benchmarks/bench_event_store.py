@@ -0,0 +1,87 @@
+# A year of synthetic events in EventStore: insert throughput, submit() latency
+# seen by the caller, and the CLI-style queries.
+#   python -m benchmarks.bench_event_store --per-day 100
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.storage.event_store import UNKNOWN_NAME, EventStore
+from src.utils.timestamp_utils import iso_timestamp, now
+
+NAMES = ["alice", "bob", "carol", UNKNOWN_NAME]
+WIFI = ["WIFI_OK_USED_GOOGLE_VISION", "WIFI_DOWN_USED_OFFLINE_FALLBACK"]
+
+
+def _events(days: int, per_day: int) -> List[Dict[str, Any]]:
+    rng = random.Random(0)
+    start = now() - timedelta(days=days)
+    out = []
+    for i in range(days * per_day):
+        ts = start + timedelta(seconds=i * 86400.0 / per_day)
+        faces = [{"name": rng.choice(NAMES), "bbox_xyxy": [10, 10, 90, 90], "confidence": 0.9}
+                 for _ in range(rng.choice((0, 1, 1, 2)))]
+        person = rng.random() < 0.6
+        out.append({
+            "timestamp": iso_timestamp(ts),
+            "image": {"raw_path": f"raw/{i}.jpg", "processed_path": f"processed/{i}.jpg", "width": 1280, "height": 960},
+            "faces": faces,
+            "objects": [{"label": "Person", "confidence": 0.8}] if person else [],
+            "verdict": {"person_detected": person, "face_detected": bool(faces), "level": "HIGH" if person else "LOW"},
+            "wifi_status": WIFI[rng.random() < 0.05],
+            "timings": {"capture": 700.0, "vision": 450.0, "total": 1500.0},
+        })
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--per-day", type=int, default=100)
+    args = ap.parse_args()
+
+    events = _events(args.days, args.per_day)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EventStore(Path(tmp) / "events.sqlite3")
+
+        t0 = time.perf_counter()
+        for i in range(0, len(events), 500):
+            store.add_many(events[i:i + 500])
+        s = time.perf_counter() - t0
+        print(f"add_many  : {len(events)} events in {s:.2f} s ({len(events) / s:.0f}/s)")
+
+        store.start()
+        lat = []
+        for e in events[:2000]:
+            t0 = time.perf_counter()
+            store.submit(e)
+            lat.append((time.perf_counter() - t0) * 1e6)
+        print(f"submit()  : median {statistics.median(lat):.1f} us, max {max(lat):.1f} us (caller side)")
+
+        week = now() - timedelta(days=7)
+        month = now() - timedelta(days=30)
+        queries = {
+            "UNKNOWN faces, last week": dict(since=week, name=UNKNOWN_NAME),
+            "HIGH, last 30 days": dict(since=month, level="HIGH"),
+            "offline fallback, all year": dict(wifi_status=WIFI[1]),
+            "alice, all year": dict(name="alice"),
+            "latest 50": dict(),
+        }
+        print(f"{'query':<28} {'rows':>6} {'count':>7} {'ms':>8}")
+        for label, flt in queries.items():
+            t0 = time.perf_counter()
+            rows = store.query(limit=50, **flt)
+            n = store.count(**flt)
+            ms = (time.perf_counter() - t0) * 1000.0
+            print(f"{label:<28} {len(rows):6d} {n:7d} {ms:8.2f}")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Latency and recall of each offline detection mode on sample images.
+# Recall is measured against the "accurate" (CNN, full resolution) mode, or --reference.
+# Images are scaled to the camera's frame size first (--long-edge, 0 = as is).
+#   python -m benchmarks.bench_face_detection [IMAGE ...] [--roi x1 y1 x2 y2]
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Tuple
+
+import cv2
+import face_recognition  # noqa: F401  (detect_face_locations needs dlib)
+import numpy as np
+
+from src.ai.offline_face_recognition import DETECTION_MODES, detect_face_locations
+
+SAMPLE_DIR = Path("NoteBooks/notebooks")
+
+
+def _iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    at, ar, ab, al = a
+    bt, br, bb, bl = b
+    iw = max(0, min(ar, br) - max(al, bl))
+    ih = max(0, min(ab, bb) - max(at, bt))
+    inter = iw * ih
+    union = (ar - al) * (ab - at) + (br - bl) * (bb - bt) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _recall(found: List, reference: List) -> float:
+    if not reference:
+        return 1.0
+    hits = sum(1 for r in reference if any(_iou(r, f) >= 0.3 for f in found))
+    return hits / len(reference)
+
+
+def _load(path: Path, long_edge: int) -> np.ndarray:
+    # cv2 applies the EXIF orientation, so phone photos come out upright like camera frames
+    img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if img is None:
+        raise SystemExit(f"cannot read {path}")
+    h, w = img.shape[:2]
+    if long_edge and max(w, h) != long_edge:
+        s = long_edge / float(max(w, h))
+        img = cv2.resize(img, (round(w * s), round(h * s)), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("images", nargs="*", type=Path)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--long-edge", type=int, default=1280, help="camera frame long edge")
+    ap.add_argument("--modes", nargs="+", default=list(DETECTION_MODES), choices=list(DETECTION_MODES))
+    ap.add_argument("--reference", default="accurate", choices=list(DETECTION_MODES),
+                    help="mode whose boxes count as ground truth (CNN needs GBs of RAM at 1280x960)")
+    ap.add_argument("--roi", type=int, nargs=4, default=None, metavar=("X1", "Y1", "X2", "Y2"))
+    args = ap.parse_args()
+
+    paths = args.images or sorted(p for p in SAMPLE_DIR.iterdir() if p.suffix.lower() in {".jpg", ".jpeg", ".png"})
+    images = [_load(p, args.long_edge) for p in paths]
+
+    modes = {m: DETECTION_MODES[m] for m in args.modes}
+    if args.roi:
+        modes["hog+roi"] = replace(DETECTION_MODES["hog"], roi_xyxy=list(args.roi))
+
+    reference = [detect_face_locations(img, args.reference) for img in images]
+
+    print(f"{len(images)} images at long edge {args.long_edge or 'native'}, median of {args.repeat} runs, "
+          f"recall vs {args.reference} ({sum(len(r) for r in reference)} faces)")
+    print(f"{'mode':10s} {'ms/image':>10s} {'faces':>6s} {'recall':>7s}")
+    for name, cfg in modes.items():
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            found = [detect_face_locations(img, cfg) for img in images]
+            times.append((time.perf_counter() - t0) * 1000 / max(1, len(images)))
+        faces = sum(len(f) for f in found)
+        recall = statistics.mean(_recall(f, r) for f, r in zip(found, reference)) if images else 0.0
+        print(f"{name:10s} {statistics.median(times):10.1f} {faces:6d} {recall:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
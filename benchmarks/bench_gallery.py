@@ -0,0 +1,53 @@
+# Per-event cost of getting the known-face arrays:
+# reload encodings.json every call (old) vs. the process-resident KnownFaceGallery.
+#   python -m benchmarks.bench_gallery --entries 500
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.ai.offline_face_recognition import KnownFaceGallery, load_encodings, prepare_known_arrays
+from src.utils.json_utils import safe_write_json
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entries", type=int, default=500)
+    ap.add_argument("--events", type=int, default=200)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        known_dir = Path(tmp) / "known_faces"
+        known_dir.mkdir()
+        enc_path = known_dir / "encodings.json"
+        entries = [
+            {"name": f"person_{i % 50}", "path": f"p{i}.jpg", "encoding": rng.normal(size=128).tolist()}
+            for i in range(args.entries)
+        ]
+        safe_write_json(enc_path, {"version": 1, "known_dir": str(known_dir), "entries": entries})
+
+        t0 = time.perf_counter()
+        for _ in range(args.events):
+            prepare_known_arrays(load_encodings(enc_path, known_dir))
+        reload_ms = (time.perf_counter() - t0) * 1000 / args.events
+
+        # check_interval_s=0 so every event pays the full change check
+        gallery = KnownFaceGallery(known_dir, enc_path, check_interval_s=0.0)
+        gallery.refresh()
+        t0 = time.perf_counter()
+        for _ in range(args.events):
+            gallery.arrays()
+        gallery_ms = (time.perf_counter() - t0) * 1000 / args.events
+
+    print(f"{args.entries} enrolled encodings, {args.events} events")
+    print(f"  reload per call  : {reload_ms:8.3f} ms/event")
+    print(f"  KnownFaceGallery : {gallery_ms:8.3f} ms/event ({gallery.loads} load)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# Micro-benchmarks for the per-event hot functions, on synthetic images and
+# fake annotations (no camera, network or GPIO).
+#
+#   python -m benchmarks.bench_hot_paths                  # compare with the stored baseline
+#   python -m benchmarks.bench_hot_paths --save-baseline  # record this machine's numbers
+#   python -m benchmarks.bench_hot_paths --margin 0.5 --only score_frame
+#
+# Exits 1 when a case's median latency or peak allocation exceeds the baseline
+# by more than --margin. Cases whose optional dependencies are missing are skipped.
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.vision_stub import fake_face
+
+BASELINE_PATH = Path(__file__).with_name("baseline_hot_paths.json")
+
+# name -> (setup returning the zero-arg callable to time, number of timed calls)
+CASES: Dict[str, Tuple[Callable[[Path], Callable[[], Any]], int]] = {}
+
+
+def case(name: str, iterations: int):
+    def register(setup):
+        CASES[name] = (setup, iterations)
+        return setup
+    return register
+
+
+def _faces(n: int = 3) -> List[Dict[str, Any]]:
+    from src.ai.postprocess import normalize_google_faces
+    return normalize_google_faces([fake_face(100 + 150 * i, 80, 240 + 150 * i, 260) for i in range(n)])
+
+
+def _synthetic_bgr(w: int = 1280, h: int = 960) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    img = np.repeat(np.linspace(30, 220, w, dtype=np.uint8)[None, :], h, axis=0)
+    img = np.clip(img.astype(np.int16) + rng.integers(-8, 8, size=img.shape), 0, 255).astype(np.uint8)
+    return np.repeat(img[:, :, None], 3, axis=2)
+
+
+def _jpeg(img: np.ndarray) -> bytes:
+    import cv2
+    ok, buf = cv2.imencode(".jpg", img)
+    assert ok
+    return buf.tobytes()
+
+
+@case("score_frame", 20000)
+def _score_frame(tmp: Path):
+    from src.ai.postprocess import score_frame
+    faces = _faces(3)
+    return lambda: score_frame(faces, (1280, 960))
+
+
+@case("normalize_google_faces", 5000)
+def _normalize(tmp: Path):
+    from src.ai.postprocess import normalize_google_faces
+    annotations = [fake_face(), fake_face(300, 100, 420, 260)]
+    return lambda: normalize_google_faces(annotations)
+
+
+@case("build_event_record", 5000)
+def _build_event(tmp: Path):
+    from src.ai.postprocess import build_event_record
+    faces = _faces(2)
+    objects = [{"label": "Person", "confidence": 0.9}, {"label": "Door", "confidence": 0.7}]
+    return lambda: build_event_record("raw.jpg", "processed.jpg", (1280, 960), faces, objects)
+
+
+@case("save_processed_image", 30)
+def _save_processed(tmp: Path):
+    from src.camera.frame import Frame
+    from src.main import save_processed_image
+    frame = Frame(name="bench", timestamp="t", jpeg=_jpeg(_synthetic_bgr()))
+    faces = _faces(2)
+    frame.array  # decode once up front, as the pipeline does
+    return lambda: save_processed_image("", tmp, faces, [], frame=frame)
+
+
+@case("render_processed_image", 30)
+def _render_processed(tmp: Path):
+    from src.camera.frame import Frame
+    from src.main import render_processed_image
+    frame = Frame(name="bench", timestamp="t", jpeg=_jpeg(_synthetic_bgr()))
+    faces = _faces(2)
+    frame.array
+    return lambda: render_processed_image("", faces, [], frame=frame)
+
+
+@case("vision_cache_lookup", 200)
+def _vision_cache(tmp: Path):
+    from src.cloud.vision_cache import VisionCache, dhash
+    jpeg = _jpeg(_synthetic_bgr())
+    cache = VisionCache()
+    rng = np.random.default_rng(1)
+    # a full-ish cache of unrelated frames, then hash + look up a new one
+    for _ in range(200):
+        cache.put(int(rng.integers(0, 2**63)), _faces(1), [])
+    return lambda: cache.get(dhash(jpeg))
+
+
+@case("preprocess_image", 5)
+def _preprocess(tmp: Path):
+    from src.ai.image_preprocess import preprocess_image
+    raw = tmp / "raw.jpg"
+    raw.write_bytes(_jpeg(_synthetic_bgr()))
+    out = tmp / "pre"
+    return lambda: preprocess_image(raw, out, "bench")
+
+
+@case("preprocess_array_auto", 50)
+def _preprocess_auto(tmp: Path):
+    from src.ai.image_preprocess import preprocess_array
+    img = _synthetic_bgr()
+    return lambda: preprocess_array(img, mode="auto")
+
+
+@case("recognize_faces_offline", 3)
+def _recognize(tmp: Path):
+    import face_recognition  # noqa: F401  (skip the case if dlib is missing)
+    from src.ai.offline_face_recognition import KnownFaceGallery, recognize_faces_offline
+    from src.utils.json_utils import safe_write_json
+    rng = np.random.default_rng(0)
+    entries = [{"name": f"p{i % 20}", "path": f"{i}.jpg", "encoding": rng.normal(size=128).tolist()} for i in range(200)]
+    safe_write_json(tmp / "known" / "encodings.json", {"entries": entries})
+    gallery = KnownFaceGallery(tmp / "known", tmp / "known" / "encodings.json")
+    image_rgb = _synthetic_bgr(640, 480)[:, :, ::-1].copy()
+    return lambda: recognize_faces_offline(image_rgb, gallery=gallery, detection="hog")
+
+
+@case("recognize_faces_tracked_3", 3)
+def _recognize_tracked(tmp: Path):
+    import face_recognition  # noqa: F401  (skip the case if dlib is missing)
+    from src.ai.offline_face_recognition import KnownFaceGallery, recognize_faces_tracked
+    from src.utils.json_utils import safe_write_json
+    rng = np.random.default_rng(0)
+    entries = [{"name": f"p{i % 20}", "path": f"{i}.jpg", "encoding": rng.normal(size=128).tolist()} for i in range(200)]
+    safe_write_json(tmp / "known_t" / "encodings.json", {"entries": entries})
+    gallery = KnownFaceGallery(tmp / "known_t", tmp / "known_t" / "encodings.json")
+    images = [_synthetic_bgr(640, 480)[:, :, ::-1].copy() for _ in range(3)]
+    return lambda: recognize_faces_tracked(images, gallery=gallery, detection="hog")
+
+
+@case("track_faces", 2000)
+def _track_faces(tmp: Path):
+    from src.ai.face_tracker import track_faces
+    # 6 frames, 3 people walking right, one face appearing halfway
+    frames = []
+    for fi in range(6):
+        boxes = [[100 + 300 * p + 12 * fi, 200, 220 + 300 * p + 12 * fi, 330] for p in range(3)]
+        if fi >= 3:
+            boxes.append([50, 600, 130, 690])
+        frames.append(boxes)
+    return lambda: track_faces(frames)
+
+
+@case("safe_write_json", 300)
+def _safe_write(tmp: Path):
+    from src.ai.postprocess import build_event_record
+    from src.utils.json_utils import safe_write_json
+    record = build_event_record("raw.jpg", "processed.jpg", (1280, 960), _faces(3), [])
+    target = tmp / "event.json"
+    return lambda: safe_write_json(target, record)
+
+
+def measure(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    fn()  # warm-up (lazy imports, caches)
+
+    times = []
+    for _ in range(iterations):
+        t0 = time.perf_counter_ns()
+        fn()
+        times.append(time.perf_counter_ns() - t0)
+
+    # Allocations are measured on separate calls: tracemalloc slows everything down
+    tracemalloc.start()
+    peaks = []
+    for _ in range(min(iterations, 20)):
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - base)
+    tracemalloc.stop()
+
+    return {
+        "median_us": statistics.median(times) / 1000.0,
+        "p95_us": sorted(times)[int(0.95 * (len(times) - 1))] / 1000.0,
+        "peak_kib": statistics.median(peaks) / 1024.0,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--margin", type=float, default=0.25, help="allowed slowdown, 0.25 = +25%%")
+    ap.add_argument("--only", nargs="*", default=None)
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply iteration counts")
+    args = ap.parse_args()
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    results: Dict[str, Dict[str, float]] = {}
+    failures: List[str] = []
+
+    print(f"{'case':26s} {'median us':>12s} {'p95 us':>12s} {'peak KiB':>10s}  vs baseline")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (setup, iterations) in CASES.items():
+            if args.only and name not in args.only:
+                continue
+            try:
+                fn = setup(Path(tmp))
+            except ImportError as e:
+                print(f"{name:26s} skipped ({e.name} not installed)")
+                continue
+
+            r = measure(fn, max(1, int(iterations * args.scale)))
+            results[name] = r
+
+            note = "no baseline"
+            base = baseline.get(name)
+            if base:
+                slow = r["median_us"] / base["median_us"] - 1.0
+                grow = r["peak_kib"] / max(base["peak_kib"], 1e-3) - 1.0
+                note = f"{slow:+.0%} time, {grow:+.0%} alloc"
+                if slow > args.margin:
+                    failures.append(f"{name}: {r['median_us']:.1f} us vs {base['median_us']:.1f} us")
+                if grow > args.margin and r["peak_kib"] - base["peak_kib"] > 4.0:
+                    failures.append(f"{name}: {r['peak_kib']:.1f} KiB vs {base['peak_kib']:.1f} KiB")
+            print(f"{name:26s} {r['median_us']:12.1f} {r['p95_us']:12.1f} {r['peak_kib']:10.1f}  {note}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"baseline saved to {args.baseline}")
+        return
+
+    if failures:
+        for f in failures:
+            print(f"REGRESSION: {f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# ImageStore against a tree that already holds --files images (100k by default):
+# startup scan, listing today's folder vs the old flat directory, write throughput
+# (no sync / fsync per file / batched durable writes, with time spent syncing
+# reported apart from the batch-window wait), and a sweep down to half the budget.
+#   python -m benchmarks.bench_image_store --files 100000
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from src.storage.image_store import EXTRA_SUFFIX, ImageStore
+from src.utils.file_writer import BackgroundWriter
+from src.utils.timestamp_utils import date_folder, now
+
+
+def _populate(root: Path, files: int, days: int, size: int, flat: bool) -> None:
+    payload = bytes(size)
+    today = now()
+    per_day = max(1, files // days)
+    for i in range(files):
+        day = date_folder(today - timedelta(days=days - 1 - i // per_day))
+        d = root if flat else root / day
+        if i % per_day == 0:
+            d.mkdir(parents=True, exist_ok=True)
+        # 1 chosen frame per 6-frame burst, the rest are extras
+        suffix = ".jpg" if i % 6 == 0 else EXTRA_SUFFIX
+        (d / f"burst_{day}_{i:07d}{suffix}").write_bytes(payload)
+
+
+def _write_rate(writer, target: Path, n: int, size: int) -> float:
+    data = bytes(size)
+    t0 = time.perf_counter()
+    for i in range(n):
+        writer.submit(target / f"new_{i:05d}.jpg", data)
+    writer.flush()
+    return n / (time.perf_counter() - t0)
+
+
+def _report(label: str, rate: float, stats: dict) -> None:
+    # sync_ms: time inside fsync/fdatasync; window_ms: time waiting for a batch to fill
+    print(f"{label:17s}: {rate:8.1f} files/s  {stats['batches']:4d} batches ({stats['inline']} inline)  {stats['syncs']:5d} syncs "
+          f"{stats['sync_ms']:8.1f} ms syncing  {stats['window_ms']:8.1f} ms batch window")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=100_000)
+    ap.add_argument("--days", type=int, default=60)
+    ap.add_argument("--size", type=int, default=1024)
+    ap.add_argument("--writes", type=int, default=300)
+    ap.add_argument("--write-size", type=int, default=120_000)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        flat, dated = tmp / "flat", tmp / "dated"
+
+        t0 = time.perf_counter()
+        _populate(flat, args.files, args.days, args.size, flat=True)
+        _populate(dated, args.files, args.days, args.size, flat=False)
+        print(f"populated 2 x {args.files} files in {time.perf_counter() - t0:.1f} s")
+
+        t0 = time.perf_counter()
+        n_flat = len(os.listdir(flat))
+        flat_ms = (time.perf_counter() - t0) * 1000.0
+        t0 = time.perf_counter()
+        n_today = len(os.listdir(dated / date_folder()))
+        today_ms = (time.perf_counter() - t0) * 1000.0
+        print(f"list flat dir    : {n_flat:7d} entries {flat_ms:8.1f} ms")
+        print(f"list today's dir : {n_today:7d} entries {today_ms:8.1f} ms")
+
+        store = ImageStore(roots={"raw": dated}, max_bytes=args.files * args.size, max_age_days=args.days + 1)
+        t0 = time.perf_counter()
+        found = store.scan()
+        print(f"startup scan     : {found:7d} files   {(time.perf_counter() - t0) * 1000:8.1f} ms")
+
+        for label, kw in (
+            ("writes, no sync", dict(durable=False)),
+            ("writes, sync each", dict(batch_max=1, durable=True)),
+        ):
+            writer = BackgroundWriter(max_queue=64, **kw).start()
+            rate = _write_rate(writer, tmp / label.replace(" ", "_").replace(",", ""), args.writes, args.write_size)
+            writer.close()
+            _report(label, rate, writer.stats)
+
+        store.writer.start()
+        rate = _write_rate(store, store.dir_for("raw"), args.writes, args.write_size)
+        _report("writes, batched", rate, store.writer.stats)
+
+        store.max_bytes = store.usage()["bytes"] // 2
+        t0 = time.perf_counter()
+        res = store.sweep()
+        ms = (time.perf_counter() - t0) * 1000.0
+        usage = store.usage()
+        print(f"sweep to 50%     : {res['deleted']:7d} deleted {ms:8.1f} ms "
+              f"-> {usage['files']} files, {usage['bytes'] // 1024} KiB")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# JSONL helpers at --records (100k) records:
+#   append_jsonl (open/close per record) vs one JsonlWriter (no fsync / group fsync),
+#   read_text().splitlines() + json.loads vs iter_jsonl,
+#   json.dumps(default=to_jsonable) vs dumps_line on records carrying numpy values.
+#   python -m benchmarks.bench_jsonl --records 100000
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.utils import json_utils
+from src.utils.json_utils import JsonlWriter, append_jsonl, dumps_line, iter_jsonl, to_jsonable
+
+
+def _record(i: int) -> dict:
+    return {"timestamp": "2026-01-01T12:00:00-05:00", "i": i, "timings": {"capture": 701.2, "vision": 455.0}}
+
+
+def _numpy_record(i: int, rng: np.random.Generator) -> dict:
+    return {
+        "i": np.int64(i),
+        "score": np.float32(0.5),
+        "ok": np.bool_(True),
+        "encoding": rng.random(128),  # a face encoding
+    }
+
+
+def _timed(label: str, n: int, fn) -> None:
+    t0 = time.perf_counter()
+    fn()
+    s = time.perf_counter() - t0
+    print(f"  {label:<38} {s * 1000:9.1f} ms  {n / s:10.0f} rec/s")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--records", type=int, default=100_000)
+    ap.add_argument("--group", type=int, default=256, help="records per fsync for the group-commit run")
+    args = ap.parse_args()
+    n = args.records
+    records = [_record(i) for i in range(n)]
+
+    print(f"{n} records, orjson {'on' if json_utils.orjson is not None else 'not installed (stdlib json)'}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        print("write")
+        _timed("append_jsonl per record", n, lambda: [append_jsonl(tmp / "a.jsonl", r) for r in records])
+
+        def writer_run(path: Path, **kw) -> None:
+            with JsonlWriter(path, **kw) as w:
+                for r in records:
+                    w.write(r)
+
+        _timed("JsonlWriter, no fsync", n, lambda: writer_run(tmp / "b.jsonl"))
+        _timed(f"JsonlWriter, fsync every {args.group}", n, lambda: writer_run(tmp / "c.jsonl", fsync_every=args.group))
+
+        print("read")
+        path = tmp / "b.jsonl"
+        _timed("read_text().splitlines() + json.loads", n,
+               lambda: [json.loads(ln) for ln in path.read_text(encoding="utf-8").splitlines() if ln.strip()])
+        _timed("iter_jsonl", n, lambda: sum(1 for _ in iter_jsonl(path)))
+
+        print("encode (numpy values, 128-d array each)")
+        rng = np.random.default_rng(0)
+        m = max(1, n // 10)
+        np_records = [_numpy_record(i, rng) for i in range(m)]
+        _timed("json.dumps(default=to_jsonable)", m,
+               lambda: [json.dumps(r, default=to_jsonable, ensure_ascii=False) for r in np_records])
+        _timed("dumps_line", m, lambda: [dumps_line(r) for r in np_records])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# CPU cost and decision of MotionConfirmer per trigger.
+# Recorded bursts: one sub-directory of JPEGs (capture order = sorted names) per trigger:
+#   python -m benchmarks.bench_motion_confirm --dir data/motion_sequences
+# Without --dir, synthetic 1280x960 sequences are used (static, exposure change, walker).
+from __future__ import annotations
+
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.ai.motion_confirm import MotionConfirmer
+from src.camera.frame import Frame
+
+
+def _encode(img: np.ndarray) -> bytes:
+    import cv2
+
+    return cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), 90])[1].tobytes()
+
+
+def _synthetic_sequences(n: int = 6, w: int = 1280, h: int = 960) -> Dict[str, List[Frame]]:
+    import cv2
+
+    rng = np.random.default_rng(0)
+    scene = cv2.GaussianBlur(rng.integers(0, 255, (h, w, 3), dtype=np.uint8), (0, 0), 8)
+
+    def noisy(img: np.ndarray) -> np.ndarray:
+        return np.clip(img.astype(np.int16) + rng.normal(0, 4, img.shape), 0, 255).astype(np.uint8)
+
+    def frames(imgs: List[np.ndarray], tag: str) -> List[Frame]:
+        return [Frame(name=f"{tag}_{i:02d}", timestamp="t", jpeg=_encode(im)) for i, im in enumerate(imgs)]
+
+    walker = []
+    for i in range(n):
+        im = scene.copy()
+        x = 200 + i * 120
+        cv2.rectangle(im, (x, 300), (x + 180, 900), (40, 40, 60), -1)
+        walker.append(noisy(im))
+
+    return {
+        "static (heat/sun)": frames([noisy(scene) for _ in range(n)], "static"),
+        "exposure change": frames([noisy(cv2.convertScaleAbs(scene, alpha=1.0, beta=6 * i)) for i in range(n)], "exp"),
+        "person walking": frames(walker, "walk"),
+    }
+
+
+def _recorded_sequences(root: Path) -> Dict[str, List[Frame]]:
+    out: Dict[str, List[Frame]] = {}
+    for d in sorted(p for p in root.iterdir() if p.is_dir()):
+        files = sorted(d.glob("*.jp*g"))
+        if files:
+            out[d.name] = [Frame(name=f.stem, timestamp="", jpeg=f.read_bytes()) for f in files]
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dir", type=Path, default=None)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    sequences = _recorded_sequences(args.dir) if args.dir else _synthetic_sequences()
+    if not sequences:
+        raise SystemExit(f"No JPEG sequences under {args.dir}")
+
+    confirmer = MotionConfirmer()
+    print(f"{'sequence':<24} {'frames':>6} {'changed':>8} {'decision':>9} {'median ms':>10} {'max ms':>8}")
+    for name, frames in sequences.items():
+        times = []
+        for _ in range(args.repeat):
+            res = confirmer.check(frames)
+            times.append(res.ms)
+        decision = "confirm" if res.confirmed else "reject"
+        print(f"{name:<24} {len(frames):6d} {res.changed_fraction:8.2%} {decision:>9} "
+              f"{statistics.median(times):10.2f} {max(times):8.2f}")
+
+
+if __name__ == "__main__":
+    main()
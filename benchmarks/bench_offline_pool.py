@@ -0,0 +1,53 @@
+# Offline burst analysis on the warm process pool: burst latency and speedup
+# for 1..N workers, plus the cost of a cold pool (process start + dlib model load).
+# Frames are the sample images (or IMAGE ...), repeated up to --frames per burst.
+#   python -m benchmarks.bench_offline_pool [IMAGE ...] --frames 4 --workers 1 2 4
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import face_recognition  # noqa: F401  (the workers need dlib)
+
+from src.ai import offline_pool
+
+SAMPLE_DIR = Path("NoteBooks/notebooks")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("images", nargs="*", type=Path)
+    ap.add_argument("--frames", type=int, default=4, help="frames per burst")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--detection", default="fast")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    paths = args.images or sorted(p for p in SAMPLE_DIR.iterdir() if p.suffix.lower() in {".jpg", ".jpeg"})
+    jpegs = [p.read_bytes() for p in paths]
+    burst = [jpegs[i % len(jpegs)] for i in range(args.frames)]
+
+    print(f"{len(burst)} frames per burst, detection={args.detection}, median of {args.repeat} runs")
+    print(f"{'workers':>7s} {'cold ms':>9s} {'burst ms':>9s} {'frames/s':>9s} {'speedup':>8s}")
+    base = None
+    for workers in args.workers:
+        offline_pool.shutdown()
+        t0 = time.perf_counter()
+        offline_pool.recognize_burst(burst, detection=args.detection, workers=workers)
+        cold = (time.perf_counter() - t0) * 1000.0
+
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            offline_pool.recognize_burst(burst, detection=args.detection, workers=workers)
+            times.append((time.perf_counter() - t0) * 1000.0)
+        ms = statistics.median(times)
+        base = base or ms
+        print(f"{workers:7d} {cold:9.1f} {ms:9.1f} {len(burst) * 1000.0 / ms:9.1f} {base / ms:7.2f}x")
+    offline_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
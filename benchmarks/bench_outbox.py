@@ -0,0 +1,72 @@
+# Outbox cost with a large backlog: old JSONL read-all/rewrite-all flush
+# vs. the SQLite Outbox. No Telegram calls; every send "succeeds".
+#   python -m benchmarks.bench_outbox --jobs 10000
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from src.notifications.outbox import Outbox
+from src.utils.json_utils import append_jsonl
+
+
+def _job(i: int) -> dict:
+    return {"created_at": "2026-01-01T00:00:00", "attempts": 0, "text": f"alert {i} " + "x" * 200,
+            "photo_path": f"data/images/processed/burst_{i}_processed.jpg"}
+
+
+def legacy_flush(path: Path, max_send: int) -> None:
+    jobs = [json.loads(ln) for ln in path.read_text(encoding="utf-8").splitlines() if ln.strip()]
+    kept = jobs[max_send:]
+    path.write_text("".join(json.dumps(j, ensure_ascii=False) + "\n" for j in kept), encoding="utf-8")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--jobs", type=int, default=10_000)
+    ap.add_argument("--max-send", type=int, default=20)
+    ap.add_argument("--flushes", type=int, default=20)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        jsonl = tmp / "outbox.jsonl"
+        t0 = time.perf_counter()
+        for i in range(args.jobs):
+            append_jsonl(jsonl, _job(i))
+        legacy_enqueue_us = (time.perf_counter() - t0) * 1e6 / args.jobs
+        t0 = time.perf_counter()
+        for _ in range(args.flushes):
+            legacy_flush(jsonl, args.max_send)
+        legacy_flush_ms = (time.perf_counter() - t0) * 1000 / args.flushes
+
+        outbox = Outbox(tmp / "outbox.sqlite3")
+        t0 = time.perf_counter()
+        for i in range(args.jobs):
+            outbox.enqueue(_job(i))
+        sqlite_enqueue_us = (time.perf_counter() - t0) * 1e6 / args.jobs
+        t0 = time.perf_counter()
+        for _ in range(args.flushes):
+            for job_id, _job_ in outbox.due(limit=args.max_send):
+                outbox.ack(job_id)
+        sqlite_flush_ms = (time.perf_counter() - t0) * 1000 / args.flushes
+
+        t0 = time.perf_counter()
+        for job_id, _job_ in outbox.due(limit=args.jobs):
+            outbox.ack(job_id)
+        outbox.compact()
+        drain_s = time.perf_counter() - t0
+        outbox.close()
+
+    print(f"{args.jobs} queued jobs, flush of {args.max_send}")
+    print(f"  JSONL  : enqueue {legacy_enqueue_us:8.1f} us  flush {legacy_flush_ms:8.2f} ms")
+    print(f"  SQLite : enqueue {sqlite_enqueue_us:8.1f} us  flush {sqlite_flush_ms:8.2f} ms")
+    print(f"  SQLite : drain remaining + compact {drain_s:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
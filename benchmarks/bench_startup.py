@@ -0,0 +1,93 @@
+# Startup guard: imports src.main in a fresh interpreter with -X importtime,
+# from an empty working directory, and fails if
+#   - the import takes longer than --max-ms (cumulative, as reported by importtime)
+#   - any heavy/hardware module got imported eagerly
+#   - importing created files or directories
+#   python -m benchmarks.bench_startup [--max-ms 400]
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+
+# Must only be loaded on first use
+LAZY_MODULES = [
+    "cv2", "PIL", "face_recognition", "dlib",
+    "google.cloud.vision", "grpc", "telegram",
+    "picamera2", "gpiozero", "board", "neopixel",
+]
+
+_PROBE = (
+    "import sys, src.main; "
+    "print('\\n'.join(sorted(sys.modules)))"
+)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    (module, self_us, cumulative_us) for every line of -X importtime output.
+    """
+    rows = []
+    for ln in stderr.splitlines():
+        if not ln.startswith("import time:") or "self [us]" in ln:
+            continue
+        parts = ln[len("import time:"):].split("|")
+        rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--max-ms", type=float, default=400.0)
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        env = dict(os.environ, PYTHONPATH=str(REPO_DIR))
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _PROBE],
+            cwd=cwd, env=env, capture_output=True, text=True,
+        )
+        created = sorted(os.listdir(cwd))
+
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        sys.exit(f"import src.main failed ({proc.returncode})")
+
+    rows = parse_importtime(proc.stderr)
+    loaded = set(proc.stdout.split())
+    total_ms = max((cum for _, _, cum in rows), default=0) / 1000.0
+
+    by_top: Dict[str, int] = {}
+    for name, self_us, _ in rows:
+        top = name.split(".")[0]
+        by_top[top] = by_top.get(top, 0) + self_us
+
+    print(f"import src.main: {total_ms:.1f} ms (limit {args.max_ms:.0f} ms)")
+    for top, us in sorted(by_top.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {top:28s} {us / 1000:8.1f} ms")
+
+    problems = []
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    if eager:
+        problems.append(f"imported eagerly: {', '.join(eager)}")
+    if created:
+        problems.append(f"import side effects in cwd: {', '.join(created)}")
+    if total_ms > args.max_ms:
+        problems.append(f"startup {total_ms:.1f} ms > {args.max_ms:.0f} ms")
+
+    if problems:
+        for p in problems:
+            print(f"FAIL: {p}")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
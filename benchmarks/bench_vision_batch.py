@@ -0,0 +1,41 @@
+# Per-frame Vision calls vs. one analyze_burst request, against the local stub:
+#   python -m benchmarks.bench_vision_batch
+from __future__ import annotations
+
+import argparse
+import time
+
+from benchmarks.vision_stub import StubAnnotatorClient
+from src.cloud.google_vision_client import GoogleVisionClient
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=6)
+    ap.add_argument("--rtt-ms", type=float, default=80.0)
+    args = ap.parse_args()
+
+    images = [bytes(200_000) for _ in range(args.frames)]
+
+    stub = StubAnnotatorClient(rtt_s=args.rtt_ms / 1000.0)
+    client = GoogleVisionClient(client=stub)
+    t0 = time.perf_counter()
+    for b in images:
+        client.analyze_image_bytes(b)
+    seq_s = time.perf_counter() - t0
+    seq_rpcs = stub.rpcs
+
+    stub = StubAnnotatorClient(rtt_s=args.rtt_ms / 1000.0)
+    client = GoogleVisionClient(client=stub)
+    t0 = time.perf_counter()
+    results = client.analyze_burst(images)
+    batch_s = time.perf_counter() - t0
+    assert len(results) == len(images)
+
+    print(f"{args.frames} frames, {args.rtt_ms:.0f} ms RTT")
+    print(f"  per-frame calls : {seq_rpcs:3d} RPCs {seq_s * 1000:8.1f} ms")
+    print(f"  analyze_burst   : {stub.rpcs:3d} RPCs {batch_s * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Bytes on the wire and latency of full-resolution vs downscaled Vision uploads,
+# against the in-process stub with a throttled uplink:
+#   python -m benchmarks.bench_vision_upload --uplink-kbps 2000
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.vision_stub import StubAnnotatorClient
+from src.ai.postprocess import normalize_google_faces
+from src.cloud.google_vision_client import GoogleVisionClient, VisionConfig
+
+
+def _synthetic_jpeg(w: int, h: int) -> bytes:
+    import cv2
+
+    rng = np.random.default_rng(0)
+    # smooth gradient + sensor-like noise: compresses roughly like a real door frame
+    x = np.linspace(0, 255, w, dtype=np.float32)[None, :]
+    y = np.linspace(0, 255, h, dtype=np.float32)[:, None]
+    base = (x * 0.6 + y * 0.4)[..., None].repeat(3, axis=2)
+    img = np.clip(base + rng.normal(0, 12, base.shape), 0, 255).astype(np.uint8)
+    ok, enc = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), 92])
+    return enc.tobytes()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=3)
+    ap.add_argument("--width", type=int, default=2592)
+    ap.add_argument("--height", type=int, default=1944)
+    ap.add_argument("--rtt-ms", type=float, default=80.0)
+    # ~2 Mbit/s: a doorbell at the edge of the Wi-Fi
+    ap.add_argument("--uplink-kbps", type=float, default=2000.0)
+    ap.add_argument("--long-edges", default="0,1280,640")
+    args = ap.parse_args()
+
+    images = [_synthetic_jpeg(args.width, args.height) for _ in range(args.frames)]
+    uplink = args.uplink_kbps * 1000.0 / 8.0
+
+    print(f"{args.frames} frames {args.width}x{args.height} ({len(images[0]) / 1024:.0f} KiB each), "
+          f"{args.rtt_ms:.0f} ms RTT, {args.uplink_kbps:.0f} kbit/s uplink")
+    print(f"  {'long edge':>9} {'KiB sent':>9} {'ms':>9}  first face bbox_xyxy")
+    for edge in (int(e) for e in args.long_edges.split(",")):
+        stub = StubAnnotatorClient(rtt_s=args.rtt_ms / 1000.0, uplink_bytes_per_s=uplink)
+        client = GoogleVisionClient(VisionConfig(upload_long_edge=edge), client=stub)
+        t0 = time.perf_counter()
+        results = client.analyze_burst(images)
+        ms = (time.perf_counter() - t0) * 1000.0
+        faces = normalize_google_faces(results[0]["faces"])
+        bbox = faces[0]["bbox_xyxy"] if faces else None
+        label = "full" if edge == 0 else str(edge)
+        print(f"  {label:>9} {stub.bytes_sent / 1024:9.0f} {ms:9.1f}  {bbox}")
+    # The stub answers in the pixel space of whatever it received, so the
+    # boxes differ per row: each one is that upload's box mapped back to full size.
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Local stand-in for vision.ImageAnnotatorClient.
+# Answers with canned annotations after a simulated round trip, and counts RPCs
+# and uploaded bytes, so GoogleVisionClient can be exercised with no network.
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, List
+
+
+def _vertex(x: int, y: int) -> SimpleNamespace:
+    return SimpleNamespace(x=x, y=y)
+
+
+def fake_face(x1: int = 100, y1: int = 80, x2: int = 260, y2: int = 260) -> SimpleNamespace:
+    return SimpleNamespace(
+        bounding_poly=SimpleNamespace(vertices=[_vertex(x1, y1), _vertex(x2, y1), _vertex(x2, y2), _vertex(x1, y2)]),
+        fd_bounding_poly=SimpleNamespace(vertices=[_vertex(x1, y1), _vertex(x2, y1), _vertex(x2, y2), _vertex(x1, y2)]),
+        detection_confidence=0.93,
+        joy_likelihood="LIKELY",
+        anger_likelihood="VERY_UNLIKELY",
+        sorrow_likelihood="VERY_UNLIKELY",
+        surprise_likelihood="UNLIKELY",
+        blurred_likelihood="VERY_UNLIKELY",
+        under_exposed_likelihood="VERY_UNLIKELY",
+        roll_angle=2.0,
+        pan_angle=-5.0,
+        tilt_angle=1.0,
+    )
+
+
+def _response() -> SimpleNamespace:
+    return SimpleNamespace(
+        error=SimpleNamespace(message=""),
+        face_annotations=[fake_face()],
+        label_annotations=[SimpleNamespace(description="Door", score=0.91)],
+        localized_object_annotations=[
+            SimpleNamespace(
+                name="Person",
+                score=0.88,
+                bounding_poly=SimpleNamespace(normalized_vertices=[
+                    _vertex(0.1, 0.1), _vertex(0.5, 0.1), _vertex(0.5, 0.9), _vertex(0.1, 0.9),
+                ]),
+            )
+        ],
+    )
+
+
+class StubAnnotatorClient:
+    def __init__(self, rtt_s: float = 0.08, uplink_bytes_per_s: float = 0.0) -> None:
+        self.rtt_s = rtt_s
+        # 0 means "infinitely fast link"; otherwise upload time is bytes / rate
+        self.uplink_bytes_per_s = uplink_bytes_per_s
+        self.rpcs = 0
+        self.bytes_sent = 0
+        # images per batch_annotate_images call, and the timeout each call was given
+        self.batch_sizes: List[int] = []
+        self.timeouts: List[Any] = []
+        self.lock = threading.Lock()
+
+    def _round_trip(self, payload: int) -> None:
+        with self.lock:
+            self.rpcs += 1
+            self.bytes_sent += payload
+        delay = self.rtt_s
+        if self.uplink_bytes_per_s > 0:
+            delay += payload / self.uplink_bytes_per_s
+        time.sleep(delay)
+
+    def face_detection(self, image: Any, **kw) -> SimpleNamespace:
+        self._round_trip(len(image.content))
+        return _response()
+
+    def label_detection(self, image: Any, **kw) -> SimpleNamespace:
+        self._round_trip(len(image.content))
+        return _response()
+
+    def object_localization(self, image: Any, **kw) -> SimpleNamespace:
+        self._round_trip(len(image.content))
+        return _response()
+
+    def batch_annotate_images(self, requests: List[Any], timeout: Any = None, **kw) -> SimpleNamespace:
+        with self.lock:
+            self.batch_sizes.append(len(requests))
+            self.timeouts.append(timeout)
+        self._round_trip(sum(len(r.image.content) for r in requests))
+        return SimpleNamespace(responses=[self.respond(r) for r in requests])
+
+    def respond(self, request: Any) -> SimpleNamespace:
+        # Override to vary the answer per image
+        return _response()
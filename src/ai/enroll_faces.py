@@ -0,0 +1,35 @@
+# Enrollment CLI: incrementally (re)build data/known_faces/encodings.json
+#   python -m src.ai.enroll_faces [--known-dir DIR] [--workers N] [--full]
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from src.ai.offline_face_recognition import ENCODING_PATH, KNOWN_FACES_DIR, build_encodings
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Encode enrolled face photos")
+    ap.add_argument("--known-dir", type=Path, default=KNOWN_FACES_DIR)
+    ap.add_argument("--encodings", type=Path, default=None,
+                    help="output file (default: <known-dir>/encodings.json)")
+    ap.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    ap.add_argument("--full", action="store_true", help="ignore the cache and re-encode every photo")
+    args = ap.parse_args()
+
+    encoding_path = args.encodings or (
+        ENCODING_PATH if args.known_dir == KNOWN_FACES_DIR else args.known_dir / "encodings.json"
+    )
+    payload = build_encodings(args.known_dir, encoding_path, workers=args.workers, full=args.full)
+
+    stats = payload["stats"]
+    seconds = max(stats["seconds"], 1e-6)
+    people = len({e["name"] for e in payload["entries"]})
+    print(f"[enroll] {len(payload['entries'])} encodings for {people} people -> {encoding_path}")
+    print(f"[enroll] encoded {stats['encoded']}, reused {stats['reused']}, "
+          f"removed {stats['removed']}, no face {len(payload['skipped'])}")
+    print(f"[enroll] {stats['seconds']:.2f} s, {stats['encoded'] / seconds:.1f} images/s")
+
+
+if __name__ == "__main__":
+    main()
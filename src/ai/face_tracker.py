@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# A box continues a track when it overlaps the track's last box by this much...
+IOU_MIN = 0.3
+# ...or, failing that, when its centre moved less than this many box diagonals
+MAX_CENTER_JUMP = 0.6
+# A track is dropped once it has not been seen for this many frames
+MAX_MISSED_FRAMES = 2
+
+# Google Vision blurredLikelihood -> how usable the crop still is
+_BLUR_FACTOR = {
+    "VERY_UNLIKELY": 1.0,
+    "UNLIKELY": 0.9,
+    "POSSIBLE": 0.6,
+    "LIKELY": 0.3,
+    "VERY_LIKELY": 0.1,
+}
+
+
+@dataclass
+class FaceTrack:
+    """
+    One person across a burst: frame index -> (index of the box in that
+    frame's list, bbox_xyxy). best_frame is filled by pick_best_crops.
+    """
+    track_id: int
+    boxes: Dict[int, Tuple[int, List[int]]] = field(default_factory=dict)
+    best_frame: int = -1
+
+    @property
+    def last_frame(self) -> int:
+        return max(self.boxes)
+
+    def best_box(self) -> Tuple[int, List[int]]:
+        return self.boxes[self.best_frame if self.best_frame in self.boxes else self.last_frame]
+
+
+def iou(a: List[int], b: List[int]) -> float:
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _center_jump(a: List[int], b: List[int]) -> float:
+    # Centre distance in units of the mean box diagonal
+    dx = (a[0] + a[2] - b[0] - b[2]) / 2.0
+    dy = (a[1] + a[3] - b[1] - b[3]) / 2.0
+    diag = (math.hypot(a[2] - a[0], a[3] - a[1]) + math.hypot(b[2] - b[0], b[3] - b[1])) / 2.0
+    return math.hypot(dx, dy) / max(diag, 1.0)
+
+
+def track_faces(
+    per_frame_boxes: List[List[List[int]]],
+    iou_min: float = IOU_MIN,
+    max_center_jump: float = MAX_CENTER_JUMP,
+    max_missed: int = MAX_MISSED_FRAMES,
+) -> List[FaceTrack]:
+    """
+    Groups bbox_xyxy boxes of consecutive frames into tracks. Each frame is
+    matched greedily against the live tracks: best IoU first, then nearest
+    centre for what is left. Unmatched boxes start new tracks.
+    """
+    tracks: List[FaceTrack] = []
+    for fi, boxes in enumerate(per_frame_boxes):
+        live = [t for t in tracks if fi - t.last_frame <= max_missed + 1]
+        pairs = []
+        for ti, t in enumerate(live):
+            last = t.boxes[t.last_frame][1]
+            for bi, box in enumerate(boxes):
+                o = iou(last, box)
+                if o >= iou_min:
+                    pairs.append((0, -o, ti, bi))
+                else:
+                    jump = _center_jump(last, box)
+                    if jump <= max_center_jump:
+                        pairs.append((1, jump, ti, bi))
+        used_t, used_b = set(), set()
+        for _, _, ti, bi in sorted(pairs):
+            if ti in used_t or bi in used_b:
+                continue
+            live[ti].boxes[fi] = (bi, list(boxes[bi]))
+            used_t.add(ti)
+            used_b.add(bi)
+        for bi, box in enumerate(boxes):
+            if bi not in used_b:
+                tracks.append(FaceTrack(track_id=len(tracks), boxes={fi: (bi, list(box))}))
+    return tracks
+
+
+# -----------------------------
+# Crop quality
+# -----------------------------
+def crop_sharpness(image: np.ndarray, bbox: List[int]) -> float:
+    """
+    Variance of the Laplacian over the face crop (drops with motion blur).
+    """
+    import cv2
+
+    h, w = image.shape[:2]
+    x1, y1 = max(0, int(bbox[0])), max(0, int(bbox[1]))
+    x2, y2 = min(w, int(bbox[2])), min(h, int(bbox[3]))
+    if x2 - x1 < 3 or y2 - y1 < 3:
+        return 0.0
+    crop = image[y1:y2, x1:x2]
+    if crop.ndim == 3:
+        crop = cv2.cvtColor(crop, cv2.COLOR_RGB2GRAY)
+    return float(cv2.Laplacian(crop, cv2.CV_32F).var())
+
+
+def pose_factor(pose: Optional[Dict[str, float]]) -> float:
+    """
+    1.0 for a frontal face, falling off as it turns (pan) or nods (tilt).
+    Unknown pose counts as frontal.
+    """
+    if not pose:
+        return 1.0
+    pan = math.radians(float(pose.get("pan", 0.0)))
+    tilt = math.radians(float(pose.get("tilt", 0.0)))
+    return max(0.0, math.cos(pan)) * max(0.0, math.cos(tilt))
+
+
+def blur_factor(likelihood: Optional[str]) -> float:
+    # Likelihood names from normalize_google_faces; older events may hold "Likelihood.LIKELY"
+    if not likelihood:
+        return 1.0
+    return _BLUR_FACTOR.get(str(likelihood).rsplit(".", 1)[-1], 1.0)
+
+
+def pick_best_crops(
+    tracks: List[FaceTrack],
+    measure: Callable[[int, int, List[int]], Tuple[float, float]],
+) -> None:
+    """
+    Sets best_frame on every track. measure(frame_idx, box_idx, bbox) returns
+    (sharpness, pose/blur factor); score is box area and sharpness (each
+    relative to the track's best) times that factor.
+    """
+    for t in tracks:
+        stats = []
+        for fi, (bi, box) in t.boxes.items():
+            sharp, factor = measure(fi, bi, box)
+            area = max(0, box[2] - box[0]) * max(0, box[3] - box[1])
+            stats.append((fi, float(area), float(sharp), float(factor)))
+        max_area = max(s[1] for s in stats) or 1.0
+        max_sharp = max(s[2] for s in stats) or 1.0
+        t.best_frame = max(stats, key=lambda s: (s[1] / max_area) * (s[2] / max_sharp) * s[3])[0]
+
+
+def summarize_tracks(tracks: List[FaceTrack], frame_names: List[str]) -> List[Dict[str, object]]:
+    """
+    Per-track report for the event record.
+    """
+    out = []
+    for t in tracks:
+        _, box = t.best_box()
+        out.append({
+            "track_id": t.track_id,
+            "frames": [frame_names[fi] for fi in sorted(t.boxes)],
+            "best_frame": frame_names[t.best_frame] if t.best_frame >= 0 else "",
+            "bbox_xyxy": box,
+        })
+    return out
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+
+from src.ai.image_preprocess import DARK_BRIGHTNESS, measure_brightness
+from src.camera.frame import Frame
+
+# Every frame is scored on a small gray thumbnail of this size
+QUALITY_SIZE_WH = (160, 120)
+# Global std-dev of gray levels at which contrast stops adding to the score
+CONTRAST_FULL = 48.0
+
+
+def _thumbnail(frame: Frame) -> np.ndarray:
+    import cv2
+
+    # Reduced decode straight from the JPEG is far cheaper than a full-size decode
+    gray = cv2.imdecode(np.frombuffer(frame.jpeg, dtype=np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if gray is None:
+        gray = cv2.cvtColor(frame.array, cv2.COLOR_BGR2GRAY)
+    return cv2.resize(gray, QUALITY_SIZE_WH, interpolation=cv2.INTER_AREA)
+
+
+def burst_quality(frames: List[Frame]) -> Dict[str, np.ndarray]:
+    """
+    Blur, brightness and contrast for the whole burst at once.
+    All arrays are (N,), in burst order. Higher "score" is better.
+    """
+    if not frames:
+        empty = np.zeros((0,), dtype=np.float32)
+        return {"sharpness": empty, "brightness": empty, "contrast": empty, "score": empty}
+
+    grays = np.stack([_thumbnail(f) for f in frames]).astype(np.float32)  # (N, H, W)
+
+    brightness = measure_brightness(grays)
+    contrast = grays.std(axis=(1, 2))
+
+    # 4-neighbour Laplacian; its variance drops when the frame is motion-blurred
+    lap = (
+        grays[:, :-2, 1:-1] + grays[:, 2:, 1:-1]
+        + grays[:, 1:-1, :-2] + grays[:, 1:-1, 2:]
+        - 4.0 * grays[:, 1:-1, 1:-1]
+    )
+    sharpness = lap.var(axis=(1, 2))
+
+    sharp_rel = sharpness / max(float(sharpness.max()), 1e-6)
+    exposure = 1.0 - np.abs(brightness - 128.0) / 128.0
+    exposure = np.where(brightness < DARK_BRIGHTNESS, exposure * 0.5, exposure)
+    contrast_rel = np.clip(contrast / CONTRAST_FULL, 0.0, 1.0)
+
+    score = sharp_rel * exposure * (0.5 + 0.5 * contrast_rel)
+
+    return {
+        "sharpness": sharpness,
+        "brightness": brightness,
+        "contrast": contrast,
+        "score": score,
+    }
+
+
+def select_top_k(frames: List[Frame], k: int) -> List[Frame]:
+    """
+    The k best frames by burst_quality score, kept in capture order.
+    k <= 0 or k >= len(frames) returns the burst unchanged.
+    """
+    if k <= 0 or k >= len(frames):
+        return list(frames)
+    score = burst_quality(frames)["score"]
+    keep = np.sort(np.argsort(-score, kind="stable")[:k])
+    return [frames[int(i)] for i in keep]
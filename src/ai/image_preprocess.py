@@ -1,10 +1,103 @@
-import cv2
 import numpy as np
-from PIL import Image, ImageOps
 from datetime import datetime
 from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from src.utils.process_pool import WarmPool
+
+# Mean gray level below which a frame is treated as too dark and brightened
+DARK_BRIGHTNESS = 25
+
+TARGET_WH = (640, 480)
+
+# Denoise tiers:
+#   "none"     resize + dark-frame brightening only
+#   "fast"     + 3x3 Gaussian blur (milliseconds)
+#   "quality"  + fastNlMeansDenoisingColored (the old behaviour; seconds on a Pi)
+#   "auto"     picks one of the above from measured brightness and noise
+PREPROCESS_MODES = ("none", "fast", "quality", "auto")
+# Estimated noise sigma (gray levels) above which "auto" blurs / runs NL-means
+NOISE_SIGMA_FAST = 3.0
+NOISE_SIGMA_QUALITY = 8.0
+
+
+def measure_brightness(gray: np.ndarray) -> np.ndarray:
+    """
+    Mean gray level over the last two axes: a float for one (H, W) image,
+    an (N,) array for a stacked (N, H, W) burst.
+    """
+    return np.mean(gray, axis=(-2, -1))
+
+
+def estimate_noise(gray: np.ndarray) -> float:
+    """
+    Immerkaer's fast noise estimate: sigma of the residual of a Laplacian-difference
+    kernel that cancels smooth image structure.
+    """
+    g = gray.astype(np.float32)
+    if g.shape[0] < 3 or g.shape[1] < 3:
+        return 0.0
+    r = (
+        g[:-2, :-2] - 2 * g[:-2, 1:-1] + g[:-2, 2:]
+        - 2 * g[1:-1, :-2] + 4 * g[1:-1, 1:-1] - 2 * g[1:-1, 2:]
+        + g[2:, :-2] - 2 * g[2:, 1:-1] + g[2:, 2:]
+    )
+    h, w = g.shape
+    return float(np.abs(r).sum() * np.sqrt(np.pi / 2.0) / (6.0 * (w - 2) * (h - 2)))
+
+
+def preprocess_array(
+    image_bgr: np.ndarray,
+    mode: str = "auto",
+    target_wh: Tuple[int, int] = TARGET_WH,
+) -> Tuple[np.ndarray, dict]:
+    """
+    In-memory preprocessing of a decoded BGR frame (no PIL round trip).
+    Returns the processed image and what was measured/done.
+    """
+    import cv2
+
+    if mode not in PREPROCESS_MODES:
+        raise ValueError(f"Unknown preprocess mode: {mode}")
+
+    image = cv2.resize(image_bgr, target_wh, interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    brightness = float(measure_brightness(gray))
+    noise = estimate_noise(gray) if mode == "auto" else None
+
+    if brightness < DARK_BRIGHTNESS:
+        image = cv2.convertScaleAbs(image, alpha=1.2, beta=25)
+
+    denoise = mode
+    if mode == "auto":
+        # Dark frames are brightened above, which amplifies sensor noise
+        if brightness < DARK_BRIGHTNESS or noise >= NOISE_SIGMA_QUALITY:
+            denoise = "quality"
+        elif noise >= NOISE_SIGMA_FAST:
+            denoise = "fast"
+        else:
+            denoise = "none"
+
+    if denoise == "quality":
+        image = cv2.fastNlMeansDenoisingColored(image, None, 10, 10, 7, 21)
+    elif denoise == "fast":
+        image = cv2.GaussianBlur(image, (3, 3), 0)
+
+    h, w = image.shape[:2]
+    meta = {
+        "width": w,
+        "height": h,
+        "brightness_before": brightness,
+        "noise_sigma": noise,
+        "denoise": denoise,
+    }
+    return image, meta
+
+
+def preprocess_image(raw_path: Path, processed_dir: Path, time_stamp, mode: str = "quality") -> tuple[Path, dict]:
+    import cv2
+    from PIL import Image, ImageOps
 
-def preprocess_image(raw_path: Path, processed_dir: Path, time_stamp) -> tuple[Path, dict]:
     raw_path = Path(raw_path)
     if not raw_path.exists():
         raise FileNotFoundError(f"Raw image not found: {raw_path}")
@@ -12,14 +105,7 @@ def preprocess_image(raw_path: Path, processed_dir: Path, time_stamp) -> tuple[P
     image = ImageOps.exif_transpose(image)
     good_image = np.array(image)
     opencv_image = cv2.cvtColor(good_image, cv2.COLOR_RGB2BGR)
-    target_width = 640
-    target_height = 480
-    opencv_image = cv2.resize(opencv_image, (target_width, target_height), interpolation=cv2.INTER_AREA)
-    gray = cv2.cvtColor(opencv_image, cv2.COLOR_BGR2GRAY)
-    brightness = float(np.mean(gray))
-    if brightness < 25:
-        opencv_image = cv2.convertScaleAbs(opencv_image, alpha=1.2, beta=25)
-    opencv_image = cv2.fastNlMeansDenoisingColored(opencv_image, None, 10, 10, 7, 21)
+    opencv_image, info = preprocess_array(opencv_image, mode=mode)
     processed_dir = Path(processed_dir)
     processed_dir.mkdir(parents=True, exist_ok=True)
 
@@ -27,13 +113,47 @@ def preprocess_image(raw_path: Path, processed_dir: Path, time_stamp) -> tuple[P
     write = cv2.imwrite(str(processed_file), opencv_image)
     if not write:
         raise RuntimeError(f"Failed to write processed image: {processed_file}")
-    h, w = opencv_image.shape[:2]
     meta = {
     "raw_path": str(raw_path),
     "processed_path": str(processed_file),
-    "width": w,
-    "height": h,
-    "brightness_before": brightness,
+    "width": info["width"],
+    "height": info["height"],
+    "brightness_before": info["brightness_before"],
+    "denoise": info["denoise"],
     "timestamp": time_stamp,
     }
     return processed_file, meta
+
+
+# -----------------------------
+# Burst-parallel preprocessing
+# -----------------------------
+_pool = WarmPool()
+
+
+def _preprocess_one(args: Tuple[Union[bytes, np.ndarray], str, Tuple[int, int]]) -> Tuple[np.ndarray, dict]:
+    import cv2
+
+    src, mode, target_wh = args
+    if isinstance(src, (bytes, bytearray)):
+        # JPEG bytes are far cheaper to ship to a worker than a decoded array
+        src = cv2.imdecode(np.frombuffer(src, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return preprocess_array(src, mode=mode, target_wh=target_wh)
+
+
+def preprocess_burst(
+    images: List[Union[bytes, np.ndarray]],
+    mode: str = "auto",
+    target_wh: Tuple[int, int] = TARGET_WH,
+    workers: Optional[int] = None,
+) -> List[Tuple[np.ndarray, dict]]:
+    """
+    preprocess_array over a whole burst on a process pool that is kept warm
+    between calls. Items may be decoded BGR arrays or encoded JPEG bytes
+    (e.g. Frame.jpeg). Results come back in input order.
+    """
+    if not images:
+        return []
+    if workers == 1 or len(images) == 1:
+        return [_preprocess_one((img, mode, target_wh)) for img in images]
+    return list(_pool.get(workers).map(_preprocess_one, [(img, mode, target_wh) for img in images]))
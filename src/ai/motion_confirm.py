@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.camera.frame import Frame
+
+# Frames are compared as small gray images of this size
+MOTION_SIZE_WH = (160, 120)
+# Gray-level change (after removing the global brightness shift) that counts as "changed"
+DIFF_THRESHOLD = 25
+# Share of the masked area that has to change between two burst frames
+MIN_CHANGED_FRACTION = 0.01
+
+# Region rectangles are normalized (x1, y1, x2, y2), 0..1 of the frame
+Region = Tuple[float, float, float, float]
+
+
+@dataclass
+class MotionResult:
+    confirmed: bool
+    changed_fraction: float
+    ms: float
+
+
+def region_mask(
+    size_wh: Tuple[int, int],
+    include: Optional[Sequence[Region]] = None,
+    exclude: Optional[Sequence[Region]] = None,
+) -> np.ndarray:
+    """
+    Boolean (H, W) mask: the include rectangles (whole frame if none)
+    minus the exclude rectangles (e.g. the street behind the gate, a tree).
+    """
+    w, h = size_wh
+    mask = np.zeros((h, w), dtype=bool) if include else np.ones((h, w), dtype=bool)
+
+    def _px(r: Region) -> Tuple[int, int, int, int]:
+        x1, y1, x2, y2 = r
+        return int(x1 * w), int(y1 * h), int(np.ceil(x2 * w)), int(np.ceil(y2 * h))
+
+    for r in include or ():
+        x1, y1, x2, y2 = _px(r)
+        mask[y1:y2, x1:x2] = True
+    for r in exclude or ():
+        x1, y1, x2, y2 = _px(r)
+        mask[y1:y2, x1:x2] = False
+    return mask
+
+
+def _small_gray(frame: Frame, size_wh: Tuple[int, int]) -> np.ndarray:
+    import cv2
+
+    # 1/8 scale straight out of libjpeg, then a blur so sensor noise does not count as motion
+    gray = cv2.imdecode(np.frombuffer(frame.jpeg, dtype=np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if gray is None:
+        gray = cv2.cvtColor(frame.array, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, size_wh, interpolation=cv2.INTER_AREA)
+    return cv2.GaussianBlur(small, (5, 5), 0).astype(np.int16)
+
+
+class MotionConfirmer:
+    """
+    Checks that a PIR trigger shows real movement in the picture before the
+    burst goes to Vision / Telegram. Frames of the burst are differenced
+    against the first one at MOTION_SIZE_WH; sun, heat shimmer on the sensor
+    or a car outside the masked regions leave them (nearly) identical.
+    A global brightness change (cloud, auto-exposure) is subtracted first.
+    """
+
+    def __init__(
+        self,
+        include: Optional[Sequence[Region]] = None,
+        exclude: Optional[Sequence[Region]] = None,
+        size_wh: Tuple[int, int] = MOTION_SIZE_WH,
+        diff_threshold: int = DIFF_THRESHOLD,
+        min_changed_fraction: float = MIN_CHANGED_FRACTION,
+    ) -> None:
+        self.size_wh = size_wh
+        self.diff_threshold = diff_threshold
+        self.min_changed_fraction = min_changed_fraction
+        self.mask = region_mask(size_wh, include, exclude)
+        self._mask_px = int(self.mask.sum())
+        if self._mask_px == 0:
+            raise ValueError("Motion regions leave nothing to watch (exclude covers every include area)")
+        self.counts = {"checked": 0, "confirmed": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    def changed_fraction(self, a: np.ndarray, b: np.ndarray) -> float:
+        diff = b - a
+        # Remove the global brightness shift so exposure changes are not "motion"
+        diff -= int(np.median(diff[self.mask]))
+        changed = (np.abs(diff) > self.diff_threshold) & self.mask
+        return float(changed.sum()) / self._mask_px
+
+    def check(self, frames: List[Frame]) -> MotionResult:
+        """
+        Compares the first frame with the others, latest first (the longest
+        gap shows the most movement), and stops as soon as one pair confirms.
+        """
+        t0 = time.perf_counter()
+        best = 0.0
+        if len(frames) >= 2:
+            ref = _small_gray(frames[0], self.size_wh)
+            for frame in reversed(frames[1:]):
+                best = max(best, self.changed_fraction(ref, _small_gray(frame, self.size_wh)))
+                if best >= self.min_changed_fraction:
+                    break
+        else:
+            # Nothing to compare against: do not block the event
+            best = 1.0
+
+        confirmed = best >= self.min_changed_fraction
+        with self._lock:
+            self.counts["checked"] += 1
+            self.counts["confirmed" if confirmed else "rejected"] += 1
+        return MotionResult(confirmed, best, (time.perf_counter() - t0) * 1000.0)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counts)
@@ -1,20 +1,71 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
 import numpy as np
-import face_recognition
 
 from src.utils.json_utils import read_json, safe_write_json
 KNOWN_FACES_DIR = Path("data/known_faces")
 ENCODING_PATH = KNOWN_FACES_DIR / "encodings.json"
 DEFAULT_TOLERANCE = 0.525
+# How per-image distances are turned into per-person distances:
+#   "min"      closest enrolled photo of that person (the old argmin behaviour)
+#   "centroid" distance to the mean encoding of that person
+#   "knn"      persons ranked by distance-weighted votes among the knn nearest photos
+DEFAULT_AGGREGATE = "min"
+DEFAULT_TOP_K = 3
+DEFAULT_KNN = 5
+
+@dataclass
+class DetectionConfig:
+    model: str = "cnn"                      # "cnn" (dlib CNN) or "hog"
+    downscale: float = 1.0                  # detect on a copy resized by this factor, map boxes back
+    upsample: int = 1                       # dlib upsampling passes (finds smaller faces, costs time)
+    roi_xyxy: Optional[List[int]] = None    # only search this full-res region (e.g. the doorway)
+
+# Latency/recall tradeoff. Approximate figures from a single one-off run of
+# benchmarks/bench_face_detection.py on one x86 core (a Pi 4 core is slower),
+# over 12 composited doorway shots of 5 people, near and far. Those images are
+# not in this repo, so the table cannot be reproduced from it; treat it as the
+# rough shape of the tradeoff only:
+#              640 px long edge, recall vs accurate    1280 px long edge, recall vs hog
+#   accurate   ~11.7 s   1.00                          out of memory (> 5.5 GB)
+#   hog        ~190 ms   1.00                          ~790 ms   1.00
+#   fast        ~45 ms   0.75                          ~200 ms   0.92
+#   fastest     ~25 ms   0.33                           ~60 ms   0.50
+# fast / fastest lose the far-away faces first. A roi_xyxy crop cuts cost
+# roughly in proportion to the area removed.
+# Run the benchmark on your own door images to get the numbers for your setup.
+DETECTION_MODES: Dict[str, DetectionConfig] = {
+    "accurate": DetectionConfig(model="cnn", downscale=1.0),
+    "hog": DetectionConfig(model="hog", downscale=1.0),
+    "fast": DetectionConfig(model="hog", downscale=0.5),
+    "fastest": DetectionConfig(model="hog", downscale=0.25),
+}
+
+@dataclass
+class TrackedFaces:
+    per_frame: List[List["FaceMatch"]]   # every detected box, labelled with its track's match
+    tracks: List[Any]                    # src.ai.face_tracker.FaceTrack
+    track_matches: List["FaceMatch"]     # one per track, bbox from the crop that was encoded
+
+@dataclass
+class FaceCandidate:
+    name: str
+    distance: float
 
 @dataclass
 class FaceMatch:
     name: str
     confidence: float
     bbox_xyxy: List[int]
+    candidates: List[FaceCandidate] = field(default_factory=list)
 
 def iter_known_faces(known_dir: Path) -> List[Tuple[str, Path]]:
     items: List[Tuple[str, Path]] = []
@@ -29,28 +80,117 @@ def iter_known_faces(known_dir: Path) -> List[Tuple[str, Path]]:
                 items.append((name, img_path))
     return items
 
-def build_encodings(known_dir: Path = KNOWN_FACES_DIR) -> Dict[str, Any]:
-    entries = []
+def file_sha1(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _encode_image(img_path: str) -> Optional[List[float]]:
+    # Runs in a worker process
+    import face_recognition
+
+    image = face_recognition.load_image_file(img_path)
+    encs = face_recognition.face_encodings(image)
+    if not encs:
+        return None
+    return encs[0].tolist()
+
+
+def build_encodings(
+    known_dir: Path = KNOWN_FACES_DIR,
+    encoding_path: Path = ENCODING_PATH,
+    workers: Optional[int] = None,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """
+    Incremental: an image is re-encoded only if it is new or its size/mtime
+    changed and its sha1 differs from the cached one. Entries for deleted
+    images are dropped. Images without a face are remembered under "skipped"
+    so they are not retried every build. New work is spread over a process pool.
+    full=True ignores the cache and re-encodes everything.
+    """
+    t0 = time.perf_counter()
+    known_dir = Path(known_dir)
+    encoding_path = Path(encoding_path)
+
+    previous: Dict[str, Dict[str, Any]] = {}
+    if not full:
+        cached = read_json(encoding_path, default=None) or {}
+        for item in cached.get("entries", []) + cached.get("skipped", []):
+            previous[item["path"]] = item
+
+    entries: List[Dict[str, Any]] = []
+    skipped: List[Dict[str, Any]] = []
+    todo: List[Dict[str, Any]] = []
+    reused = 0
+    touched = 0
+
     for name, img_path in iter_known_faces(known_dir):
-        image = face_recognition.load_image_file(str(img_path))
-        encs = face_recognition.face_encodings(image)
-        if not encs:
-            continue
-        entries.append({
-            "name": name,
-            "path": str(img_path),
-            "encoding": encs[0].tolist(),
-        })
-
-    payload = {"version": 1, "known_dir": str(known_dir), "entries": entries}
-    safe_write_json(ENCODING_PATH, payload, pretty=True)
+        st = img_path.stat()
+        key = {"name": name, "path": str(img_path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        old = previous.get(str(img_path))
+
+        if old and old.get("name") == name and old.get("size") == st.st_size and old.get("mtime_ns") == st.st_mtime_ns:
+            item = old
+        else:
+            key["sha1"] = file_sha1(img_path)
+            if old and old.get("name") == name and old.get("sha1") == key["sha1"]:
+                # touched but identical content: keep the old encoding
+                item = {**old, **key}
+                touched += 1
+            else:
+                todo.append(key)
+                continue
+
+        reused += 1
+        if item.get("encoding") is None:
+            skipped.append(item)
+        else:
+            entries.append(item)
+
+    if todo:
+        paths = [t["path"] for t in todo]
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(todo) > 1:
+            # spawn, not fork: this runs from the analyze thread of a process with
+            # several threads (camera, notifier, writers) already running
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=ctx) as pool:
+                encodings = list(pool.map(_encode_image, paths, chunksize=max(1, len(todo) // (workers * 4))))
+        else:
+            encodings = [_encode_image(p) for p in paths]
+
+        for key, enc in zip(todo, encodings):
+            if enc is None:
+                skipped.append(key)
+            else:
+                entries.append({**key, "encoding": enc})
+
+    removed = len(set(previous) - {e["path"] for e in entries} - {e["path"] for e in skipped})
+    payload = {
+        "version": 2,
+        "known_dir": str(known_dir),
+        "entries": entries,
+        "skipped": skipped,
+        "stats": {
+            "encoded": len(todo),
+            "reused": reused,
+            "removed": removed,
+            "seconds": round(time.perf_counter() - t0, 3),
+        },
+    }
+    if todo or removed or touched or not encoding_path.exists():
+        safe_write_json(encoding_path, payload, pretty=True)
     return payload
 
-def load_encodings() -> Dict[str, Any]:
-    cached = read_json(ENCODING_PATH, default=None)
+def load_encodings(encoding_path: Path = ENCODING_PATH, known_dir: Path = KNOWN_FACES_DIR) -> Dict[str, Any]:
+    cached = read_json(encoding_path, default=None)
     if cached and cached.get("entries"):
         return cached
-    return build_encodings(KNOWN_FACES_DIR)
+    return build_encodings(known_dir, encoding_path)
 
 def prepare_known_arrays(cache: Dict[str, Any]) -> Tuple[List[str], np.ndarray]:
     names: List[str] = []
@@ -62,29 +202,358 @@ def prepare_known_arrays(cache: Dict[str, Any]) -> Tuple[List[str], np.ndarray]:
         return [], np.zeros((0, 128), dtype=np.float32)
     return names, np.vstack(vectors)
 
-def recognize_faces_offline(image_rgb: np.ndarray, tolerance: float = DEFAULT_TOLERANCE) -> List[FaceMatch]:
-    cache = load_encodings()
-    names, vectors = prepare_known_arrays(cache)
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
 
-    face_locations = face_recognition.face_locations(image_rgb, model="cnn")
-    face_encodings = face_recognition.face_encodings(image_rgb, face_locations)
 
-    results: List[FaceMatch] = []
-    for (top, right, bottom, left), enc in zip(face_locations, face_encodings):
-        bbox = [int(left), int(top), int(right), int(bottom)]
+def known_faces_signature(known_dir: Path) -> Tuple:
+    """
+    Cheap fingerprint of the enrolled photos: (path, mtime, size) of every image.
+    Any add, delete, rename or overwrite changes it.
+    """
+    if not known_dir.exists():
+        return ()
+    items = []
+    for name, img_path in iter_known_faces(known_dir):
+        items.append((str(img_path), _stat_key(img_path)))
+    items.sort()
+    return tuple(items)
 
-        if len(names) == 0:
-            results.append(FaceMatch(name="UNKNOWN", confidence=0.0, bbox_xyxy=bbox))
-            continue
 
-        distances = face_recognition.face_distance(vectors, enc)
-        best_idx = int(np.argmin(distances))
-        best_dist = float(distances[best_idx])
+class KnownFaceGallery:
+    """
+    Holds the prepared names/vectors for the life of the process.
+    refresh() only re-reads encodings.json when it changed on disk, and only
+    rebuilds it when photos under known_dir were added, removed or replaced.
+    The stat scan itself runs at most once per check_interval_s.
+    """
+
+    def __init__(
+        self,
+        known_dir: Path = KNOWN_FACES_DIR,
+        encoding_path: Path = ENCODING_PATH,
+        check_interval_s: float = 2.0,
+    ) -> None:
+        self.known_dir = Path(known_dir)
+        self.encoding_path = Path(encoding_path)
+        self.check_interval_s = check_interval_s
+
+        self.names: List[str] = []
+        self.vectors: np.ndarray = np.zeros((0, 128), dtype=np.float32)
+        self.loads = 0
+
+        # Per-identity view; vectors are grouped so each person is one contiguous run
+        self.identities: List[str] = []
+        self.identity_of: np.ndarray = np.zeros((0,), dtype=np.int64)
+        self.identity_starts: np.ndarray = np.zeros((0,), dtype=np.int64)
+        self.centroids: np.ndarray = np.zeros((0, 128), dtype=np.float32)
+        self._sq_norms: np.ndarray = np.zeros((0,), dtype=np.float32)
+        self._centroid_sq_norms: np.ndarray = np.zeros((0,), dtype=np.float32)
+
+        self._file_key: Optional[Tuple[int, int]] = None
+        self._tree_key: Optional[Tuple] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self, cache: Dict[str, Any]) -> None:
+        names, vectors = prepare_known_arrays(cache)
+
+        order = sorted(range(len(names)), key=lambda i: names[i])
+        self.names = [names[i] for i in order]
+        self.vectors = np.ascontiguousarray(vectors[order], dtype=np.float32) if names else vectors
+
+        self.identities = sorted(set(self.names))
+        index = {n: i for i, n in enumerate(self.identities)}
+        self.identity_of = np.array([index[n] for n in self.names], dtype=np.int64)
+        self.identity_starts = np.searchsorted(self.identity_of, np.arange(len(self.identities)))
+        if self.identities:
+            sums = np.add.reduceat(self.vectors, self.identity_starts, axis=0)
+            counts = np.diff(np.append(self.identity_starts, len(self.names)))
+            self.centroids = (sums / counts[:, None]).astype(np.float32)
+        else:
+            self.centroids = np.zeros((0, 128), dtype=np.float32)
+        self._sq_norms = np.einsum("ij,ij->i", self.vectors, self.vectors)
+        self._centroid_sq_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+
+        self._file_key = _stat_key(self.encoding_path)
+        self.loads += 1
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Returns True if the arrays were (re)loaded.
+        """
+        now = time.monotonic()
+        if not force and self._tree_key is not None and now - self._last_check < self.check_interval_s:
+            return False
+
+        with self._lock:
+            self._last_check = now
+            tree_key = known_faces_signature(self.known_dir)
 
-        confidence = max(0.0, 1.0 - (best_dist / tolerance))
-        if best_dist <= tolerance:
-            results.append(FaceMatch(name=names[best_idx], confidence=confidence, bbox_xyxy=bbox))
+            if self._tree_key is None or force or tree_key != self._tree_key:
+                # First load included: photos may have been added while the process
+                # was down. Incremental, so unchanged photos cost only a stat.
+                self._load(build_encodings(self.known_dir, self.encoding_path))
+            elif _stat_key(self.encoding_path) != self._file_key:
+                # encodings.json rewritten by another process (e.g. enrollment)
+                self._load(load_encodings(self.encoding_path, self.known_dir))
+            else:
+                self._tree_key = tree_key
+                return False
+
+            self._tree_key = tree_key
+            return True
+
+    def arrays(self) -> Tuple[List[str], np.ndarray]:
+        self.refresh()
+        return self.names, self.vectors
+
+    def match(
+        self,
+        encodings: np.ndarray,
+        top_k: int = DEFAULT_TOP_K,
+        aggregate: str = DEFAULT_AGGREGATE,
+        knn: int = DEFAULT_KNN,
+    ) -> List[List[FaceCandidate]]:
+        """
+        Matches (Q, 128) query encodings against every enrolled identity in one
+        float32 matrix pass. Returns up to top_k candidates per query, best first.
+        """
+        self.refresh()
+        queries = np.asarray(encodings, dtype=np.float32).reshape(-1, 128)
+        if len(queries) == 0 or not self.identities:
+            return [[] for _ in range(len(queries))]
+
+        q_sq = np.einsum("ij,ij->i", queries, queries)[:, None]
+
+        if aggregate == "centroid":
+            person_dist = _euclidean(q_sq, self._centroid_sq_norms, queries @ self.centroids.T)
+            rank = person_dist
         else:
-            results.append(FaceMatch(name="UNKNOWN", confidence=confidence, bbox_xyxy=bbox))
+            dist = _euclidean(q_sq, self._sq_norms, queries @ self.vectors.T)        # (Q, N)
+            person_dist = np.minimum.reduceat(dist, self.identity_starts, axis=1)   # (Q, P)
+            if aggregate == "knn":
+                k = min(knn, dist.shape[1])
+                nearest = np.argpartition(dist, k - 1, axis=1)[:, :k]               # (Q, k)
+                weights = 1.0 / (np.take_along_axis(dist, nearest, axis=1) + 1e-6)
+                votes = np.zeros(person_dist.shape, dtype=np.float32)
+                rows = np.repeat(np.arange(len(queries)), k)
+                np.add.at(votes, (rows, self.identity_of[nearest].ravel()), weights.ravel())
+                rank = -votes
+            elif aggregate == "min":
+                rank = person_dist
+            else:
+                raise ValueError(f"Unknown aggregate: {aggregate}")
+
+        top_k = max(1, min(top_k, len(self.identities)))
+        best = np.argsort(rank, axis=1, kind="stable")[:, :top_k]
+        best_dist = np.take_along_axis(person_dist, best, axis=1)
+
+        return [
+            [FaceCandidate(name=self.identities[int(p)], distance=float(d)) for p, d in zip(row, drow)]
+            for row, drow in zip(best, best_dist)
+        ]
+
+
+def _euclidean(q_sq: np.ndarray, v_sq: np.ndarray, dot: np.ndarray) -> np.ndarray:
+    # ||q - v|| from ||q||^2 + ||v||^2 - 2 q.v, clamped against float32 round-off
+    return np.sqrt(np.maximum(q_sq + v_sq[None, :] - 2.0 * dot, 0.0))
+
+
+_gallery: Optional[KnownFaceGallery] = None
+
+
+def get_gallery() -> KnownFaceGallery:
+    """
+    Process-wide gallery for the default data/known_faces layout.
+    """
+    global _gallery
+    if _gallery is None:
+        _gallery = KnownFaceGallery()
+    return _gallery
+
+
+def _detection_config(detection: Union[str, DetectionConfig, None]) -> DetectionConfig:
+    if detection is None:
+        return DETECTION_MODES["accurate"]
+    if isinstance(detection, str):
+        if detection not in DETECTION_MODES:
+            raise ValueError(f"Unknown detection mode: {detection}")
+        return DETECTION_MODES[detection]
+    return detection
+
+
+def detect_face_locations(
+    image_rgb: np.ndarray,
+    detection: Union[str, DetectionConfig, None] = None,
+) -> List[Tuple[int, int, int, int]]:
+    """
+    face_recognition-style (top, right, bottom, left) boxes in full-resolution
+    coordinates, whatever crop/downscale was used to find them.
+    """
+    import cv2
+    import face_recognition
+
+    cfg = _detection_config(detection)
+    h, w = image_rgb.shape[:2]
+
+    ox, oy = 0, 0
+    search = image_rgb
+    if cfg.roi_xyxy:
+        x1, y1, x2, y2 = cfg.roi_xyxy
+        x1, x2 = max(0, int(x1)), min(w, int(x2))
+        y1, y2 = max(0, int(y1)), min(h, int(y2))
+        if x2 > x1 and y2 > y1:
+            search = image_rgb[y1:y2, x1:x2]
+            ox, oy = x1, y1
+
+    scale = float(cfg.downscale)
+    if 0.0 < scale < 1.0:
+        sh, sw = search.shape[:2]
+        small = cv2.resize(search, (max(1, int(sw * scale)), max(1, int(sh * scale))), interpolation=cv2.INTER_AREA)
+    else:
+        scale = 1.0
+        small = np.ascontiguousarray(search)
 
+    found = face_recognition.face_locations(small, number_of_times_to_upsample=cfg.upsample, model=cfg.model)
+
+    boxes = []
+    for top, right, bottom, left in found:
+        boxes.append((
+            min(h, int(round(top / scale)) + oy),
+            min(w, int(round(right / scale)) + ox),
+            min(h, int(round(bottom / scale)) + oy),
+            min(w, int(round(left / scale)) + ox),
+        ))
+    return boxes
+
+
+def _to_match(bbox: List[int], candidates: List[FaceCandidate], tolerance: float) -> FaceMatch:
+    if not candidates:
+        return FaceMatch(name="UNKNOWN", confidence=0.0, bbox_xyxy=bbox)
+    best = candidates[0]
+    confidence = max(0.0, 1.0 - (best.distance / tolerance))
+    name = best.name if best.distance <= tolerance else "UNKNOWN"
+    return FaceMatch(name=name, confidence=confidence, bbox_xyxy=bbox, candidates=candidates)
+
+
+def recognize_faces_batch(
+    images_rgb: List[np.ndarray],
+    tolerance: float = DEFAULT_TOLERANCE,
+    gallery: Optional[KnownFaceGallery] = None,
+    top_k: int = DEFAULT_TOP_K,
+    aggregate: str = DEFAULT_AGGREGATE,
+    detection: Union[str, DetectionConfig, None] = None,
+) -> List[List[FaceMatch]]:
+    """
+    Detects and encodes faces in every image (e.g. a whole burst), then
+    matches all of them against the gallery in a single matrix operation.
+    Returns one list of FaceMatch per input image.
+    """
+    import face_recognition
+
+    gallery = gallery or get_gallery()
+
+    boxes: List[List[List[int]]] = []
+    all_encodings: List[np.ndarray] = []
+    for image_rgb in images_rgb:
+        face_locations = detect_face_locations(image_rgb, detection)
+        # Encode on the full-resolution image even when detection ran on a smaller copy
+        face_encodings = face_recognition.face_encodings(image_rgb, face_locations)
+        boxes.append([[int(left), int(top), int(right), int(bottom)] for (top, right, bottom, left) in face_locations])
+        all_encodings.extend(face_encodings)
+
+    if all_encodings:
+        candidates = gallery.match(np.vstack(all_encodings), top_k=top_k, aggregate=aggregate)
+    else:
+        candidates = []
+
+    results: List[List[FaceMatch]] = []
+    pos = 0
+    for image_boxes in boxes:
+        matches = []
+        for bbox in image_boxes:
+            matches.append(_to_match(bbox, candidates[pos], tolerance))
+            pos += 1
+        results.append(matches)
     return results
+
+
+def recognize_faces_tracked(
+    images_rgb: List[np.ndarray],
+    tolerance: float = DEFAULT_TOLERANCE,
+    gallery: Optional[KnownFaceGallery] = None,
+    top_k: int = DEFAULT_TOP_K,
+    aggregate: str = DEFAULT_AGGREGATE,
+    detection: Union[str, DetectionConfig, None] = None,
+) -> TrackedFaces:
+    """
+    Like recognize_faces_batch over a burst, but faces are first grouped into
+    tracks across frames and only the best crop of each track (size, blur)
+    is encoded and matched: one encoding per person instead of per frame.
+    """
+    import face_recognition
+    from src.ai.face_tracker import crop_sharpness, pick_best_crops, track_faces
+
+    locations = [detect_face_locations(image_rgb, detection) for image_rgb in images_rgb]
+    boxes = [[[int(l), int(t), int(r), int(b)] for (t, r, b, l) in locs] for locs in locations]
+    tracks = track_faces(boxes)
+    pick_best_crops(tracks, lambda fi, bi, box: (crop_sharpness(images_rgb[fi], box), 1.0))
+
+    # Encode the chosen crops, one face_encodings call per frame that has any
+    by_frame: Dict[int, List[int]] = {}
+    for ti, t in enumerate(tracks):
+        by_frame.setdefault(t.best_frame, []).append(ti)
+    encodings: List[Optional[np.ndarray]] = [None] * len(tracks)
+    for fi, track_ids in by_frame.items():
+        locs = [locations[fi][tracks[ti].boxes[fi][0]] for ti in track_ids]
+        for ti, enc in zip(track_ids, face_recognition.face_encodings(images_rgb[fi], locs)):
+            encodings[ti] = enc
+
+    return label_tracks(boxes, tracks, encodings, tolerance, gallery, top_k=top_k, aggregate=aggregate)
+
+
+def label_tracks(
+    boxes: List[List[List[int]]],
+    tracks: List[Any],
+    encodings: List[Optional[np.ndarray]],
+    tolerance: float = DEFAULT_TOLERANCE,
+    gallery: Optional[KnownFaceGallery] = None,
+    top_k: int = DEFAULT_TOP_K,
+    aggregate: str = DEFAULT_AGGREGATE,
+) -> TrackedFaces:
+    """
+    Matches one encoding per track (None = could not be encoded) in a single
+    gallery pass and labels every box of the track with the result.
+    """
+    gallery = gallery or get_gallery()
+    encoded = [ti for ti, enc in enumerate(encodings) if enc is not None]
+    candidates: List[List[FaceCandidate]] = [[] for _ in tracks]
+    if encoded:
+        matched = gallery.match(np.vstack([encodings[ti] for ti in encoded]), top_k=top_k, aggregate=aggregate)
+        for ti, cands in zip(encoded, matched):
+            candidates[ti] = cands
+
+    track_matches = [_to_match(t.best_box()[1], candidates[ti], tolerance) for ti, t in enumerate(tracks)]
+    per_frame: List[List[FaceMatch]] = [[None] * len(b) for b in boxes]  # type: ignore[list-item]
+    for ti, t in enumerate(tracks):
+        for fi, (bi, box) in t.boxes.items():
+            per_frame[fi][bi] = _to_match(box, candidates[ti], tolerance)
+    return TrackedFaces(per_frame=per_frame, tracks=tracks, track_matches=track_matches)
+
+
+def recognize_faces_offline(
+    image_rgb: np.ndarray,
+    tolerance: float = DEFAULT_TOLERANCE,
+    gallery: Optional[KnownFaceGallery] = None,
+    top_k: int = DEFAULT_TOP_K,
+    aggregate: str = DEFAULT_AGGREGATE,
+    detection: Union[str, DetectionConfig, None] = None,
+) -> List[FaceMatch]:
+    return recognize_faces_batch(
+        [image_rgb], tolerance, gallery, top_k=top_k, aggregate=aggregate, detection=detection
+    )[0]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.ai.offline_face_recognition import (
+    DEFAULT_AGGREGATE,
+    DEFAULT_TOLERANCE,
+    DEFAULT_TOP_K,
+    DetectionConfig,
+    KnownFaceGallery,
+    TrackedFaces,
+    detect_face_locations,
+    label_tracks,
+)
+from src.utils.process_pool import WarmPool, init_cv2_worker
+
+# Face crops sent back by the workers are padded by this fraction of the box on
+# every side, enough for dlib's landmark / alignment step to see the whole face
+CROP_MARGIN = 0.5
+
+log = logging.getLogger(__name__)
+
+
+# -----------------------------
+# Worker side
+# -----------------------------
+def _init_worker() -> None:
+    import face_recognition  # loads the dlib detector / landmark / encoder models
+
+    init_cv2_worker()
+    # First HOG call builds its scanner; pay that here, not on the first event
+    face_recognition.face_locations(np.zeros((64, 64, 3), dtype=np.uint8))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _padded_crop(image: np.ndarray, box: List[int], margin: float) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+    h, w = image.shape[:2]
+    l, t, r, b = box
+    px, py = int((r - l) * margin), int((b - t) * margin)
+    x1, y1 = max(0, l - px), max(0, t - py)
+    x2, y2 = min(w, r + px), min(h, b + py)
+    # (top, right, bottom, left) of the face inside the crop
+    return np.ascontiguousarray(image[y1:y2, x1:x2]), (t - y1, r - x1, b - y1, l - x1)
+
+
+def _detect_one(args: Tuple[bytes, Union[str, DetectionConfig, None], float]) -> Dict[str, Any]:
+    """
+    JPEG -> face boxes, crop sharpness and a padded crop per face. Only the
+    crops travel back, never the decoded frame.
+    """
+    import cv2
+    from src.ai.face_tracker import crop_sharpness
+
+    jpeg, detection, margin = args
+    img = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        return {"boxes": [], "sharpness": [], "crops": []}
+    image_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+
+    boxes = [[int(l), int(t), int(r), int(b)] for (t, r, b, l) in detect_face_locations(image_rgb, detection)]
+    return {
+        "boxes": boxes,
+        "sharpness": [crop_sharpness(image_rgb, box) for box in boxes],
+        "crops": [_padded_crop(image_rgb, box, margin) for box in boxes],
+    }
+
+
+def _encode_one(args: Tuple[np.ndarray, Tuple[int, int, int, int]]) -> Optional[np.ndarray]:
+    import face_recognition
+
+    crop, location = args
+    found = face_recognition.face_encodings(crop, [location])
+    return found[0] if found else None
+
+
+# -----------------------------
+# Pool
+# -----------------------------
+_pool = WarmPool(_init_worker)
+
+
+def warm_up(workers: Optional[int] = None) -> Future:
+    """
+    Starts the workers (and their model loading) in the background, so the
+    first Wi-Fi outage does not pay for it. Returns immediately.
+    """
+    return _pool.get(workers).submit(_ping)
+
+
+def shutdown() -> None:
+    _pool.shutdown()
+
+
+def _run(fn, items: List[Any], workers: Optional[int]) -> Optional[List[Any]]:
+    """
+    fn over items on the pool, never in this process (that would load dlib
+    here). A broken pool (e.g. a worker OOM-killed) is replaced and the work
+    retried once; None if that fails too.
+    """
+    if not items:
+        return []
+    for attempt in (1, 2):
+        try:
+            return list(_pool.get(workers).map(fn, items))
+        except BrokenProcessPool:
+            shutdown()
+            log.warning("offline worker pool broke (attempt %d of 2)", attempt)
+    log.error("offline recognition unavailable: worker pool keeps breaking")
+    return None
+
+
+def recognize_burst(
+    jpegs: List[bytes],
+    tolerance: float = DEFAULT_TOLERANCE,
+    gallery: Optional[KnownFaceGallery] = None,
+    top_k: int = DEFAULT_TOP_K,
+    aggregate: str = DEFAULT_AGGREGATE,
+    detection: Union[str, DetectionConfig, None] = None,
+    workers: Optional[int] = None,
+) -> TrackedFaces:
+    """
+    recognize_faces_tracked over encoded burst frames, with detection running
+    one frame per worker and the best crop of each track encoded on the pool.
+    Gallery matching stays in this process (one matrix pass for all tracks).
+    """
+    from src.ai.face_tracker import pick_best_crops, track_faces
+
+    detected = _run(_detect_one, [(jpeg, detection, CROP_MARGIN) for jpeg in jpegs], workers)
+    if detected is None:
+        # Offline recognition unavailable: the frames, with no faces found
+        return TrackedFaces(per_frame=[[] for _ in jpegs], tracks=[], track_matches=[])
+
+    boxes = [d["boxes"] for d in detected]
+    tracks = track_faces(boxes)
+    pick_best_crops(tracks, lambda fi, bi, box: (detected[fi]["sharpness"][bi], 1.0))
+
+    crops = [detected[t.best_frame]["crops"][t.boxes[t.best_frame][0]] for t in tracks]
+    encodings = _run(_encode_one, crops, workers)
+    if encodings is None:
+        # Boxes stay, every track is left unmatched
+        encodings = [None] * len(crops)
+
+    return label_tracks(boxes, tracks, encodings, tolerance, gallery, top_k=top_k, aggregate=aggregate)
@@ -33,6 +33,11 @@ likelihood_score = {
     "VERY_LIKELY": 5,
 }
 
+def likelihood_name(value) -> str:
+    # Vision likelihoods are IntEnums: str() is "5" on Python 3.11+, the name is "VERY_LIKELY"
+    name = getattr(value, "name", None)
+    return name if name is not None else str(value)
+
 def normalize_google_faces(face_annotations):
     normalized_faces = []
 
@@ -45,15 +50,21 @@ def normalize_google_faces(face_annotations):
             "bbox_xyxy": bbox,
             "confidence": float(getattr(face, "detection_confidence", 0.0)),
             "emotion": {
-                "joy": str(face.joy_likelihood),
-                "anger": str(face.anger_likelihood),
-                "sorrow": str(face.sorrow_likelihood),
-                "surprise": str(face.surprise_likelihood),
+                "joy": likelihood_name(face.joy_likelihood),
+                "anger": likelihood_name(face.anger_likelihood),
+                "sorrow": likelihood_name(face.sorrow_likelihood),
+                "surprise": likelihood_name(face.surprise_likelihood),
             },
             "quality": {
-                "blurred": str(face.blurred_likelihood),
-                "underexposed": str(face.under_exposed_likelihood),
-            }
+                "blurred": likelihood_name(face.blurred_likelihood),
+                "underexposed": likelihood_name(face.under_exposed_likelihood),
+            },
+            # degrees; used to prefer frontal crops (src/ai/face_tracker.py)
+            "pose": {
+                "roll": float(getattr(face, "roll_angle", 0.0)),
+                "pan": float(getattr(face, "pan_angle", 0.0)),
+                "tilt": float(getattr(face, "tilt_angle", 0.0)),
+            },
         })
     return normalized_faces
 
@@ -64,14 +75,18 @@ def build_verdict(faces, objects):
     level = "HIGH" if person else "LOW"
     return {"person_detected": person, "face_detected": face, "level": level}
 
-def build_event_record(raw_path, processed_path, img_wh, faces, objects):
-    return {
+def build_event_record(raw_path, processed_path, img_wh, faces, objects, timings: Optional[Dict[str, float]] = None):
+    record = {
         "timestamp": iso_timestamp() ,
         "image": {"raw_path": raw_path, "processed_path": processed_path, "width": img_wh[0], "height": img_wh[1]},
         "faces": faces,
          "objects": objects,
         "verdict": build_verdict(faces, objects)
     }
+    if timings is not None:
+        # per-stage milliseconds (see src/utils/metrics.py)
+        record["timings"] = timings
+    return record
 
 def score_frame(faces: List[Dict], image_wh: Tuple[int, int]) -> float:
     w, h = image_wh
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import io
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.camera.frame import Frame
+from src.utils.timestamp_utils import iso_timestamp
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class Picamera2Backend:
+    """
+    Real camera. Picamera2 is imported on open() so the simulated backend
+    works on machines that do not have the camera stack installed.
+    """
+
+    def __init__(self) -> None:
+        self.cam = None
+
+    def open(self) -> None:
+        from picamera2 import Picamera2
+
+        self.cam = Picamera2()
+        self.cam.configure(self.cam.create_still_configuration())
+        self.cam.start()
+
+    def capture_file(self, target, format: Optional[str] = None) -> None:
+        if format:
+            self.cam.capture_file(target, format=format)
+        else:
+            self.cam.capture_file(target)
+
+    def capture_array(self) -> np.ndarray:
+        return self.cam.capture_array()
+
+    def close(self) -> None:
+        if self.cam is None:
+            return
+        try:
+            self.cam.stop()
+        except Exception:
+            pass
+        try:
+            self.cam.close()
+        except Exception:
+            pass
+        self.cam = None
+
+
+class SimulatedBackend:
+    """
+    Produces synthetic frames (gradient background + a moving bright block + noise)
+    so capture latency can be measured without a camera.
+    frame_interval_s mimics the sensor frame period.
+    """
+
+    def __init__(
+        self,
+        size_wh: Tuple[int, int] = (1280, 960),
+        frame_interval_s: float = 1.0 / 30.0,
+        seed: int = 0,
+    ) -> None:
+        self.size_wh = size_wh
+        self.frame_interval_s = frame_interval_s
+        self.rng = np.random.default_rng(seed)
+        self.frame_index = 0
+        self.last_frame_t = 0.0
+        self.opened = False
+
+        w, h = size_wh
+        ramp = np.linspace(40, 200, w, dtype=np.float32)
+        self.background = np.repeat(ramp[None, :], h, axis=0)
+
+    def open(self) -> None:
+        self.opened = True
+        self.last_frame_t = time.monotonic()
+
+    def _wait_for_frame(self) -> None:
+        # Frames arrive on a fixed cadence, like a streaming sensor
+        next_t = self.last_frame_t + self.frame_interval_s
+        delay = next_t - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        self.last_frame_t = time.monotonic()
+
+    def capture_array(self) -> np.ndarray:
+        if not self.opened:
+            raise RuntimeError("SimulatedBackend is not open")
+        self._wait_for_frame()
+
+        w, h = self.size_wh
+        gray = self.background.copy()
+
+        # moving "visitor" block
+        bw, bh = w // 6, h // 3
+        x = (self.frame_index * 23) % max(1, w - bw)
+        y = h // 3
+        gray[y:y + bh, x:x + bw] = 230.0
+
+        gray += self.rng.normal(0.0, 6.0, size=gray.shape).astype(np.float32)
+        self.frame_index += 1
+
+        img = np.clip(gray, 0, 255).astype(np.uint8)
+        return np.repeat(img[:, :, None], 3, axis=2)
+
+    def capture_file(self, target, format: Optional[str] = None) -> None:
+        import cv2
+
+        img = self.capture_array()
+        ok, buf = cv2.imencode(".jpg", img)
+        if not ok:
+            raise RuntimeError("Failed to encode simulated frame")
+        if isinstance(target, (str, Path)):
+            Path(target).write_bytes(buf.tobytes())
+        else:
+            target.write(buf.tobytes())
+
+    def close(self) -> None:
+        self.opened = False
+
+
+# -----------------------------
+# Long-lived camera service
+# -----------------------------
+class CameraService:
+    """
+    Keeps the camera configured and streaming between events, so a burst
+    starts on the next sensor frame instead of after open/configure/warm-up.
+    """
+
+    def __init__(self, backend: Optional[Any] = None, warmup_s: float = 0.1) -> None:
+        self.backend = backend or Picamera2Backend()
+        self.warmup_s = warmup_s
+        self.started = False
+        self.lock = threading.Lock()
+
+    def start(self) -> None:
+        with self.lock:
+            if self.started:
+                return
+            self.backend.open()
+            # Warm-up is paid once, at startup, not per event
+            time.sleep(max(0.0, self.warmup_s))
+            self.started = True
+
+    def close(self) -> None:
+        with self.lock:
+            if not self.started:
+                return
+            self.backend.close()
+            self.started = False
+
+    def __enter__(self) -> "CameraService":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def capture_still(
+        self,
+        raw_dir: Path,
+        prefix: str = "capture",
+        return_array: bool = False,
+    ) -> Dict[str, Any]:
+        self.start()
+
+        raw_dir = Path(raw_dir)
+        raw_dir.mkdir(parents=True, exist_ok=True)
+
+        ts = iso_timestamp().replace(":", "-")
+        raw_path = raw_dir / f"{prefix}_{ts}.jpg"
+
+        with self.lock:
+            self.backend.capture_file(str(raw_path))
+
+            img = None
+            width = None
+            height = None
+            if return_array:
+                img = self.backend.capture_array()
+                if img is not None and hasattr(img, "shape") and len(img.shape) >= 2:
+                    height = int(img.shape[0])
+                    width = int(img.shape[1])
+
+        return {
+            "timestamp": ts,
+            "raw_path": str(raw_path),
+            "width": width,
+            "height": height,
+            "array": img,
+        }
+
+    def capture_burst(
+        self,
+        raw_dir: Path,
+        prefix: str = "burst",
+        burst_count: int = 6,
+        interval_s: float = 0.15,
+    ) -> List[Dict[str, Any]]:
+        self.start()
+
+        raw_dir = Path(raw_dir)
+        raw_dir.mkdir(parents=True, exist_ok=True)
+
+        results: List[Dict[str, Any]] = []
+        base_ts = iso_timestamp().replace(":", "-")
+        with self.lock:
+            for i in range(burst_count):
+                # No sleep after the last frame: the caller can start analysis right away
+                if i > 0:
+                    time.sleep(interval_s)
+                ts = iso_timestamp().replace(":", "-")
+                raw_path = raw_dir / f"{prefix}_{base_ts}_{i:02d}_{ts}.jpg"
+                self.backend.capture_file(str(raw_path))
+                results.append({"timestamp": ts, "raw_path": str(raw_path)})
+
+        return results
+
+    def capture_burst_frames(
+        self,
+        prefix: str = "burst",
+        burst_count: int = 6,
+        interval_s: float = 0.15,
+    ) -> List[Frame]:
+        """
+        Same cadence as capture_burst, but frames stay in memory as JPEG bytes.
+        Call Frame.save() on the ones worth keeping.
+        """
+        self.start()
+
+        frames: List[Frame] = []
+        base_ts = iso_timestamp().replace(":", "-")
+        with self.lock:
+            for i in range(burst_count):
+                if i > 0:
+                    time.sleep(interval_s)
+                ts = iso_timestamp().replace(":", "-")
+                buf = io.BytesIO()
+                self.backend.capture_file(buf, format="jpeg")
+                frames.append(Frame(name=f"{prefix}_{base_ts}_{i:02d}_{ts}", timestamp=ts, jpeg=buf.getvalue()))
+
+        return frames
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+def _exif_orientation(app1: bytes) -> int:
+    """
+    EXIF Orientation tag (1..8) from an APP1 payload, 1 if absent.
+    """
+    if not app1.startswith(b"Exif\x00\x00") or len(app1) < 14:
+        return 1
+    tiff = app1[6:]
+    order = "big" if tiff[:2] == b"MM" else "little"
+    ifd = int.from_bytes(tiff[4:8], order)
+    if ifd + 2 > len(tiff):
+        return 1
+    for k in range(int.from_bytes(tiff[ifd:ifd + 2], order)):
+        e = ifd + 2 + 12 * k
+        if e + 12 > len(tiff):
+            break
+        if int.from_bytes(tiff[e:e + 2], order) == 0x0112:
+            return int.from_bytes(tiff[e + 8:e + 10], order)
+    return 1
+
+
+def jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Reads (width, height) from the JPEG SOF header without decoding pixels.
+    The size is the one cv2.imdecode returns, i.e. after the EXIF orientation
+    is applied (width and height swapped for 90 / 270 degree rotations).
+    """
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+    i = 2
+    n = len(data)
+    orientation = 1
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        # SOF0..SOF15, except DHT (C4), JPG (C8), DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            h = (data[i + 5] << 8) | data[i + 6]
+            w = (data[i + 7] << 8) | data[i + 8]
+            return (h, w) if orientation >= 5 else (w, h)
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        seg_len = (data[i + 2] << 8) | data[i + 3]
+        if marker == 0xE1 and data[i + 4:i + 10] == b"Exif\x00\x00":
+            orientation = _exif_orientation(data[i + 4:i + 2 + seg_len])
+        i += 2 + seg_len
+    return None
+
+
+@dataclass
+class Frame:
+    """
+    One burst frame held in memory: the encoded JPEG plus a BGR array that is
+    only decoded when a stage asks for it. raw_path stays empty until save().
+    """
+    name: str
+    timestamp: str
+    jpeg: bytes
+    raw_path: str = ""
+    _array: Optional[np.ndarray] = field(default=None, repr=False)
+    _size: Optional[Tuple[int, int]] = field(default=None, repr=False)
+
+    @property
+    def array(self) -> np.ndarray:
+        if self._array is None:
+            import cv2
+
+            img = cv2.imdecode(np.frombuffer(self.jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if img is None:
+                raise ValueError(f"Could not decode frame {self.name}")
+            self._array = img
+            self._size = (int(img.shape[1]), int(img.shape[0]))
+        return self._array
+
+    @property
+    def size_wh(self) -> Tuple[int, int]:
+        if self._size is None:
+            self._size = jpeg_size(self.jpeg)
+            if self._size is None:
+                img = self.array
+                self._size = (int(img.shape[1]), int(img.shape[0]))
+        return self._size
+
+    @property
+    def width(self) -> int:
+        return self.size_wh[0]
+
+    @property
+    def height(self) -> int:
+        return self.size_wh[1]
+
+    def save(self, raw_dir: Path, writer=None) -> str:
+        """
+        Writes the original JPEG bytes (no re-encode) and remembers the path.
+        With a BackgroundWriter the write is queued and the path returned at once.
+        """
+        if self.raw_path:
+            return self.raw_path
+        raw_dir = Path(raw_dir)
+        path = raw_dir / f"{self.name}.jpg"
+        if writer is not None:
+            writer.submit(path, self.jpeg)
+        else:
+            raw_dir.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(self.jpeg)
+        self.raw_path = str(path)
+        return self.raw_path
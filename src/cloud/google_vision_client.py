@@ -1,8 +1,6 @@
 # export GOOGLE_APPLICATION_CREDENTIALS="/Users/aryansharma/MySecondProject/SentientAI/Secret/sentientai-481122-3d9a6f8d91a9.json"
 
 from __future__ import annotations
-from src.utils.env_loader import load_api_keys
-load_api_keys()
 from dataclasses import dataclass
 
 from pathlib import Path
@@ -10,20 +8,43 @@ from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _vision():
+    # google-cloud-vision (grpc + protobuf) is slow to import; load it on first use
+    from google.cloud import vision
+    return vision
+
+# Vision accepts at most 16 images in one synchronous batch_annotate_images call
+MAX_IMAGES_PER_BATCH = 16
 
-from dotenv import load_dotenv
-from google.oauth2 import service_account
-from google.cloud import vision
 
 @dataclass
 class VisionConfig:
     credentials_path: Optional[str] = None
     timeout_seconds: int = 15
-class GoogleVisionClient:
-    def __init__(self,  config: Optional[VisionConfig] = None):
-        load_dotenv()
+    max_labels: int = 10
+    # batches issued at the same time when a burst is larger than one batch
+    max_concurrent_batches: int = 2
+    # Frames are resized to this long edge and re-encoded before upload (0 = send as is).
+    # Returned face/object geometry is mapped back to the original resolution.
+    upload_long_edge: int = 640
+    upload_jpeg_quality: int = 85
 
+
+class GoogleVisionClient:
+    def __init__(self,  config: Optional[VisionConfig] = None, client: Any = None):
         self.config = config or VisionConfig()
+        if client is not None:
+            # Injected ImageAnnotatorClient (or a local stub with the same methods)
+            self.client = client
+            return
+
+        from dotenv import load_dotenv
+        from google.oauth2 import service_account
+
+        load_dotenv()
         creds = self.config.credentials_path or os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 
         if not creds:
@@ -33,47 +54,38 @@ class GoogleVisionClient:
 
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = creds
         creds = service_account.Credentials.from_service_account_file(creds)
-        self.client = vision.ImageAnnotatorClient(credentials=creds)
+        self.client = _vision().ImageAnnotatorClient(credentials=creds)
 
     def detect_faces(self, image_bytes: bytes):
-        image = vision.Image(content=image_bytes)
+        image = _vision().Image(content=image_bytes)
         resp = self.client.face_detection(image=image)
         if resp.error.message:
             raise RuntimeError(f"Vision face_detection error: {resp.error.message}")
         return resp.face_annotations
 
     def detect_labels(self, image_bytes: bytes, max_results: int = 10):
-        image = vision.Image(content=image_bytes)
+        image = _vision().Image(content=image_bytes)
         resp = self.client.label_detection(image=image, max_results=max_results)
 
         if resp.error.message:
             raise RuntimeError(f"Vision label_detection error: {resp.error.message}")
 
-        labels = []
-        for label in resp.label_annotations:
-            labels.append({
-                "label": label.description,
-                "confidence": float(label.score),
-            })
-        return labels
-    def detect_objects(self, image_bytes: bytes):
-        image = vision.Image(content=image_bytes)
+        return _labels_from(resp)
+    def detect_objects(self, image_bytes: bytes, image_wh: Optional[Tuple[int, int]] = None):
+        image = _vision().Image(content=image_bytes)
         resp = self.client.object_localization(image=image)
         if resp.error.message:
             raise RuntimeError(f"Vision object_localization error: {resp.error.message}")
-        objects = []
-        for obj in resp.label_annotations:
-            objects.append({
-                "label": obj.description,
-                "confidence": float(obj.score),
-            })
-        return objects
+        return _objects_from(resp, image_wh)
     def analyze_image_path(self, image_path: str | Path) -> Dict[str, Any]:
-        image_bytes = _read_image_bytes(image_path)
+        return self.analyze_image_bytes(_read_image_bytes(image_path))
 
-        faces = self.detect_faces(image_bytes)
-        labels = self.detect_labels(image_bytes, max_results=10)
-        objects = self.detect_objects(image_bytes)
+    def analyze_image_bytes(self, image_bytes: bytes) -> Dict[str, Any]:
+        upload = self._prepare_upload(image_bytes)
+        faces = self.detect_faces(upload.content)
+        labels = self.detect_labels(upload.content, max_results=self.config.max_labels)
+        objects = self.detect_objects(upload.content, image_wh=upload.full_wh)
+        upload.rescale_faces(faces)
 
         return {
             "faces": faces,
@@ -81,6 +93,157 @@ class GoogleVisionClient:
             "objects": objects,
         }
 
+    def analyze_burst(self, images: List[bytes]) -> List[Dict[str, Any]]:
+        """
+        Faces, labels and objects for every image in one batch_annotate_images
+        call per 16 images (bursts larger than that run a few batches concurrently).
+        Returns one dict per image, same shape as analyze_image_bytes.
+        """
+        if not images:
+            return []
+
+        chunks = [images[i:i + MAX_IMAGES_PER_BATCH] for i in range(0, len(images), MAX_IMAGES_PER_BATCH)]
+        if len(chunks) == 1:
+            return self._annotate_batch(chunks[0])
+
+        workers = max(1, min(self.config.max_concurrent_batches, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(self._annotate_batch, chunks))
+        return [r for part in parts for r in part]
+
+    def _annotate_batch(self, images: List[bytes]) -> List[Dict[str, Any]]:
+        vision = _vision()
+        features = [
+            vision.Feature(type_=vision.Feature.Type.FACE_DETECTION),
+            vision.Feature(type_=vision.Feature.Type.LABEL_DETECTION, max_results=self.config.max_labels),
+            vision.Feature(type_=vision.Feature.Type.OBJECT_LOCALIZATION),
+        ]
+        uploads = [self._prepare_upload(b) for b in images]
+        requests = [
+            vision.AnnotateImageRequest(image=vision.Image(content=u.content), features=features)
+            for u in uploads
+        ]
+        batch = self.client.batch_annotate_images(requests=requests, timeout=self.config.timeout_seconds)
+
+        results: List[Dict[str, Any]] = []
+        for resp, upload in zip(batch.responses, uploads):
+            if resp.error.message:
+                raise RuntimeError(f"Vision batch_annotate_images error: {resp.error.message}")
+            results.append({
+                "faces": upload.rescale_faces(resp.face_annotations),
+                "labels": _labels_from(resp),
+                "objects": _objects_from(resp, upload.full_wh),
+            })
+        if len(batch.responses) != len(images):
+            raise RuntimeError(f"Vision returned {len(batch.responses)} responses for {len(images)} images")
+        return results
+
+    def _prepare_upload(self, image_bytes: bytes) -> "_Upload":
+        return _downscale_for_upload(
+            image_bytes,
+            long_edge=self.config.upload_long_edge,
+            jpeg_quality=self.config.upload_jpeg_quality,
+        )
+
+
+@dataclass
+class _Upload:
+    """
+    What is actually sent for one image, and how to map results back:
+    original pixel = uploaded pixel * (sx, sy).
+    """
+    content: bytes
+    full_wh: Optional[Tuple[int, int]]
+    sx: float = 1.0
+    sy: float = 1.0
+
+    def rescale_faces(self, face_annotations):
+        # In place on the response objects, so normalize_google_faces /
+        # vertices_to_xyxy see full-resolution pixel coordinates
+        if self.sx == 1.0 and self.sy == 1.0:
+            return face_annotations
+        for face in face_annotations:
+            for poly in ("bounding_poly", "fd_bounding_poly"):
+                p = getattr(face, poly, None)
+                for v in getattr(p, "vertices", ()):
+                    v.x = int(round(v.x * self.sx))
+                    v.y = int(round(v.y * self.sy))
+            for lm in getattr(face, "landmarks", ()):
+                lm.position.x = lm.position.x * self.sx
+                lm.position.y = lm.position.y * self.sy
+        return face_annotations
+
+
+def _downscale_for_upload(image_bytes: bytes, long_edge: int, jpeg_quality: int) -> _Upload:
+    from src.camera.frame import jpeg_size
+
+    full_wh = jpeg_size(image_bytes)
+    if not long_edge or (full_wh is not None and max(full_wh) <= long_edge):
+        return _Upload(image_bytes, full_wh)
+
+    import cv2
+    import numpy as np
+
+    buf = np.frombuffer(image_bytes, dtype=np.uint8)
+    # Let libjpeg do most of the shrinking while decoding (DCT scaling)
+    flag = cv2.IMREAD_COLOR
+    if full_wh is not None:
+        ratio = max(full_wh) / float(long_edge)
+        if ratio >= 4:
+            flag = cv2.IMREAD_REDUCED_COLOR_4
+        elif ratio >= 2:
+            flag = cv2.IMREAD_REDUCED_COLOR_2
+    img = cv2.imdecode(buf, flag)
+    if img is None:
+        # Not something we can decode: let Vision have the original
+        return _Upload(image_bytes, full_wh)
+    if full_wh is None:
+        full_wh = (int(img.shape[1]), int(img.shape[0]))
+    elif (img.shape[1] > img.shape[0]) != (full_wh[0] > full_wh[1]) and img.shape[0] != img.shape[1]:
+        # imdecode rotated it by an EXIF orientation jpeg_size could not read
+        full_wh = (full_wh[1], full_wh[0])
+
+    w, h = full_wh
+    scale = long_edge / float(max(w, h))
+    if scale >= 1.0:
+        return _Upload(image_bytes, full_wh)
+    new_wh = (max(1, round(w * scale)), max(1, round(h * scale)))
+    if (img.shape[1], img.shape[0]) != new_wh:
+        img = cv2.resize(img, new_wh, interpolation=cv2.INTER_AREA)
+    ok, enc = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)])
+    if not ok:
+        return _Upload(image_bytes, full_wh)
+    return _Upload(enc.tobytes(), full_wh, sx=w / new_wh[0], sy=h / new_wh[1])
+
+
+def _labels_from(resp) -> List[Dict[str, Any]]:
+    labels = []
+    for label in resp.label_annotations:
+        labels.append({
+            "label": label.description,
+            "confidence": float(label.score),
+        })
+    return labels
+
+
+def _objects_from(resp, image_wh: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+    # object_localization fills localized_object_annotations (name/score), not label_annotations
+    objects = []
+    for obj in resp.localized_object_annotations:
+        o = {
+            "label": obj.name,
+            "confidence": float(obj.score),
+        }
+        # Object boxes come back normalized (0..1), so they are resolution independent
+        if image_wh is not None:
+            verts = getattr(getattr(obj, "bounding_poly", None), "normalized_vertices", None) or []
+            xs = [float(getattr(v, "x", 0.0)) * image_wh[0] for v in verts]
+            ys = [float(getattr(v, "y", 0.0)) * image_wh[1] for v in verts]
+            if xs and ys:
+                o["bbox_xyxy"] = [int(min(xs)), int(min(ys)), int(round(max(xs))), int(round(max(ys)))]
+        objects.append(o)
+    return objects
+
 
 
 def _read_image_bytes(path: str | Path) -> bytes:
@@ -89,9 +252,10 @@ def _read_image_bytes(path: str | Path) -> bytes:
         raise FileNotFoundError(f"File not found: {p}")
     return p.read_bytes()
 
-client2 = GoogleVisionClient()
-result = client2.analyze_image_path("/Users/aryansharma/MySecondProject/SentientAI/src/cloud/picture1.jpeg")
-print(result["labels"][:5])
-print(result["objects"][:5])
-print(len(result["faces"]))
+if __name__ == "__main__":
+    client2 = GoogleVisionClient()
+    result = client2.analyze_image_path("/Users/aryansharma/MySecondProject/SentientAI/src/cloud/picture1.jpeg")
+    print(result["labels"][:5])
+    print(result["objects"][:5])
+    print(len(result["faces"]))
 
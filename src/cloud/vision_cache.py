@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# dHash: 8x8 = 64 bits. Frames of someone standing still at the door differ by a
+# few bits (sensor noise, small movements); a different scene differs by ~20+.
+HASH_SIZE = 8
+DEFAULT_MAX_DISTANCE = 6
+# Frames of one burst only share a Vision result when practically identical: the
+# copy keeps the other frame's boxes, and a face shifted by ~0.6% of the frame
+# width already moves the hash by 2 bits
+BURST_MAX_DISTANCE = 2
+DEFAULT_TTL_S = 30.0
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+
+def dhash(image: Any, hash_size: int = HASH_SIZE) -> int:
+    """
+    Difference hash of a frame: JPEG bytes or a decoded (gray or BGR) array.
+    Downsample to (hash_size + 1) x hash_size gray and keep one bit per
+    "left pixel brighter than its right neighbour".
+    """
+    import cv2
+
+    if isinstance(image, (bytes, bytearray)):
+        # libjpeg can decode straight to 1/8 scale, which is all a hash needs
+        gray = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+        if gray is None:
+            raise ValueError("Could not decode image for hashing")
+    elif image.ndim == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+@dataclass
+class _Entry:
+    phash: int
+    expires_at: float
+    faces: List[Dict[str, Any]]
+    objects: List[Dict[str, Any]]
+    nbytes: int
+
+
+def _approx_bytes(faces: List[Dict[str, Any]], objects: List[Dict[str, Any]]) -> int:
+    # Serialized size is a fair, cheap proxy for what the dicts hold
+    return len(json.dumps([faces, objects], default=str)) + 128
+
+
+class VisionCache:
+    """
+    Normalized Vision results (faces + objects) keyed by the dHash of the frame
+    they came from. A lookup hits when a live entry is within `max_distance`
+    bits. Entries expire after `ttl_s`; past `max_bytes` the least recently
+    used ones are evicted. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        ttl_s: float = DEFAULT_TTL_S,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.max_distance = max_distance
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._next_id = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.counts = {
+            "lookups": 0, "hits": 0, "misses": 0, "deduped": 0, "stored": 0, "expired": 0, "evicted": 0,
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, phash: int, now: Optional[float] = None) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        Returns copies of (faces, objects) from the closest live entry, or None.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.counts["lookups"] += 1
+            self._expire(now)
+            best_id, best_d = None, self.max_distance + 1
+            for entry_id, e in self._entries.items():
+                d = hamming(e.phash, phash)
+                if d < best_d:
+                    best_id, best_d = entry_id, d
+                    if d == 0:
+                        break
+            if best_id is None:
+                self.counts["misses"] += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.counts["hits"] += 1
+            e = self._entries[best_id]
+            # Copies: callers annotate / mutate what they get back
+            return copy.deepcopy(e.faces), copy.deepcopy(e.objects)
+
+    def put(
+        self,
+        phash: int,
+        faces: List[Dict[str, Any]],
+        objects: List[Dict[str, Any]],
+        now: Optional[float] = None,
+    ) -> None:
+        now = time.monotonic() if now is None else now
+        entry = _Entry(phash, now + self.ttl_s, copy.deepcopy(faces), copy.deepcopy(objects), _approx_bytes(faces, objects))
+        if entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+            self._bytes += entry.nbytes
+            self.counts["stored"] += 1
+            while self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= old.nbytes
+                self.counts["evicted"] += 1
+
+    def note_deduped(self, n: int) -> None:
+        """
+        Misses answered from another frame of the same request (see group_near_duplicates).
+        """
+        with self._lock:
+            self.counts["deduped"] += n
+
+    def _expire(self, now: float) -> None:
+        # Caller holds the lock. Entries are only ever refreshed by reads, so scan them all.
+        dead = [k for k, e in self._entries.items() if e.expires_at <= now]
+        for k in dead:
+            self._bytes -= self._entries.pop(k).nbytes
+        self.counts["expired"] += len(dead)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = dict(self.counts)
+            out["entries"] = len(self._entries)
+            out["bytes"] = self._bytes
+        out["hit_rate"] = out["hits"] / out["lookups"] if out["lookups"] else 0.0
+        # every hit / deduped frame is one image that was not sent to Vision
+        out["saved_calls"] = out["hits"] + out["deduped"]
+        return out
+
+    def format_stats(self) -> str:
+        s = self.stats()
+        return f"hits {s['hits']}/{s['lookups']} ({s['hit_rate']:.0%}) saved {s['saved_calls']} entries {s['entries']} {s['bytes'] // 1024} KiB"
+
+
+def group_near_duplicates(hashes: List[int], max_distance: int = BURST_MAX_DISTANCE) -> List[int]:
+    """
+    For each hash, the index of the first earlier hash within max_distance
+    (or its own index). Only the representatives need to be sent.
+    """
+    reps: List[int] = []
+    out: List[int] = []
+    for i, h in enumerate(hashes):
+        for r in reps:
+            if hamming(hashes[r], h) <= max_distance:
+                out.append(r)
+                break
+        else:
+            reps.append(i)
+            out.append(i)
+    return out
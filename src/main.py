@@ -1,21 +1,31 @@
 # main.py
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-import cv2
-
-from src.camera.capture_still import capture_burst
+from src.camera.capture_still import capture_burst_frames
+from src.camera.frame import Frame
+from src.camera.camera_service import CameraService
 from src.sensors.pir_sensor import PIRSensor
 from src.sensors.led_control import LEDControl
 
 from src.cloud.google_vision_client import GoogleVisionClient
+from src.cloud.vision_cache import BURST_MAX_DISTANCE, VisionCache, dhash, group_near_duplicates
 from src.ai.postprocess import normalize_google_faces, build_event_record, score_frame
-from src.ai.offline_face_recognition import recognize_faces_offline
+from src.ai.frame_quality import select_top_k
+from src.ai.motion_confirm import MotionConfirmer
+from src.ai.offline_face_recognition import DETECTION_MODES, DetectionConfig
+from src.ai import offline_pool
 
-from src.notifications.telegram_notifier import send_event_alert, flush_outbox
+from src.notifications.notifier_worker import NotifierWorker
+from src.pipeline import BLOCK, DROP_NEWEST, DROP_OLDEST, Pipeline, Stage
+from src.storage.event_store import EventStore
+from src.storage.image_store import EXTRA_SUFFIX, ImageStore
+from src.utils.file_writer import BackgroundWriter, write_bytes_atomic
+from src.utils.metrics import EventTimer, StageMetrics
 
 
 # -----------------------------
@@ -23,12 +33,50 @@ from src.notifications.telegram_notifier import send_event_alert, flush_outbox
 # -----------------------------
 RAW_DIR = Path("data/images/raw")
 PROCESSED_DIR = Path("data/images/processed")
-RAW_DIR.mkdir(parents=True, exist_ok=True)
-PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
 BURST_COUNT = 6
 BURST_INTERVAL_S = 0.15
 MOTION_COOLDOWN_S = 2.0
+# Offline face detection preset: "accurate" (CNN), "hog", "fast", "fastest"
+# (approximate latency / recall in DETECTION_MODES, src/ai/offline_face_recognition.py).
+# In that one-off run "hog" kept every face the CNN found at a fraction of its cost and memory.
+OFFLINE_DETECTION_MODE = "hog"
+# Only search this normalized (x1, y1, x2, y2) region of the frame, e.g. the doorway;
+# None = the whole frame
+OFFLINE_DETECTION_ROI: Optional[Tuple[float, float, float, float]] = None
+
+# Check the burst for real movement before Vision / Telegram (PIR false triggers).
+# Regions are normalized (x1, y1, x2, y2); e.g. exclude the street behind the gate.
+MOTION_CONFIRM = True
+MOTION_INCLUDE_REGIONS: List[Tuple[float, float, float, float]] = []
+MOTION_EXCLUDE_REGIONS: List[Tuple[float, float, float, float]] = []
+
+# Offline fallback: frames of the burst analysed in parallel (faces tracked across them),
+# on a process pool that keeps the dlib models loaded. None = one worker per core.
+OFFLINE_TOP_K = 4
+OFFLINE_WORKERS: Optional[int] = None
+# Start the pool at launch (before any other thread) so the first outage finds it warm
+OFFLINE_POOL_WARM = True
+
+# Only the sharpest / best exposed frames of a burst go to Google Vision
+CLOUD_TOP_K = 3
+
+# Pipeline queue sizes and how often per-stage depth is printed
+CAPTURE_QUEUE_SIZE = 1
+ANALYZE_QUEUE_SIZE = 2
+RENDER_QUEUE_SIZE = 2
+NOTIFY_QUEUE_SIZE = 4
+STATS_EVERY_S = 60.0
+
+# Image retention: data/images/{raw,processed}/<YYYY-MM-DD>/
+STORAGE_MAX_BYTES = 2 * 1024 ** 3
+STORAGE_MAX_AGE_DAYS = 30
+# Also keep the frames that were not chosen (dropped first when over budget)
+KEEP_NON_BEST_FRAMES = False
+
+# Annotated image sent to Telegram (which recompresses anything larger anyway)
+PROCESSED_LONG_EDGE = 1280
+PROCESSED_JPEG_QUALITY = 80
 
 # If you want, keep this to filter objects later
 PERSON_CONFIDENCE_MIN = 0.50
@@ -53,6 +101,8 @@ def _get_bbox_xyxy(face_or_obj: Dict[str, Any]) -> Optional[List[int]]:
 
 
 def _draw_box(img_bgr, bbox_xyxy: List[int], label: str) -> None:
+    import cv2
+
     x1, y1, x2, y2 = bbox_xyxy
     cv2.rectangle(img_bgr, (x1, y1), (x2, y2), (0, 255, 0), 2)
     if label:
@@ -70,24 +120,42 @@ def _draw_box(img_bgr, bbox_xyxy: List[int], label: str) -> None:
         )
 
 
-def save_processed_image(
+def _scale_bbox(bb: List[int], scale: float) -> List[int]:
+    return [int(round(v * scale)) for v in bb]
+
+
+def render_processed_image(
     raw_path: str,
-    processed_dir: Path,
     faces: List[Dict[str, Any]],
     objects: List[Dict[str, Any]],
+    frame: Optional[Frame] = None,
+    long_edge: int = PROCESSED_LONG_EDGE,
+    jpeg_quality: int = PROCESSED_JPEG_QUALITY,
 ) -> Dict[str, Any]:
     """
-    Reads raw image, draws face boxes + labels, saves it into data/images/processed,
-    returns processed_path + width/height.
+    Draws face boxes + labels on the already decoded frame (or reads raw_path
+    if no in-memory frame is given), downscaled to `long_edge`, and encodes it
+    in memory. Boxes are given in full-resolution coordinates.
+    Returns jpeg bytes + source width/height + rendered size.
     """
-    processed_dir.mkdir(parents=True, exist_ok=True)
+    import cv2
 
-    img_bgr = cv2.imread(raw_path)
-    if img_bgr is None:
+    if frame is not None:
+        src = frame.array
+    else:
+        src = cv2.imread(raw_path)
+    if src is None:
         # If read fails, just return empty processed
-        return {"processed_path": "", "width": 0, "height": 0}
+        return {"jpeg": b"", "width": 0, "height": 0, "render_wh": (0, 0)}
 
-    h, w = img_bgr.shape[0], img_bgr.shape[1]
+    h, w = src.shape[0], src.shape[1]
+    scale = min(1.0, long_edge / float(max(w, h))) if long_edge else 1.0
+    if scale < 1.0:
+        # resize allocates a new image, so the shared frame is never drawn on
+        img_bgr = cv2.resize(src, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+    else:
+        # copy: the decoded frame is shared with other stages
+        img_bgr = src.copy()
 
     # Draw faces (your normalized faces from postprocess.normalize_google_faces)
     for f in faces:
@@ -114,26 +182,52 @@ def save_processed_image(
             label_parts.append(emo_text)
         label = " | ".join(label_parts)
 
-        _draw_box(img_bgr, bb, label)
+        _draw_box(img_bgr, _scale_bbox(bb, scale), label)
 
-    # Objects:
-    # Right now your Google Vision objects list likely contains label/confidence only.
-    # If later you add bbox for objects, this will automatically draw them too.
+    # Objects only get drawn when they carry a bbox
     for o in objects:
         bb = _get_bbox_xyxy(o)
         if not bb:
             continue
         label = _safe_text(o.get("label")) or _safe_text(o.get("name"))
         conf = o.get("confidence", 0.0)
-        _draw_box(img_bgr, bb, f"{label} {conf:.2f}")
+        _draw_box(img_bgr, _scale_bbox(bb, scale), f"{label} {conf:.2f}")
+
+    ok, buf = cv2.imencode(".jpg", img_bgr, [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)])
+    jpeg = buf.tobytes() if ok else b""
+    return {
+        "jpeg": jpeg,
+        "width": int(w),
+        "height": int(h),
+        "render_wh": (int(img_bgr.shape[1]), int(img_bgr.shape[0])),
+    }
+
+
+def save_processed_image(
+    raw_path: str,
+    processed_dir: Path,
+    faces: List[Dict[str, Any]],
+    objects: List[Dict[str, Any]],
+    frame: Optional[Frame] = None,
+    writer: Optional[BackgroundWriter | ImageStore] = None,
+) -> Dict[str, Any]:
+    """
+    render_processed_image + a copy in data/images/processed (written by
+    `writer` in the background if one is given).
+    Returns processed_path + width/height + the jpeg bytes.
+    """
+    info = render_processed_image(raw_path, faces, objects, frame=frame)
+    if not info["jpeg"]:
+        return {**info, "processed_path": ""}
 
-    # Write processed image
-    raw_name = Path(raw_path).name
-    stem = Path(raw_name).stem
-    processed_path = processed_dir / f"{stem}_processed.jpg"
-    cv2.imwrite(str(processed_path), img_bgr)
+    stem = frame.name if frame is not None else Path(raw_path).stem
+    processed_path = Path(processed_dir) / f"{stem}_processed.jpg"
+    if writer is not None:
+        writer.submit(processed_path, info["jpeg"])
+    else:
+        write_bytes_atomic(processed_path, info["jpeg"])
 
-    return {"processed_path": str(processed_path), "width": int(w), "height": int(h)}
+    return {**info, "processed_path": str(processed_path)}
 
 
 # -----------------------------
@@ -148,8 +242,12 @@ def choose_best_by_face_score(candidates: List[Dict[str, Any]]) -> Dict[str, Any
         w = int(c.get("width") or 0)
         h = int(c.get("height") or 0)
 
-        # If width/height missing, try reading image quickly
-        if (w == 0 or h == 0) and c.get("raw_path"):
+        # If width/height missing, take them from the frame header or the file
+        if (w == 0 or h == 0) and c.get("frame") is not None:
+            w, h = c["frame"].size_wh
+        elif (w == 0 or h == 0) and c.get("raw_path"):
+            import cv2
+
             img = cv2.imread(c["raw_path"])
             if img is not None:
                 h = int(img.shape[0])
@@ -167,25 +265,54 @@ def choose_best_by_face_score(candidates: List[Dict[str, Any]]) -> Dict[str, Any
 # -----------------------------
 # Google Vision on burst
 # -----------------------------
-def run_google_on_burst(gv_client: GoogleVisionClient, burst: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def _without_geometry(
+    faces: List[Dict[str, Any]], objects: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # What a near-duplicate frame may borrow from its group's representative: the
+    # labels (still true for the scene), not the boxes (the visitor may have moved).
+    # Faces are boxes first, so they stay with the frame Vision actually saw.
+    return [], [{k: v for k, v in o.items() if k != "bbox_xyxy"} for o in objects]
+
+
+def run_google_on_burst(
+    gv_client: GoogleVisionClient,
+    burst: List[Frame],
+    cache: Optional[VisionCache] = None,
+) -> List[Dict[str, Any]]:
     results: List[Dict[str, Any]] = []
 
-    for shot in burst:
-        raw_path = shot["raw_path"]
-
-        gv = gv_client.analyze_image_path(raw_path)
-
-        face_annotations = gv.get("face_annotations", [])
-        objects = gv.get("objects", [])
-
-        faces = normalize_google_faces(face_annotations)
-
-        width = gv.get("width")
-        height = gv.get("height")
+    faces_objects: List[Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]] = [None] * len(burst)
+    to_send = list(range(len(burst)))
+    if cache is not None:
+        # Someone lingering at the door re-triggers the PIR with near-identical
+        # frames: answer those from the perceptual-hash cache, and send only one
+        # frame per group of (practically identical) duplicates within the burst
+        hashes = [dhash(frame.jpeg) for frame in burst]
+        faces_objects = [cache.get(h) for h in hashes]
+        misses = [i for i, fo in enumerate(faces_objects) if fo is None]
+        groups = group_near_duplicates([hashes[i] for i in misses], BURST_MAX_DISTANCE)
+        to_send = [misses[g] for j, g in enumerate(groups) if g == j]
+        cache.note_deduped(len(misses) - len(to_send))
+
+    if to_send:
+        # One batched request for the whole burst instead of 3 calls per frame
+        annotated = gv_client.analyze_burst([burst[i].jpeg for i in to_send])
+        for i, gv in zip(to_send, annotated):
+            faces_objects[i] = (normalize_google_faces(gv.get("faces", [])), gv.get("objects", []))
+            if cache is not None:
+                cache.put(hashes[i], *faces_objects[i])
+        if cache is not None:
+            for j, g in enumerate(groups):
+                if faces_objects[misses[j]] is None:
+                    faces_objects[misses[j]] = _without_geometry(*faces_objects[misses[g]])
+
+    for frame, (faces, objects) in zip(burst, faces_objects):
+        width, height = frame.size_wh
 
         results.append(
             {
-                "raw_path": raw_path,
+                "frame": frame,
+                "raw_path": frame.raw_path,
                 "faces": faces,
                 "objects": objects,
                 "width": width,
@@ -200,132 +327,297 @@ def run_google_on_burst(gv_client: GoogleVisionClient, burst: List[Dict[str, Any
 # -----------------------------
 # Offline fallback (only when Google fails)
 # -----------------------------
-def offline_fallback_for_burst(burst: List[Dict[str, Any]]) -> Dict[str, Any]:
-    # Use the middle frame of burst
-    mid = burst[len(burst) // 2]
-    raw_path = mid["raw_path"]
-
-    img_bgr = cv2.imread(raw_path)
-    if img_bgr is None:
-        return {
-            "raw_path": raw_path,
-            "faces": [],
-            "objects": [],
-            "width": 0,
-            "height": 0,
-            "google_ok": False,
-            "wifi_failed": True,
-        }
-
-    image_rgb = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
-    matches = recognize_faces_offline(image_rgb)
-
-    faces: List[Dict[str, Any]] = []
-    for m in matches:
-        faces.append(
+def _offline_detection(mode: str, size_wh: Tuple[int, int]) -> Union[str, DetectionConfig]:
+    # The preset, narrowed to OFFLINE_DETECTION_ROI in this frame size's pixels
+    if OFFLINE_DETECTION_ROI is None:
+        return mode
+    w, h = size_wh
+    x1, y1, x2, y2 = OFFLINE_DETECTION_ROI
+    roi = [int(x1 * w), int(y1 * h), int(round(x2 * w)), int(round(y2 * h))]
+    return replace(DETECTION_MODES[mode], roi_xyxy=roi)
+
+
+def offline_fallback_for_burst(burst: List[Frame], detection: str = OFFLINE_DETECTION_MODE) -> Dict[str, Any]:
+    from src.ai.face_tracker import summarize_tracks
+    from src.ai.offline_pool import recognize_burst
+
+    # The best-exposed / sharpest frames of the burst, one per worker, sent as JPEG bytes.
+    # Faces are tracked across them; each person is encoded and matched once.
+    frames = select_top_k(burst, OFFLINE_TOP_K)
+    tracked = recognize_burst(
+        [f.jpeg for f in frames],
+        detection=_offline_detection(detection, frames[0].size_wh) if frames else detection,
+        workers=OFFLINE_WORKERS,
+    )
+
+    candidates: List[Dict[str, Any]] = []
+    for frame, matches in zip(frames, tracked.per_frame):
+        faces: List[Dict[str, Any]] = []
+        for m in matches:
+            faces.append(
+                {
+                    "source": "offline_face_recognition",
+                    "bbox_xyxy": m.bbox_xyxy,
+                    "confidence": float(m.confidence),
+                    "name": m.name,
+                    "emotion": {},  # offline face_recognition does NOT provide emotion
+                    "quality": {},
+                }
+            )
+        w, h = frame.size_wh
+        candidates.append(
             {
-                "source": "offline_face_recognition",
-                "bbox_xyxy": m.bbox_xyxy,
-                "confidence": float(m.confidence),
-                "name": m.name,
-                "emotion": {},  # offline face_recognition does NOT provide emotion
-                "quality": {},
+                "frame": frame,
+                "raw_path": frame.raw_path,
+                "faces": faces,
+                "objects": [],
+                "width": w,
+                "height": h,
+                "google_ok": False,
+                "wifi_failed": True,
             }
         )
+    for t in tracked.tracks:
+        for fi, (bi, _) in t.boxes.items():
+            candidates[fi]["faces"][bi]["track_id"] = t.track_id
 
-    h, w = image_rgb.shape[0], image_rgb.shape[1]
-
-    return {
-        "raw_path": raw_path,
-        "faces": faces,
-        "objects": [],
-        "width": int(w),
-        "height": int(h),
-        "google_ok": False,
-        "wifi_failed": True,
-    }
+    best = choose_best_by_face_score(candidates)
+    best["tracks"] = summarize_tracks(tracked.tracks, [f.name for f in frames])
+    for summary, m in zip(best["tracks"], tracked.track_matches):
+        summary["name"] = m.name
+        summary["confidence"] = float(m.confidence)
+    return best
 
 
-# -----------------------------
-# Main loop
-# -----------------------------
-def run() -> None:
-    pir = PIRSensor(pin=17, warmup_seconds=2.0)
-    led = LEDControl(pin=27)
-    gv_client = GoogleVisionClient()
+def attach_google_tracks(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Groups the Vision faces of the analysed frames into per-person tracks,
+    tags each face with its track_id and returns the per-track report
+    (best crop by size, pose and Vision's blur likelihood).
+    """
+    from src.ai.face_tracker import blur_factor, pick_best_crops, pose_factor, summarize_tracks, track_faces
 
-    pir.warm_up()
+    faces = [r.get("faces", []) for r in results]
+    tracks = track_faces([[f["bbox_xyxy"] for f in ff] for ff in faces])
 
-    while True:
-        # 1) Wait for motion
-        pir.wait_for_motion()
+    def measure(fi: int, bi: int, box: List[int]) -> Tuple[float, float]:
+        f = faces[fi][bi]
+        return 1.0, pose_factor(f.get("pose")) * blur_factor((f.get("quality") or {}).get("blurred"))
 
-        # 2) Turn light on
-        led.on()
+    pick_best_crops(tracks, measure)
+    for t in tracks:
+        for fi, (bi, _) in t.boxes.items():
+            faces[fi][bi]["track_id"] = t.track_id
+    return summarize_tracks(tracks, [r["frame"].name for r in results])
 
-        # 3) Capture burst
-        burst = capture_burst(
-            RAW_DIR,
-            prefix="burst",
-            burst_count=BURST_COUNT,
-            interval_s=BURST_INTERVAL_S,
-        )
 
-        # 4) Try Google Vision across burst
-        used_fallback = False
-        try:
-            google_results = run_google_on_burst(gv_client, burst)
-            best = choose_best_by_face_score(google_results)
-        except Exception:
-            used_fallback = True
+# -----------------------------
+# Per-event steps (each one runs as a pipeline stage)
+# -----------------------------
+def analyze_burst(
+    gv_client: GoogleVisionClient,
+    burst: List[Frame],
+    timer: Optional[EventTimer] = None,
+    cache: Optional[VisionCache] = None,
+    confirmer: Optional[MotionConfirmer] = None,
+) -> Optional[Dict[str, Any]]:
+    timer = timer or EventTimer()
+    if confirmer is not None:
+        with timer.span("motion"):
+            motion = confirmer.check(burst)
+        if not motion.confirmed:
+            # Nothing moved in the picture: no Vision call, no alert
+            print(f"[motion] rejected trigger: {motion.changed_fraction:.2%} changed ({motion.ms:.1f} ms)")
+            return None
+
+    # Try Google Vision across the burst; offline recognition if that fails
+    try:
+        with timer.span("quality"):
+            cloud_frames = select_top_k(burst, CLOUD_TOP_K)
+        with timer.span("vision"):
+            google_results = run_google_on_burst(gv_client, cloud_frames, cache=cache)
+        tracks = attach_google_tracks(google_results)
+        best = choose_best_by_face_score(google_results)
+        best["tracks"] = tracks
+        best["used_fallback"] = False
+    except Exception:
+        with timer.span("offline"):
             best = offline_fallback_for_burst(burst)
-
-        # 5) Save processed image (boxes/labels) and fill processed_path
+        best["used_fallback"] = True
+    best["timer"] = timer
+    best["burst"] = burst
+    return best
+
+
+def render_event(best: Dict[str, Any], store: Optional[ImageStore] = None) -> Dict[str, Any]:
+    timer = best.get("timer") or EventTimer()
+    # Keep the chosen raw frame and render the processed image (boxes/labels) in memory;
+    # with a store both disk copies go to today's folders in the background
+    raw_dir = store.dir_for("raw") if store is not None else RAW_DIR
+    processed_dir = store.dir_for("processed") if store is not None else PROCESSED_DIR
+    with timer.span("render"):
+        best["raw_path"] = best["frame"].save(raw_dir, writer=store)
+        if store is not None and KEEP_NON_BEST_FRAMES:
+            # The store deletes these first when it runs over budget
+            for frame in best.get("burst", []):
+                if frame is not best["frame"]:
+                    store.submit(raw_dir / f"{frame.name}{EXTRA_SUFFIX}", frame.jpeg)
         processed_info = save_processed_image(
             raw_path=best["raw_path"],
-            processed_dir=PROCESSED_DIR,
+            processed_dir=processed_dir,
             faces=best.get("faces", []),
             objects=best.get("objects", []),
+            frame=best["frame"],
+            writer=store,
         )
 
-        processed_path = processed_info["processed_path"]
-        width = best.get("width") or processed_info["width"]
-        height = best.get("height") or processed_info["height"]
-
-        # 6) Build event record (THIS is where processed_path gets populated)
-        img_wh = (int(width or 0), int(height or 0))
-        event = build_event_record(
-            raw_path=best["raw_path"],
-            processed_path=processed_path,
-            img_wh=img_wh,
-            faces=best.get("faces", []),
-            objects=best.get("objects", []),
-        )
+    processed_path = processed_info["processed_path"]
+    width = best.get("width") or processed_info["width"]
+    height = best.get("height") or processed_info["height"]
+
+    # Build event record (THIS is where processed_path gets populated)
+    img_wh = (int(width or 0), int(height or 0))
+    event = build_event_record(
+        raw_path=best["raw_path"],
+        processed_path=processed_path,
+        img_wh=img_wh,
+        faces=best.get("faces", []),
+        objects=best.get("objects", []),
+        timings=timer.as_dict(),
+    )
+
+    # Add wifi status note (so the user knows fallback happened)
+    if best.get("used_fallback"):
+        event["wifi_status"] = "WIFI_DOWN_USED_OFFLINE_FALLBACK"
+    else:
+        event["wifi_status"] = "WIFI_OK_USED_GOOGLE_VISION"
+
+    # One entry per person seen across the burst
+    event["tracks"] = best.get("tracks", [])
+    event["photo_path"] = processed_path or best["raw_path"]
+    # Uploaded straight from memory; popped again before the event is logged
+    event["photo_bytes"] = processed_info["jpeg"] or best["frame"].jpeg
+    event["upload_bytes"] = len(event["photo_bytes"])
+    return event
 
-        # Add wifi status note (so the user knows fallback happened)
-        if used_fallback:
-            event["wifi_status"] = "WIFI_DOWN_USED_OFFLINE_FALLBACK"
-        else:
-            event["wifi_status"] = "WIFI_OK_USED_GOOGLE_VISION"
 
-        # 7) Telegram alert (send raw image; you can switch to processed_path if you prefer)
-        send_event_alert(event, raw_image_path=processed_path or best["raw_path"])
+# -----------------------------
+# Main loop
+# -----------------------------
+def run() -> None:
+    # Start the offline workers first so their model loading overlaps the rest of start-up
+    if OFFLINE_POOL_WARM:
+        offline_pool.warm_up(OFFLINE_WORKERS)
 
-        # 8) Turn light off
-        led.off()
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
+    PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
-        # 9) Try to flush queued messages (if Wi-Fi came back)
+    pir = PIRSensor(pin=17, warmup_seconds=2.0)
+    led = LEDControl(pin=27)
+    gv_client = GoogleVisionClient()
+    # Near-duplicate frames (same visitor, repeated triggers) skip the Vision call
+    vision_cache = VisionCache()
+    confirmer = (
+        MotionConfirmer(include=MOTION_INCLUDE_REGIONS, exclude=MOTION_EXCLUDE_REGIONS)
+        if MOTION_CONFIRM else None
+    )
+    # Camera stays configured and streaming for the whole run
+    camera = CameraService()
+    camera.start()
+
+    # Per-stage timings: logs/metrics.jsonl + logs/metrics.prom (p50/p95/p99)
+    metrics = StageMetrics()
+
+    # One Bot + HTTP pool for the whole run; uploads happen off the capture loop
+    notifier = NotifierWorker(metrics=metrics).start()
+    # Raw + processed copies go to dated folders off the event path (batched writes,
+    # byte budget and max age enforced by a background sweeper)
+    store = ImageStore(
+        roots={"raw": RAW_DIR, "processed": PROCESSED_DIR},
+        max_bytes=STORAGE_MAX_BYTES,
+        max_age_days=STORAGE_MAX_AGE_DAYS,
+    ).start()
+    # Event history (data/events.sqlite3), written off the event path
+    event_store = EventStore().start()
+
+    last_burst_end = 0.0
+
+    def capture(timer: EventTimer) -> Optional[Dict[str, Any]]:
+        nonlocal last_burst_end
+        # Cooldown so you don't spam captures of the same visitor
+        if timer.started - last_burst_end < MOTION_COOLDOWN_S:
+            return None
+        timer.since_start("trigger_wait")
+        led.on()
         try:
-            flush_outbox(max_send=20)
-        except Exception:
-            pass
-
-        # 10) Cooldown so you don’t spam captures
-        # Wait until motion stops, then sleep a bit
-        pir.wait_for_no_motion(timeout=MOTION_COOLDOWN_S)
-        time.sleep(MOTION_COOLDOWN_S)
+            # Kept in memory; only the chosen frame is written
+            with timer.span("capture"):
+                burst = capture_burst_frames(
+                    prefix="burst",
+                    burst_count=BURST_COUNT,
+                    interval_s=BURST_INTERVAL_S,
+                    camera=camera,
+                )
+            return {"burst": burst, "timer": timer}
+        finally:
+            led.off()
+            last_burst_end = time.perf_counter()
+
+    def analyze(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        best = analyze_burst(gv_client, job["burst"], timer=job["timer"], cache=vision_cache, confirmer=confirmer)
+        if best is None:
+            metrics.record_event(job["timer"].as_dict(), rejected="motion")
+            metrics.add_total("motion_rejected", 1)
+        return best
+
+    def notify(event: Dict[str, Any]) -> None:
+        # Handed to the background notifier (never blocks); it also drains the outbox while idle
+        notifier.submit(
+            event,
+            photo_path=event.pop("photo_path", None),
+            photo_bytes=event.pop("photo_bytes", None),
+        )
+        metrics.record_event(
+            event["timings"],
+            wifi_status=event.get("wifi_status"),
+            upload_bytes=event.get("upload_bytes", 0),
+        )
+        metrics.add_total("upload_bytes", event.get("upload_bytes", 0))
+        event_store.submit(event)
+
+    # capture -> analyze -> render -> notify, each with its own bounded queue.
+    # A trigger while a burst is pending is redundant, so it is dropped;
+    # if analysis falls behind, the oldest waiting burst gives way to the newest.
+    pipeline = Pipeline([
+        Stage("capture", capture, maxsize=CAPTURE_QUEUE_SIZE, policy=DROP_NEWEST),
+        Stage("analyze", analyze, maxsize=ANALYZE_QUEUE_SIZE, policy=DROP_OLDEST),
+        Stage("render", lambda best: render_event(best, store=store), maxsize=RENDER_QUEUE_SIZE, policy=DROP_OLDEST),
+        Stage("notify", notify, maxsize=NOTIFY_QUEUE_SIZE, policy=BLOCK),
+    ])
+    pipeline.start()
+
+    pir.warmup()
+    # Motion now arrives as callbacks: capture can fire while an earlier event is still analyzed
+    pir.set_callbacks(on_motion=lambda: pipeline.put(EventTimer()))
+
+    try:
+        while True:
+            time.sleep(STATS_EVERY_S)
+            print(f"[pipeline] {pipeline.format_stats()} notifier={notifier.depth()}")
+            print(f"[vision-cache] {vision_cache.format_stats()}")
+            if confirmer is not None:
+                print(f"[motion] {confirmer.stats()}")
+            metrics.write_prometheus()
+    finally:
+        pir.set_callbacks(None, None)
+        pipeline.stop()
+        notifier.stop()
+        store.close()
+        event_store.close()
+        offline_pool.shutdown()
+        led.close()
+        camera.close()
 
 
 if __name__ == "__main__":
     run()
-
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List, Optional
+
+from src.notifications.telegram_notifier import (
+    TelegramConfig,
+    build_alert_text,
+    build_bot,
+    enqueue_alert,
+    flush_outbox,
+    load_telegram_config,
+    send_or_enqueue,
+)
+from src.utils.queue_worker import QueueWorker
+from src.utils.timestamp_utils import iso_timestamp
+
+
+class NotifierWorker(QueueWorker):
+    """
+    Background Telegram sender. Owns one configured Bot (and its pooled HTTP
+    connection) for the whole run and takes alerts from a bounded queue, so
+    the capture loop never waits on an upload.
+    When the queue is full the alert spills straight to the outbox.
+    The outbox is drained with the same Bot every flush_every_s, and after
+    a successful send.
+    """
+
+    def __init__(
+        self,
+        cfg: Optional[TelegramConfig] = None,
+        bot: Any = None,
+        max_queue: int = 8,
+        flush_every_s: float = 30.0,
+        flush_max_send: int = 20,
+        metrics: Any = None,
+    ) -> None:
+        super().__init__(
+            "notifier",
+            max_queue,
+            counts={
+                "submitted": 0, "sent": 0, "queued_for_retry": 0, "spilled": 0, "flushed": 0, "bytes_sent": 0,
+            },
+        )
+        self.cfg = cfg or load_telegram_config()
+        self.bot = bot or build_bot(self.cfg.bot_token, base_url=self.cfg.base_url)
+        self.flush_every_s = flush_every_s
+        self.flush_max_send = flush_max_send
+        # Optional StageMetrics: upload time is observed as the "telegram" stage
+        self.metrics = metrics
+        self._next_flush = time.monotonic() + flush_every_s
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return self.counts
+
+    def start(self) -> "NotifierWorker":
+        self._next_flush = time.monotonic() + self.flush_every_s
+        super().start()
+        return self
+
+    def submit(
+        self,
+        event: Dict[str, Any],
+        photo_path: Optional[str] = None,
+        photo_bytes: Optional[bytes] = None,
+    ) -> bool:
+        """
+        Never blocks. photo_bytes (already encoded) is uploaded from memory;
+        photo_path is what the outbox keeps if the send has to be retried.
+        Returns False if the queue was full and the alert was
+        written to the outbox instead.
+        """
+        text = build_alert_text(event)
+        self._count("submitted")
+        if self._offer((text, photo_path, photo_bytes)):
+            return True
+        self._spill(text, photo_path, "LocalQueueFull")
+        return False
+
+    def _spill(self, text: str, photo_path: Optional[str], reason: str) -> None:
+        enqueue_alert({
+            "created_at": iso_timestamp(),
+            "attempts": 0,
+            "next_try_at": iso_timestamp(),
+            "text": text,
+            "photo_path": photo_path,
+            "reason": reason,
+        })
+        self._count("spilled")
+
+    def _flush(self) -> None:
+        # Retry anything the outbox has due
+        try:
+            res = flush_outbox(self.flush_max_send, bot=self.bot, cfg=self.cfg)
+            self._count("flushed", res["sent"])
+        except Exception as e:
+            print(f"[notifier] flush_outbox failed: {e}")
+
+    # The outbox is drained on a timer whether or not alerts keep coming,
+    # and right after a live send succeeds (the link is up) if nothing is waiting
+    def _wait_s(self) -> Optional[float]:
+        return max(0.0, self._next_flush - time.monotonic())
+
+    def _idle(self) -> None:
+        self._flush()
+        self._next_flush = time.monotonic() + self.flush_every_s
+
+    def _handle(self, items: List[Any]) -> None:
+        for item in items:
+            if self._send(*item) and self.jobs.empty():
+                self._next_flush = time.monotonic()
+        if time.monotonic() >= self._next_flush:
+            self._idle()
+
+    def _send(self, text: str, photo_path: Optional[str], photo_bytes: Optional[bytes]) -> bool:
+        try:
+            t0 = time.perf_counter()
+            delivered = send_or_enqueue(self.bot, self.cfg.chat_id, text, photo_path, photo_bytes)
+            if self.metrics is not None:
+                self.metrics.observe("telegram", (time.perf_counter() - t0) * 1000.0)
+            if delivered:
+                self._count("sent")
+                self._count("bytes_sent", len(photo_bytes or b""))
+            else:
+                self._count("queued_for_retry")
+            return delivered
+        except Exception as e:
+            # Anything unexpected: keep the alert rather than lose it
+            print(f"[notifier] send failed: {e}")
+            self._spill(text, photo_path, f"Unexpected: {type(e).__name__}")
+            return False
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Lets queued alerts go out for up to `timeout` seconds; whatever is
+        still queued after that is moved to the outbox.
+        """
+        if not self.threads:
+            return
+        super().stop(timeout=timeout)
+        for text, photo_path, _ in self._drain():
+            self._spill(text, photo_path, "ShutdownPending")
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.utils.json_utils import iter_jsonl, to_jsonable
+
+OUTBOX_DB_PATH = Path("notifications/queue/telegram_outbox.sqlite3")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    next_try REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_next_try ON jobs (next_try, id);
+"""
+
+
+class Outbox:
+    """
+    Durable job queue in SQLite (WAL mode).
+    enqueue/ack/retry touch one row each; due() is an index range scan,
+    so cost does not grow with the number of queued jobs.
+    Failed jobs are pushed back with exponential backoff (plus jitter).
+    """
+
+    def __init__(
+        self,
+        path: Path = OUTBOX_DB_PATH,
+        base_backoff_s: float = 30.0,
+        max_backoff_s: float = 3600.0,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.base_backoff_s = base_backoff_s
+        self.max_backoff_s = max_backoff_s
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: a committed job survives a crash of the process, and
+        # only the last transaction can be lost on power cut
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        # Running job count, so len() never scans the table (one process owns the file)
+        self._size = int(self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+
+    def enqueue(self, job: Dict[str, Any], delay_s: float = 0.0) -> int:
+        payload = json.dumps(job, default=to_jsonable, ensure_ascii=False)
+        attempts = int(job.get("attempts", 0))
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO jobs (next_try, attempts, payload) VALUES (?, ?, ?)",
+                (time.time() + max(0.0, delay_s), attempts, payload),
+            )
+            self._size += 1
+            return int(cur.lastrowid)
+
+    def enqueue_many(self, jobs: List[Dict[str, Any]], delay_s: float = 0.0) -> None:
+        now = time.time() + max(0.0, delay_s)
+        rows = [
+            (now, int(j.get("attempts", 0)), json.dumps(j, default=to_jsonable, ensure_ascii=False))
+            for j in jobs
+        ]
+        with self._lock:
+            self._db.execute("BEGIN")
+            self._db.executemany("INSERT INTO jobs (next_try, attempts, payload) VALUES (?, ?, ?)", rows)
+            self._db.execute("COMMIT")
+            self._size += len(rows)
+
+    def due(self, limit: int = 20, now: Optional[float] = None) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Up to `limit` jobs whose next_try has passed, oldest first.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, attempts, payload FROM jobs WHERE next_try <= ? ORDER BY next_try, id LIMIT ?",
+                (now, int(limit)),
+            ).fetchall()
+        out = []
+        for job_id, attempts, payload in rows:
+            job = json.loads(payload)
+            job["attempts"] = attempts
+            out.append((int(job_id), job))
+        return out
+
+    def ack(self, job_id: int) -> None:
+        with self._lock:
+            cur = self._db.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+            self._size -= cur.rowcount
+
+    def retry(self, job_id: int, retry_after_s: Optional[float] = None) -> float:
+        """
+        Bumps attempts and schedules the next try. Returns the delay used.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return 0.0
+            attempts = int(row[0]) + 1
+            if retry_after_s is not None:
+                delay = float(retry_after_s)
+            else:
+                delay = min(self.max_backoff_s, self.base_backoff_s * (2 ** (attempts - 1)))
+                delay *= random.uniform(0.8, 1.2)
+            self._db.execute(
+                "UPDATE jobs SET attempts = ?, next_try = ? WHERE id = ?",
+                (attempts, time.time() + delay, job_id),
+            )
+            return delay
+
+    def __len__(self) -> int:
+        return self._size
+
+    def compact(self, min_free_pages: int = 256) -> bool:
+        """
+        Folds the WAL back into the main file and, if enough pages were freed
+        by sent jobs, VACUUMs so the file shrinks after a long outage drains.
+        """
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            free = int(self._db.execute("PRAGMA freelist_count").fetchone()[0])
+            if free < min_free_pages:
+                return False
+            self._db.execute("VACUUM")
+            return True
+
+    def import_jsonl(self, jsonl_path: Path) -> int:
+        """
+        One-time migration of the old telegram_outbox.jsonl. The file is renamed
+        to *.migrated afterwards so it is not imported twice.
+        """
+        jsonl_path = Path(jsonl_path)
+        if not jsonl_path.exists():
+            return 0
+        # corrupt lines (e.g. a write torn by a power cut) are skipped
+        jobs = [j for j in iter_jsonl(jsonl_path, include_partial=True) if isinstance(j, dict)]
+        if jobs:
+            self.enqueue_many(jobs)
+        jsonl_path.replace(jsonl_path.with_name(jsonl_path.name + ".migrated"))
+        return len(jobs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
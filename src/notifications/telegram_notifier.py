@@ -5,19 +5,21 @@ from dataclasses import dataclass
 from pathlib import Path
 OUTBOX_PATH = Path("notifications/queue/telegram_outbox.jsonl")
 
-from typing import Any, Dict, Optional, List
-import time
-import json
-from telegram import Bot, Update
-from telegram.error import NetworkError, TimedOut, RetryAfter, TelegramError
+from typing import Any, Dict, Optional, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # python-telegram-bot is imported on first send, not at import time
+    from telegram import Bot
 
 from src.utils.timestamp_utils import iso_timestamp
-from src.utils.json_utils import append_jsonl, read_json, safe_write_json
 from src.utils.env_loader import load_api_keys
+from src.notifications.outbox import Outbox
 @dataclass(frozen=True)
 class TelegramConfig:
     bot_token: str
     chat_id: str
+    # Optional Bot API endpoint override (e.g. a local fake server)
+    base_url: Optional[str] = None
 def load_telegram_config() -> TelegramConfig:
     keys = load_api_keys()
 
@@ -27,7 +29,8 @@ def load_telegram_config() -> TelegramConfig:
     if not bot_token or not chat_id:
         raise ValueError("Missing TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID in .env")
 
-    return TelegramConfig(bot_token, chat_id)
+    base_url = (keys.get("TELEGRAM_BASE_URL") or "").strip() or None
+    return TelegramConfig(bot_token, chat_id, base_url)
 LIKELIHOOD_SCORE = {
     "UNKNOWN": 0,
     "VERY_UNLIKELY": 1,
@@ -88,10 +91,33 @@ def build_alert_text(event: Dict[str, Any]) -> str:
         f"Top Emotions: {emo_line}\n"
         f"Top Objects: {objects_line}"
     )
-def enqueue_alert(job: Dict[str, Any]) -> None:
-    OUTBOX_PATH.parent.mkdir(parents=True, exist_ok=True)
-    append_jsonl(OUTBOX_PATH, job)
-def send_now(bot: Bot, chat_id: str, text: str, photo_path: Optional[str] = None) -> None:
+_outbox: Optional[Outbox] = None
+
+
+def get_outbox() -> Outbox:
+    """
+    Process-wide outbox. Jobs left in the old JSONL file are imported once.
+    """
+    global _outbox
+    if _outbox is None:
+        _outbox = Outbox()
+        _outbox.import_jsonl(OUTBOX_PATH)
+    return _outbox
+
+
+def enqueue_alert(job: Dict[str, Any], delay_s: float = 0.0) -> None:
+    get_outbox().enqueue(job, delay_s=delay_s)
+def send_now(
+    bot: Bot,
+    chat_id: str,
+    text: str,
+    photo_path: Optional[str] = None,
+    photo_bytes: Optional[bytes] = None,
+) -> None:
+    if photo_bytes:
+        # Already encoded in memory at upload size: no disk read on the send path
+        bot.send_photo(chat_id=chat_id, photo=photo_bytes, caption=text)
+        return
     if photo_path:
         p = Path(photo_path)
         if p.exists():
@@ -102,11 +128,28 @@ def send_now(bot: Bot, chat_id: str, text: str, photo_path: Optional[str] = None
 
 def send_event_alert(event: Dict[str, Any], raw_image_path: Optional[str] = None) -> None:
     cfg = load_telegram_config()
-    bot = Bot(token=cfg.bot_token)
-    text = build_alert_text(event)
+    bot = build_bot(cfg.bot_token, base_url=cfg.base_url)
+    send_or_enqueue(bot, cfg.chat_id, build_alert_text(event), raw_image_path)
+
+
+def send_or_enqueue(
+    bot: Bot,
+    chat_id: str,
+    text: str,
+    raw_image_path: Optional[str] = None,
+    photo_bytes: Optional[bytes] = None,
+) -> bool:
+    """
+    Sends right away; on any Telegram failure the alert goes to the outbox.
+    photo_bytes (if given) is uploaded instead of reading raw_image_path;
+    a retry from the outbox uses raw_image_path.
+    Returns True if it was delivered now.
+    """
+    from telegram.error import NetworkError, TimedOut, RetryAfter, TelegramError
 
     try:
-        send_now(bot, cfg.chat_id, text, photo_path=raw_image_path)
+        send_now(bot, chat_id, text, photo_path=raw_image_path, photo_bytes=photo_bytes)
+        return True
 
     except RetryAfter as e:
         wait_s = int(getattr(e, "retry_after", 30) or 30)
@@ -118,7 +161,8 @@ def send_event_alert(event: Dict[str, Any], raw_image_path: Optional[str] = None
             "photo_path": raw_image_path,
             "reason": f"RetryAfter: {getattr(e, 'retry_after', None)}",
         }
-        enqueue_alert(job)
+        enqueue_alert(job, delay_s=wait_s)
+        return False
     except (NetworkError, TimedOut) as e:
         wait_s = int(getattr(e, "retry_after", 30) or 30)
         job = {
@@ -130,6 +174,7 @@ def send_event_alert(event: Dict[str, Any], raw_image_path: Optional[str] = None
             "reason": f"Network: {type(e).__name__}",
         }
         enqueue_alert(job)
+        return False
     except TelegramError as e:
         wait_s = int(getattr(e, "retry_after", 30) or 30)
         job = {
@@ -141,9 +186,23 @@ def send_event_alert(event: Dict[str, Any], raw_image_path: Optional[str] = None
             "reason": f"TelegramError: {type(e).__name__}",
         }
         enqueue_alert(job)
-def build_bot(bot_token: str) -> Bot:
-    return Bot(token=bot_token)
+        return False
+def build_bot(bot_token: str, base_url: Optional[str] = None, con_pool_size: int = 4) -> Bot:
+    from telegram import Bot
+
+    kwargs: Dict[str, Any] = {}
+    if base_url:
+        kwargs["base_url"] = base_url
+    try:
+        # python-telegram-bot 13.x: one pooled HTTP session per Bot
+        from telegram.utils.request import Request
+        kwargs["request"] = Request(con_pool_size=con_pool_size)
+    except ImportError:
+        pass
+    return Bot(token=bot_token, **kwargs)
 def send_text(bot: Bot, text: str, chat_id: str ) -> bool:
+    from telegram.error import TelegramError
+
     try:
         bot.send_message(chat_id=chat_id, text=text)
         return True
@@ -151,6 +210,8 @@ def send_text(bot: Bot, text: str, chat_id: str ) -> bool:
         print(f"[telegram] send_text failed: {e}")
         return False
 def send_photo(bot: Bot, photo_path: Path, chat_id: str, caption: Optional[str] = None ) -> bool:
+    from telegram.error import TelegramError
+
     try:
         with open(photo_path, "rb") as photo:
             bot.send_photo(chat_id=chat_id, photo=photo, caption=caption)
@@ -173,39 +234,43 @@ def format_event_message(event: dict[str,Any]) -> str:
         f"Face Detected: {verdict.get('face_detected', False)}"
     )
 
-def flush_outbox(max_send: int = 20) -> Dict[str, int]:
-    cfg = load_telegram_config()
-    bot = Bot(token=cfg.bot_token)
-
-    if not OUTBOX_PATH.exists():
-        return {"sent": 0, "kept": 0}
-    lines = OUTBOX_PATH.read_text(encoding="utf-8").splitlines()
-    jobs: List[Dict[str, Any]] = []
-    for ln in lines:
-        ln = ln.strip()
-        if not ln:
-            continue
-        try:
-            jobs.append(json.loads(ln))
-        except Exception as e:
-            continue
+def flush_outbox(
+    max_send: int = 20,
+    bot: Optional[Bot] = None,
+    cfg: Optional[TelegramConfig] = None,
+) -> Dict[str, int]:
+    """
+    Sends up to max_send jobs whose backoff has expired. A failed job is
+    rescheduled with exponential backoff; a network error stops the flush
+    early since the rest would fail the same way.
+    Pass bot/cfg to reuse an existing Bot instead of building one.
+    """
+    from telegram.error import NetworkError, TimedOut, RetryAfter, TelegramError
+
+    outbox = get_outbox()
+    jobs = outbox.due(limit=max_send)
+    if not jobs:
+        return {"sent": 0, "kept": len(outbox)}
+
+    cfg = cfg or load_telegram_config()
+    bot = bot or build_bot(cfg.bot_token, base_url=cfg.base_url)
+
     sent = 0
-    kept: List[Dict[str, Any]] = []
-    for job in jobs:
-        if sent >= max_send:
-            kept.append(job)
-            job["attempts"] = int(job.get("attempts", 0)) + 1
-            continue
+    for job_id, job in jobs:
         try:
             send_now(bot, cfg.chat_id, job.get("text", ""), photo_path=job.get("photo_path"))
+            outbox.ack(job_id)
             sent += 1
-        except (NetworkError, TimedOut, RetryAfter, TelegramError):
-            kept.append(job)
-            job["attempts"] = int(job.get("attempts", 0)) + 1
-    OUTBOX_PATH.parent.mkdir(parents=True, exist_ok=True)
-    payload = "\n".join(__import__("json").dumps(j, ensure_ascii=False) for j in kept) + ("\n" if kept else "")
-    OUTBOX_PATH.write_text(payload, encoding="utf-8")
-
-    return {"sent": sent, "kept": len(kept)}
-
+        except RetryAfter as e:
+            outbox.retry(job_id, retry_after_s=float(getattr(e, "retry_after", 30) or 30))
+            break
+        except (NetworkError, TimedOut):
+            outbox.retry(job_id)
+            break
+        except TelegramError:
+            outbox.retry(job_id)
 
+    kept = len(outbox)
+    if sent and kept == 0:
+        outbox.compact()
+    return {"sent": sent, "kept": kept}
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import queue
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.queue_worker import STOP, QueueWorker
+
+# What put() does when a stage's queue is full
+DROP_NEWEST = "drop_newest"   # refuse the new item (e.g. coalesce repeated triggers)
+DROP_OLDEST = "drop_oldest"   # evict the oldest waiting item, keep the fresh one
+BLOCK = "block"               # wait for room (backpressure onto the producer)
+
+
+class Stage(QueueWorker):
+    """
+    One pipeline step: a bounded queue drained by worker thread(s).
+    handler(item) returns the item for the next stage, or None to stop there.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Any], Any],
+        maxsize: int = 2,
+        policy: str = DROP_OLDEST,
+        workers: int = 1,
+        downstream: Optional["Stage"] = None,
+    ) -> None:
+        if policy not in (DROP_NEWEST, DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown drop policy: {policy}")
+        super().__init__(
+            name,
+            maxsize,
+            counts={"accepted": 0, "dropped": 0, "processed": 0, "errors": 0},
+            workers=workers,
+        )
+        self.handler = handler
+        self.policy = policy
+        self.downstream = downstream
+        # Set by stop(): put() refuses new items, so nothing can crowd out the stop marker
+        self._stopping = False
+
+    def put(self, item: Any) -> bool:
+        """
+        Returns False if the item (or, for drop_oldest, an older one) was dropped,
+        or the stage is stopping.
+        """
+        if self._stopping:
+            self._count("dropped")
+            return False
+        if self.policy == BLOCK:
+            self.jobs.put(item)
+            self._count("accepted")
+            return True
+
+        while True:
+            if self._offer(item):
+                self._count("accepted")
+                return True
+            if self.policy == DROP_NEWEST:
+                self._count("dropped")
+                return False
+            # DROP_OLDEST: make room and try again
+            try:
+                old = self.jobs.get_nowait()
+                self.jobs.task_done()
+            except queue.Empty:
+                continue
+            if old is STOP:
+                # stop() got in first: hand its marker back and refuse the item
+                self.jobs.put(old)
+                self._count("dropped")
+                return False
+            self._count("dropped")
+
+    def start(self) -> "Stage":
+        self._stopping = False
+        super().start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping = True
+        super().stop(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        counts = self.snapshot()
+        counts.update({"depth": self.depth(), "maxsize": self.jobs.maxsize, "policy": self.policy})
+        return counts
+
+    def _handle(self, items: List[Any]) -> None:
+        for item in items:
+            try:
+                out = self.handler(item)
+                self._count("processed")
+            except Exception as e:
+                self._count("errors")
+                print(f"[pipeline] stage {self.name} failed: {type(e).__name__}: {e}")
+                continue
+            if out is not None and self.downstream is not None:
+                self.downstream.put(out)
+
+
+class Pipeline:
+    """
+    Stages chained in order: each stage's output feeds the next one.
+    """
+
+    def __init__(self, stages: List[Stage]) -> None:
+        self.stages = stages
+        for up, down in zip(stages, stages[1:]):
+            up.downstream = down
+
+    def put(self, item: Any) -> bool:
+        return self.stages[0].put(item)
+
+    def start(self) -> None:
+        for st in self.stages:
+            st.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        for st in self.stages:
+            st.stop(timeout=timeout)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {st.name: st.stats() for st in self.stages}
+
+    def format_stats(self) -> str:
+        return " ".join(
+            f"{name}={s['depth']}/{s['maxsize']}(ok {s['processed']}, drop {s['dropped']}, err {s['errors']})"
+            for name, s in self.stats().items()
+        )
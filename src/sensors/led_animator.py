@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+Color = Tuple[int, int, int]
+WHITE: Color = (255, 255, 255)
+BLACK: Color = (0, 0, 0)
+
+# An effect is a generator over the strip: each `yield` ends one frame.
+# The engine pushes the frame out and waits for the next frame tick.
+Effect = Callable[[Any], Iterator[None]]
+
+
+class SimulatedPixelStrip:
+    """
+    Stand-in for neopixel.NeoPixel (same fill/index/show API).
+    Keeps a (monotonic time, pixels) history of every show() so effect
+    timing can be checked without GPIO.
+    """
+
+    def __init__(self, n: int = 55, auto_write: bool = True) -> None:
+        self.n = n
+        self.auto_write = auto_write
+        self.pixels: List[Color] = [BLACK] * n
+        self.history: List[Tuple[float, List[Color]]] = []
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, i: int) -> Color:
+        return self.pixels[i]
+
+    def __setitem__(self, i: int, color: Color) -> None:
+        self.pixels[i] = tuple(color)
+        if self.auto_write:
+            self.show()
+
+    def fill(self, color: Color) -> None:
+        self.pixels = [tuple(color)] * self.n
+        if self.auto_write:
+            self.show()
+
+    def show(self) -> None:
+        self.history.append((time.monotonic(), list(self.pixels)))
+
+
+def _set(strip, i: int, color: Color) -> None:
+    if 0 <= i < len(strip):
+        strip[i] = color
+
+
+def sweep(color: Color = WHITE, heads: Tuple[int, ...] = (0, 5, 10), stop: int = 35, back_to: int = -15) -> Effect:
+    """
+    Three lit heads running up the strip and back again (the old on() animation).
+    """
+    def effect(strip) -> Iterator[None]:
+        x = 0
+        while x < stop:
+            for h in heads:
+                _set(strip, x - h, color)
+            x += 1
+            yield
+        while x > back_to:
+            for h in heads:
+                _set(strip, x + h, color)
+            x -= 1
+            yield
+    return effect
+
+
+def hold_then_fill(hold_s: float, color: Color = BLACK) -> Effect:
+    """
+    Leaves the strip as it is for hold_s, then fills it (e.g. lights off).
+    """
+    def effect(strip) -> Iterator[None]:
+        end = time.monotonic() + hold_s
+        while time.monotonic() < end:
+            yield
+        strip.fill(color)
+        yield
+    return effect
+
+
+class LEDAnimator:
+    """
+    Runs effects on a background thread at a fixed frame rate.
+    Frames are scheduled against absolute deadlines, so slow pixel writes
+    do not make the animation drift. fill() is applied immediately in the
+    caller's thread and cancels whatever effect is running.
+    """
+
+    def __init__(self, strip, fps: float = 20.0) -> None:
+        self.strip = strip
+        self.frame_s = 1.0 / fps
+        self._effect: Optional[Iterator[None]] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self.frames_shown = 0
+        self.thread = threading.Thread(target=self._run, name="led-animator", daemon=True)
+        self.thread.start()
+
+    def fill(self, color: Color) -> None:
+        with self._lock:
+            self._effect = None
+            self.strip.fill(color)
+            self._show()
+
+    def play(self, effect: Effect) -> None:
+        """
+        Replaces the running effect; returns right away.
+        """
+        with self._lock:
+            self._effect = effect(self.strip)
+        self._wake.set()
+
+    def busy(self) -> bool:
+        with self._lock:
+            return self._effect is not None
+
+    def _show(self) -> None:
+        show = getattr(self.strip, "show", None)
+        if show is not None and not getattr(self.strip, "auto_write", True):
+            show()
+
+    def _run(self) -> None:
+        deadline = time.monotonic()
+        while not self._stop:
+            with self._lock:
+                effect = self._effect
+            if effect is None:
+                self._wake.wait()
+                self._wake.clear()
+                deadline = time.monotonic()
+                continue
+
+            with self._lock:
+                if self._effect is not effect:
+                    continue  # replaced or cancelled meanwhile
+                try:
+                    next(effect)
+                    self._show()
+                    self.frames_shown += 1
+                except StopIteration:
+                    self._effect = None
+                    continue
+
+            deadline += self.frame_s
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # fell behind (slow strip): skip ahead instead of bursting frames
+                deadline = time.monotonic()
+
+    def close(self) -> None:
+        self._stop = True
+        self._wake.set()
+        self.thread.join(timeout=1.0)
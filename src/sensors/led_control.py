@@ -1,50 +1,81 @@
-from gpiozero import LED
-import time
-import board
-import neopixel
 from typing import Optional
 
+from src.sensors.led_animator import LEDAnimator, WHITE, BLACK, sweep, hold_then_fill
+
 
 DEFAULT_LED_PIN = 17
+# How long the strip stays lit after off() before going dark
+LIGHT_HOLD_S = 4.0
 
 
-pixels1 = neopixel.NeoPixel(board.D17, 55, brightness=1)
+NEOPIXEL_COUNT = 55
 
+_pixels1 = None
 
 
+def default_pixels():
+    """
+    The NeoPixel strip on D17, created on first use (not at import time).
+    """
+    global _pixels1
+    if _pixels1 is None:
+        import board
+        import neopixel
 
+        _pixels1 = neopixel.NeoPixel(board.D17, NEOPIXEL_COUNT, brightness=1)
+    return _pixels1
+
+
+class SimulatedLED:
+    """
+    Stand-in for gpiozero.LED (on/off/blink/close); remembers the last state.
+    """
+
+    def __init__(self) -> None:
+        self.is_lit = False
+        self.blinking = False
+        self.closed = False
 
-class LEDControl:
-    def __init__(self, pin: int = DEFAULT_LED_PIN):
-        self.led = LED(pin)
-        self.pixels = pixels1
     def on(self) -> None:
-        self.led.on()
+        self.is_lit, self.blinking = True, False
 
-        x = 0
-        self.pixels.fill((255, 255, 255))
-        self.pixels[10] = (255, 255, 255)
-        time.sleep(4)
-        while x < 35:
-            self.pixels[x] = (255, 255, 255)
-            self.pixels[x - 5] = (255, 255, 255)
-            self.pixels[x - 10] = (255, 255, 255)
-
-            x += 1
-            time.sleep(0.05)
-        while x > -15:
-            self.pixels[x] = (255, 255, 255)
-            self.pixels[x + 5] = (255, 255, 255)
-            self.pixels[x + 10] = (255, 255, 255)
-            x -= 1
-            time.sleep(0.05)
     def off(self) -> None:
-        self.led.off()
-        time.sleep(4)
+        self.is_lit, self.blinking = False, False
 
-        self.pixels.fill((0, 0, 0))
+    def blink(self, on_time: float = 1.0, off_time: float = 1.0, background: bool = True) -> None:
+        self.blinking = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class LEDControl:
+    """
+    on()/off() return immediately: the strip goes full white at once so the
+    camera has light for the first frame, and the sweep / delayed switch-off
+    run on the animation engine in the background.
+    Pass `pixels` (e.g. SimulatedPixelStrip) and `led` (e.g. SimulatedLED)
+    to run without the NeoPixel strip / GPIO.
+    """
+
+    def __init__(self, pin: int = DEFAULT_LED_PIN, pixels=None, fps: float = 20.0, led=None):
+        if led is None:
+            from gpiozero import LED
+
+            led = LED(pin)
+        self.led = led
+        self.pixels = pixels if pixels is not None else default_pixels()
+        self.animator = LEDAnimator(self.pixels, fps=fps)
+    def on(self) -> None:
+        self.led.on()
+        self.animator.fill(WHITE)
+        self.animator.play(sweep(WHITE))
+    def off(self, hold_s: float = LIGHT_HOLD_S) -> None:
+        self.led.off()
+        self.animator.play(hold_then_fill(hold_s, BLACK))
     def blink(self) -> None:
         self.led.blink(on_time=0.2, off_time=0.2, background=True)
     def close(self) -> None:
+        self.animator.close()
         self.led.close()
-        self.pixels.fill((0, 0, 0))
\ No newline at end of file
+        self.pixels.fill((0, 0, 0))
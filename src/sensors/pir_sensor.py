@@ -1,5 +1,3 @@
-from gpiozero import MotionSensor
-
 from typing import Optional, Callable
 
 import time
@@ -12,6 +10,9 @@ class PIRSensor:
     def __init__(self, pin=DEFAULT_PIR_PIN, warmup_seconds: float = 2.0):
         self.pin = pin
         self.warmup_seconds = warmup_seconds
+
+        from gpiozero import MotionSensor
+
         self.sensor = MotionSensor(self.pin)
 
     def warmup(self):
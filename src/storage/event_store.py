@@ -0,0 +1,286 @@
+# Event history: every event record (build_event_record + wifi_status / timings),
+# indexed for time-range and identity queries.
+#   python -m src.storage.event_store query --since 7d --name UNKNOWN
+#   python -m src.storage.event_store count --since 30d --level HIGH
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.utils.json_utils import to_jsonable
+from src.utils.queue_worker import QueueWorker
+from src.utils.timestamp_utils import now, parse_iso_timestamp
+
+EVENTS_DB_PATH = Path("data/events.sqlite3")
+
+# Faces without a recognized identity (Google Vision faces, offline misses)
+UNKNOWN_NAME = "UNKNOWN"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    level TEXT,
+    person INTEGER NOT NULL DEFAULT 0,
+    face_count INTEGER NOT NULL DEFAULT 0,
+    wifi_status TEXT,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS event_faces (
+    event_id INTEGER NOT NULL REFERENCES events (id) ON DELETE CASCADE,
+    ts REAL NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE INDEX IF NOT EXISTS events_level_ts ON events (level, ts);
+CREATE INDEX IF NOT EXISTS events_wifi_ts ON events (wifi_status, ts);
+CREATE INDEX IF NOT EXISTS event_faces_name_ts ON event_faces (name, ts, event_id);
+"""
+
+def _event_ts(event: Dict[str, Any]) -> float:
+    ts = event.get("timestamp")
+    if ts:
+        try:
+            return parse_iso_timestamp(ts).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def _face_names(event: Dict[str, Any]) -> List[str]:
+    return [str(f.get("name") or UNKNOWN_NAME) for f in event.get("faces", [])]
+
+
+class EventStore(QueueWorker):
+    """
+    Append-mostly event history in SQLite (WAL mode). The columns that get
+    filtered on are indexed together with the timestamp, so a time-range
+    query touches only matching rows. The full record is kept as JSON.
+
+    submit() hands the event to a writer thread that commits in batches and
+    never blocks the caller; add() / add_many() write synchronously.
+    """
+
+    def __init__(self, path: Path = EVENTS_DB_PATH, max_queue: int = 256, batch_max: int = 64) -> None:
+        super().__init__(
+            "event-store",
+            max_queue,
+            counts={"submitted": 0, "written": 0, "inline": 0, "errors": 0},
+            batch_max=batch_max,
+        )
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript(_SCHEMA)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return self.counts
+
+    # -----------------------------
+    # Writing
+    # -----------------------------
+    def add(self, event: Dict[str, Any]) -> int:
+        return self.add_many([event])[0]
+
+    def add_many(self, events: Iterable[Dict[str, Any]]) -> List[int]:
+        ids: List[int] = []
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for event in events:
+                    ts = _event_ts(event)
+                    verdict = event.get("verdict") or {}
+                    names = _face_names(event)
+                    cur = self._db.execute(
+                        "INSERT INTO events (ts, level, person, face_count, wifi_status, payload) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            ts,
+                            verdict.get("level"),
+                            int(bool(verdict.get("person_detected"))),
+                            len(names),
+                            event.get("wifi_status"),
+                            json.dumps(event, default=to_jsonable, ensure_ascii=False),
+                        ),
+                    )
+                    event_id = int(cur.lastrowid)
+                    if names:
+                        self._db.executemany(
+                            "INSERT INTO event_faces (event_id, ts, name) VALUES (?, ?, ?)",
+                            [(event_id, ts, n) for n in sorted(set(names))],
+                        )
+                    ids.append(event_id)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return ids
+
+    def submit(self, event: Dict[str, Any]) -> None:
+        """
+        Never blocks on the database while the writer keeps up; if its queue
+        is full the event is written in the caller's thread instead.
+        """
+        self._count("submitted")
+        if not self._offer(event):
+            self._count("inline")
+            self._write([event])
+
+    def _write(self, events: List[Dict[str, Any]]) -> None:
+        try:
+            self.add_many(events)
+            self._count("written", len(events))
+        except sqlite3.Error as e:
+            self._count("errors")
+            print(f"[events] failed to store {len(events)} events: {e}")
+
+    def _handle(self, events: List[Dict[str, Any]]) -> None:
+        # One transaction for whatever piled up meanwhile
+        self._write(events)
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    def _where(
+        self,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        level: Optional[str],
+        name: Optional[str],
+        wifi_status: Optional[str],
+    ) -> "tuple[str, str, list, str]":
+        clauses: List[str] = []
+        args: List[Any] = []
+        table = "events e"
+        ts_col = "e.ts"
+        if name is not None:
+            # Drive the query from the (name, ts) index
+            table = "event_faces f JOIN events e ON e.id = f.event_id"
+            ts_col = "f.ts"
+            clauses.append("f.name = ?")
+            args.append(name)
+        if since is not None:
+            clauses.append(f"{ts_col} >= ?")
+            args.append(since.timestamp())
+        if until is not None:
+            clauses.append(f"{ts_col} < ?")
+            args.append(until.timestamp())
+        if level is not None:
+            clauses.append("e.level = ?")
+            args.append(level)
+        if wifi_status is not None:
+            clauses.append("e.wifi_status = ?")
+            args.append(wifi_status)
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        return table, where, args, ts_col
+
+    def query(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        level: Optional[str] = None,
+        name: Optional[str] = None,
+        wifi_status: Optional[str] = None,
+        limit: int = 100,
+        newest_first: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        Event records matching every given filter, each with its "id".
+        """
+        table, where, args, ts_col = self._where(since, until, level, name, wifi_status)
+        order = "DESC" if newest_first else "ASC"
+        sql = f"SELECT e.id, e.payload FROM {table} {where} ORDER BY {ts_col} {order}, e.id {order} LIMIT ?"
+        with self._lock:
+            rows = self._db.execute(sql, (*args, int(limit))).fetchall()
+        out = []
+        for event_id, payload in rows:
+            record = json.loads(payload)
+            record["id"] = event_id
+            out.append(record)
+        return out
+
+    def count(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        level: Optional[str] = None,
+        name: Optional[str] = None,
+        wifi_status: Optional[str] = None,
+    ) -> int:
+        table, where, args, _ = self._where(since, until, level, name, wifi_status)
+        with self._lock:
+            return int(self._db.execute(f"SELECT COUNT(*) FROM {table} {where}", args).fetchone()[0])
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def close(self, timeout: float = 5.0) -> None:
+        self.stop(timeout=timeout)
+        with self._lock:
+            self._db.close()
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+_AGO_RE = re.compile(r"^(\d+(?:\.\d+)?)([mhdw])$")
+_AGO_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_when(text: str) -> datetime:
+    """
+    "7d", "12h", "30m", "2w" (that long ago) or an ISO timestamp.
+    """
+    m = _AGO_RE.match(text.strip())
+    if m:
+        return now() - timedelta(**{_AGO_UNITS[m.group(2)]: float(m.group(1))})
+    dt = parse_iso_timestamp(text)
+    return dt if dt.tzinfo else dt.replace(tzinfo=now().tzinfo)
+
+
+def _summary(e: Dict[str, Any]) -> str:
+    names = ",".join(_face_names(e)) or "-"
+    verdict = e.get("verdict") or {}
+    return f"{e['id']:7d}  {e.get('timestamp', ''):25}  {verdict.get('level', '-'):4}  {names:20}  {e.get('wifi_status', '-')}"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Query the local event history")
+    ap.add_argument("command", choices=("query", "count"))
+    ap.add_argument("--db", type=Path, default=EVENTS_DB_PATH)
+    ap.add_argument("--since", type=parse_when, default=None, help='e.g. "7d", "12h" or an ISO timestamp')
+    ap.add_argument("--until", type=parse_when, default=None)
+    ap.add_argument("--level", default=None, help="verdict level, e.g. HIGH / LOW")
+    ap.add_argument("--name", default=None, help=f"recognized name, or {UNKNOWN_NAME}")
+    ap.add_argument("--wifi", default=None, help="wifi_status, e.g. WIFI_DOWN_USED_OFFLINE_FALLBACK")
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--json", action="store_true", help="print full records as JSON lines")
+    args = ap.parse_args()
+
+    store = EventStore(args.db)
+    filters = dict(since=args.since, until=args.until, level=args.level, name=args.name, wifi_status=args.wifi)
+    t0 = time.perf_counter()
+    if args.command == "count":
+        print(store.count(**filters))
+    else:
+        for e in store.query(limit=args.limit, **filters):
+            print(json.dumps(e, ensure_ascii=False) if args.json else _summary(e))
+    print(f"[events] {(time.perf_counter() - t0) * 1000:.1f} ms")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.utils.file_writer import BackgroundWriter
+from src.utils.paths import PROCESSED_DIR, RAW_DIR
+from src.utils.timestamp_utils import date_folder, get_timezone, now
+
+# Frames that were not chosen for the event are saved as "<name>.extra.jpg"
+# and are the first to go when the budget is exceeded
+EXTRA_SUFFIX = ".extra.jpg"
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+DEFAULT_MAX_AGE_DAYS = 30
+SWEEP_EVERY_S = 300.0
+
+_DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+@dataclass
+class _Entry:
+    path: Path
+    size: int
+    extra: bool
+
+
+class ImageStore:
+    """
+    Date-partitioned image storage (<root>/<YYYY-MM-DD>/<name>.jpg) with a
+    byte budget and a maximum age, enforced by a background sweeper.
+    Sizes are tracked in an in-memory index built by one scan at start, so a
+    sweep never lists the whole tree. Writes go through a batching
+    BackgroundWriter; submit() has the same signature, so the store can be
+    passed wherever a writer is expected (Frame.save, save_processed_image).
+    Files in the root itself (the old flat layout) are indexed by mtime date.
+    """
+
+    def __init__(
+        self,
+        roots: Optional[Dict[str, Path]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_days: int = DEFAULT_MAX_AGE_DAYS,
+        sweep_every_s: float = SWEEP_EVERY_S,
+        batch_window_s: float = 0.5,
+        tz_name: str = "America/Detroit",
+    ) -> None:
+        self.roots = {k: Path(v) for k, v in (roots or {"raw": RAW_DIR, "processed": PROCESSED_DIR}).items()}
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.sweep_every_s = sweep_every_s
+        self.tz_name = tz_name
+        self.writer = BackgroundWriter(
+            max_queue=64, batch_window_s=batch_window_s, durable=True, on_written=self._written,
+        )
+
+        self._days: Dict[str, List[_Entry]] = {}
+        # Submitted but not yet on disk: a sweep must not pick these (the unlink
+        # would be a no-op and the file would appear afterwards, unindexed)
+        self._pending: Dict[Path, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.counts = {"saved": 0, "deleted": 0, "deleted_bytes": 0, "sweeps": 0}
+
+    # -----------------------------
+    # Index
+    # -----------------------------
+    def _add(self, day: str, entry: _Entry) -> None:
+        # Caller holds the lock
+        self._days.setdefault(day, []).append(entry)
+        self._bytes += entry.size
+
+    def scan(self) -> int:
+        """
+        Rebuilds the index from disk. Returns the number of files found.
+        """
+        days: Dict[str, List[_Entry]] = {}
+        total = 0
+        for root in self.roots.values():
+            if not root.exists():
+                continue
+            with os.scandir(root) as it:
+                for d in it:
+                    if d.is_dir() and _DAY_RE.match(d.name):
+                        with os.scandir(d.path) as files:
+                            for f in files:
+                                if f.is_file() and not f.name.endswith(".tmp"):
+                                    size = f.stat().st_size
+                                    days.setdefault(d.name, []).append(
+                                        _Entry(Path(f.path), size, f.name.endswith(EXTRA_SUFFIX))
+                                    )
+                                    total += size
+                    elif d.is_file() and not d.name.endswith(".tmp"):
+                        st = d.stat()
+                        day = date_folder(datetime.fromtimestamp(st.st_mtime, get_timezone(self.tz_name)))
+                        days.setdefault(day, []).append(_Entry(Path(d.path), st.st_size, d.name.endswith(EXTRA_SUFFIX)))
+                        total += st.st_size
+        for entries in days.values():
+            # names carry the capture timestamp, so name order is age order within a day
+            entries.sort(key=lambda e: e.path.name)
+        with self._lock:
+            self._days = days
+            self._bytes = total
+        return sum(len(v) for v in days.values())
+
+    # -----------------------------
+    # Writing
+    # -----------------------------
+    def dir_for(self, kind: str, dt: Optional[datetime] = None) -> Path:
+        return self.roots[kind] / date_folder(dt, self.tz_name)
+
+    def submit(self, path: Path, data: bytes) -> None:
+        path = Path(path)
+        day = path.parent.name if _DAY_RE.match(path.parent.name) else date_folder(tz_name=self.tz_name)
+        with self._lock:
+            self._add(day, _Entry(path, len(data), path.name.endswith(EXTRA_SUFFIX)))
+            self._pending[path] = self._pending.get(path, 0) + 1
+            self.counts["saved"] += 1
+        self.writer.submit(path, data)
+
+    def _written(self, paths: List[Path]) -> None:
+        with self._lock:
+            for path in paths:
+                left = self._pending.get(path, 0) - 1
+                if left > 0:
+                    self._pending[path] = left
+                else:
+                    self._pending.pop(path, None)
+
+    # -----------------------------
+    # Retention
+    # -----------------------------
+    def _select(self, at: datetime) -> "tuple[List[_Entry], List[str]]":
+        # Caller holds the lock. Takes the victims out of the index.
+        cutoff = date_folder(at - timedelta(days=self.max_age_days), self.tz_name)
+        victims: List[_Entry] = []
+        dropped_days: List[str] = []
+        for day in [d for d in sorted(self._days) if d < cutoff]:
+            still_queued = [e for e in self._days[day] if e.path in self._pending]
+            victims.extend(e for e in self._days[day] if e.path not in self._pending)
+            if still_queued:
+                self._days[day] = still_queued
+            else:
+                del self._days[day]
+                dropped_days.append(day)
+
+        budget = self._bytes - sum(v.size for v in victims)
+        for extras_only in (True, False):
+            for day in sorted(self._days):
+                if budget <= self.max_bytes:
+                    break
+                keep: List[_Entry] = []
+                for entry in self._days[day]:
+                    if budget > self.max_bytes and (entry.extra or not extras_only) and entry.path not in self._pending:
+                        victims.append(entry)
+                        budget -= entry.size
+                    else:
+                        keep.append(entry)
+                if keep:
+                    self._days[day] = keep
+                else:
+                    del self._days[day]
+                    dropped_days.append(day)
+        self._bytes = budget
+        return victims, dropped_days
+
+    def sweep(self, at: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Drops whole days older than max_age_days, then, while over max_bytes,
+        non-best frames oldest first and finally anything oldest first.
+        Files are picked under the lock but deleted outside it, so submit()
+        never waits on a long sweep.
+        """
+        with self._lock:
+            victims, dropped_days = self._select(at or now(self.tz_name))
+
+        deleted = deleted_bytes = 0
+        for entry in victims:
+            try:
+                entry.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"[storage] could not delete {entry.path}: {e}")
+                continue
+            deleted += 1
+            deleted_bytes += entry.size
+        for day in dropped_days:
+            for root in self.roots.values():
+                try:
+                    (root / day).rmdir()
+                except OSError:
+                    pass
+
+        with self._lock:
+            self.counts["deleted"] += deleted
+            self.counts["deleted_bytes"] += deleted_bytes
+            self.counts["sweeps"] += 1
+        return {"deleted": deleted, "deleted_bytes": deleted_bytes}
+
+    def usage(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "bytes": self._bytes,
+                "files": sum(len(v) for v in self._days.values()),
+                "days": len(self._days),
+            }
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+    def start(self) -> "ImageStore":
+        self.scan()
+        self.writer.start()
+        if self.thread is None or not self.thread.is_alive():
+            self._stop.clear()
+            self.thread = threading.Thread(target=self._run, name="image-sweeper", daemon=True)
+            self.thread.start()
+        return self
+
+    def _run(self) -> None:
+        while True:
+            try:
+                res = self.sweep()
+                if res["deleted"]:
+                    print(f"[storage] swept {res['deleted']} files ({res['deleted_bytes'] // 1024} KiB)")
+            except Exception as e:
+                print(f"[storage] sweep failed: {type(e).__name__}: {e}")
+            if self._stop.wait(self.sweep_every_s):
+                return
+
+    def flush(self) -> None:
+        self.writer.flush()
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+            self.thread = None
+        self.writer.close(timeout=timeout)
@@ -8,5 +8,6 @@ def load_api_keys():
     return {
         "GOOGLE_APPLICATION_CREDENTIALS": os.getenv('GOOGLE_APPLICATION_CREDENTIALS'),
         "TELEGRAM_BOT_TOKEN": os.getenv('TELEGRAM_BOT_TOKEN'),
-        "TELEGRAM_CHAT_ID": os.getenv('TELEGRAM_CHAT_ID')
+        "TELEGRAM_CHAT_ID": os.getenv('TELEGRAM_CHAT_ID'),
+        "TELEGRAM_BASE_URL": os.getenv('TELEGRAM_BASE_URL')
     }
\ No newline at end of file
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.utils.queue_worker import QueueWorker
+
+
+def write_bytes_atomic(path: Path, data: bytes, durable: bool = False) -> None:
+    """
+    tmp file + rename, so a reader never sees a half-written image.
+    durable=True also fsyncs the file data before the rename.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    tmp.replace(path)
+
+
+def fsync_dir(path: Path) -> None:
+    # Makes the renames in a directory durable (POSIX only)
+    try:
+        fd = os.open(str(path), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BackgroundWriter(QueueWorker):
+    """
+    Writes already-encoded files on a daemon thread so the event path only
+    pays for a queue put. If the queue is full the write happens in the
+    caller's thread instead: slower, but nothing is dropped.
+
+    With batch_window_s > 0 the thread collects up to batch_max files that
+    arrive within the window and writes them together. With durable=True a
+    batch writes every temp file first, then fdatasyncs them back to back
+    (the journal commits they trigger coalesce), renames them and fsyncs
+    each directory once. Only the batch's own files are synced.
+    on_written(paths) is called after each batch, whether the writes
+    succeeded or not.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 16,
+        batch_window_s: float = 0.0,
+        batch_max: int = 32,
+        durable: bool = False,
+        on_written: Optional[Callable[[List[Path]], None]] = None,
+    ) -> None:
+        super().__init__(
+            "file-writer",
+            max_queue,
+            counts={
+                "queued": 0, "inline": 0, "written": 0, "bytes": 0, "errors": 0, "batches": 0,
+                # fsync / fdatasync calls and the time spent in them, time spent waiting for a batch to fill
+                "syncs": 0, "sync_ms": 0.0, "window_ms": 0.0,
+            },
+            batch_max=batch_max,
+            batch_window_s=batch_window_s,
+        )
+        self.durable = durable
+        self.on_written = on_written
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return self.counts
+
+    def submit(self, path: Path, data: bytes) -> None:
+        if self._offer((Path(path), data)):
+            self._count("queued")
+        else:
+            self._count("inline")
+            self._write((Path(path), data))
+
+    def _write(self, job: Tuple[Path, bytes]) -> None:
+        self._write_batch([job])
+
+    def _failed(self, path: Path, e: OSError) -> None:
+        self._count("errors")
+        print(f"[writer] failed to write {path}: {e}")
+
+    def _write_batch(self, jobs: List[Tuple[Path, bytes]]) -> None:
+        try:
+            if self.durable:
+                self._write_durable(jobs)
+            else:
+                for path, data in jobs:
+                    try:
+                        write_bytes_atomic(path, data)
+                        self._count("written")
+                        self._count("bytes", len(data))
+                    except OSError as e:
+                        self._failed(path, e)
+            self._count("batches")
+        finally:
+            if self.on_written is not None:
+                self.on_written([path for path, _ in jobs])
+
+    def _write_durable(self, jobs: List[Tuple[Path, bytes]]) -> None:
+        sync = getattr(os, "fdatasync", os.fsync)
+        staged = []
+        for path, data in jobs:
+            tmp = path.with_name(path.name + ".tmp")
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                staged.append((path, tmp, len(data)))
+            except OSError as e:
+                self._failed(path, e)
+
+        t0 = time.perf_counter()
+        syncs = 0
+        dirs = set()
+        for path, tmp, size in staged:
+            try:
+                fd = os.open(str(tmp), os.O_RDONLY)
+                try:
+                    sync(fd)
+                finally:
+                    os.close(fd)
+                syncs += 1
+                tmp.replace(path)
+                dirs.add(path.parent)
+                self._count("written")
+                self._count("bytes", size)
+            except OSError as e:
+                self._failed(path, e)
+        for d in dirs:
+            fsync_dir(d)
+            syncs += 1
+        self._count("syncs", syncs)
+        self._count("sync_ms", (time.perf_counter() - t0) * 1000.0)
+
+    def _collect(self, first: Any) -> List[Any]:
+        t0 = time.monotonic()
+        batch = super()._collect(first)
+        self._count("window_ms", (time.monotonic() - t0) * 1000.0)
+        return batch
+
+    def _handle(self, items: List[Tuple[Path, bytes]]) -> None:
+        self._write_batch(items)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Lets the thread finish the queue for up to `timeout` seconds, then
+        writes whatever is still queued in the caller's thread.
+        """
+        self.stop(timeout=timeout)
+        left = self._drain()
+        if left:
+            print(f"[file-writer] writer thread did not finish in {timeout:.1f}s; writing {len(left)} queued files inline")
+            self._count("inline", len(left))
+            self._write_batch(left)
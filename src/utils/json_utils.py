@@ -3,8 +3,16 @@ from pathlib import Path
 import tempfile
 import os
 import datetime
+import threading
+import time
 import numpy as np
 
+try:
+    # Optional: several times faster, and encodes numpy arrays natively
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def read_json(path, default=None):
     p = Path(path)
@@ -26,13 +34,131 @@ def write_json(path, data, pretty=True):
     p.write_text(payload, encoding="utf-8")
 
 
+def dumps_line(record) -> bytes:
+    """
+    One JSONL line (UTF-8, trailing newline). Uses orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            record,
+            default=to_jsonable,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+    return (json.dumps(record, default=to_jsonable, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def loads_line(line):
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
 def append_jsonl(path, record):
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
 
-    line = json.dumps(record, default=to_jsonable, ensure_ascii=False)
-    with p.open("a", encoding="utf-8") as f:
-        f.write(line + "\n")
+    with p.open("ab") as f:
+        f.write(dumps_line(record))
+
+
+def iter_jsonl(path, offset=0, with_offsets=False, errors=None, include_partial=False):
+    """
+    Streams records from a JSONL file, starting at byte `offset`.
+    Blank and corrupt lines are skipped (and counted in errors["corrupt"] if
+    a dict is passed). A last line without its newline is treated as still
+    being written and is not returned.
+    With with_offsets=True yields (record, offset_after_record): feed that
+    offset back in to resume after the last record you handled.
+    """
+    p = Path(path)
+    if not p.exists():
+        return
+    with p.open("rb") as f:
+        f.seek(offset)
+        pos = offset
+        for line in f:
+            if not line.endswith(b"\n") and not include_partial:
+                return
+            pos += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = loads_line(line)
+            except ValueError:
+                if errors is not None:
+                    errors["corrupt"] = errors.get("corrupt", 0) + 1
+                continue
+            yield (record, pos) if with_offsets else record
+
+
+class JsonlWriter:
+    """
+    Long-lived append handle for JSONL logs. Records are buffered and the
+    file is fsynced as a group: every `fsync_every` records and/or every
+    `fsync_interval_s` seconds (both None: leave it to the OS).
+    Thread-safe; use as a context manager or call close().
+    """
+
+    def __init__(self, path, fsync_every=None, fsync_interval_s=None, buffer_bytes=64 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fsync_every = fsync_every
+        self.fsync_interval_s = fsync_interval_s
+        self._f = self.path.open("ab", buffering=buffer_bytes)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.fsyncs = 0
+
+    def write(self, record) -> None:
+        line = dumps_line(record)
+        with self._lock:
+            self._f.write(line)
+            self._pending += 1
+            self._maybe_sync()
+
+    def write_many(self, records) -> None:
+        lines = b"".join(dumps_line(r) for r in records)
+        with self._lock:
+            self._f.write(lines)
+            self._pending += lines.count(b"\n")
+            self._maybe_sync()
+
+    def _maybe_sync(self) -> None:
+        # Caller holds the lock
+        due = self.fsync_every is not None and self._pending >= self.fsync_every
+        if not due and self.fsync_interval_s is not None:
+            due = time.monotonic() - self._last_sync >= self.fsync_interval_s
+        if due:
+            self._sync()
+
+    def _sync(self) -> None:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.fsyncs += 1
+
+    def flush(self, fsync=False) -> None:
+        with self._lock:
+            if fsync:
+                self._sync()
+            else:
+                self._f.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f.closed:
+                return
+            if self._pending and (self.fsync_every is not None or self.fsync_interval_s is not None):
+                self._sync()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 def safe_write_json(path, data, pretty=True):
@@ -73,11 +199,10 @@ def to_jsonable(obj):
     if isinstance(obj, Path):
         return str(obj)
 
-    # numpy scalar types
-    if isinstance(obj, np.integer):
-        return int(obj)
-    if isinstance(obj, np.floating):
-        return float(obj)
+    # numpy scalars (integer, floating, bool_, str_): .item() gives the Python value
+    if isinstance(obj, np.generic):
+        return obj.item()
+    # tolist() converts in C in one pass; orjson never gets here for plain numeric arrays
     if isinstance(obj, np.ndarray):
         return obj.tolist()
 
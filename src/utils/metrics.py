@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional
+
+from src.utils.json_utils import append_jsonl
+from src.utils.paths import LOG_DIR
+from src.utils.timestamp_utils import iso_timestamp
+
+METRICS_LOG_PATH = LOG_DIR / "metrics.jsonl"
+PROMETHEUS_PATH = LOG_DIR / "metrics.prom"
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class EventTimer:
+    """
+    Per-event stage timings in milliseconds. A span is two perf_counter()
+    calls and a dict update, cheap enough to leave on permanently.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: Dict[str, float] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - t0) * 1000.0)
+
+    def add(self, name: str, ms: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    def since_start(self, name: str) -> None:
+        # e.g. how long a trigger waited in queues before a stage picked it up
+        self.add(name, (time.perf_counter() - self.started) * 1000.0)
+
+    def as_dict(self) -> Dict[str, float]:
+        out = {k: round(v, 2) for k, v in self.spans.items()}
+        out["total"] = round((time.perf_counter() - self.started) * 1000.0, 2)
+        return out
+
+
+class StageMetrics:
+    """
+    Rolling per-stage latency window (last `window` observations per stage)
+    plus lifetime sum/count. Events are appended to a size-rotated JSONL log
+    and the window can be rendered as a Prometheus text-format summary.
+    """
+
+    def __init__(
+        self,
+        log_path: Optional[Path] = METRICS_LOG_PATH,
+        window: int = 500,
+        max_log_bytes: int = 5 * 1024 * 1024,
+    ) -> None:
+        self.log_path = Path(log_path) if log_path else None
+        self.window = window
+        self.max_log_bytes = max_log_bytes
+        self._samples: Dict[str, Deque[float]] = {}
+        self._sum_ms: Dict[str, float] = {}
+        self._count: Dict[str, int] = {}
+        self._totals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, ms: float) -> None:
+        with self._lock:
+            q = self._samples.get(stage)
+            if q is None:
+                q = self._samples[stage] = deque(maxlen=self.window)
+            q.append(ms)
+            self._sum_ms[stage] = self._sum_ms.get(stage, 0.0) + ms
+            self._count[stage] = self._count.get(stage, 0) + 1
+
+    def add_total(self, name: str, value: float) -> None:
+        """
+        Running counter for non-latency quantities (e.g. upload bytes).
+        """
+        with self._lock:
+            self._totals[name] = self._totals.get(name, 0) + value
+
+    def record_event(self, timings: Dict[str, float], **extra) -> None:
+        for stage, ms in timings.items():
+            self.observe(stage, ms)
+        if self.log_path is None:
+            return
+        self._rotate_if_needed()
+        append_jsonl(self.log_path, {"timestamp": iso_timestamp(), "timings": timings, **extra})
+
+    def _rotate_if_needed(self) -> None:
+        try:
+            if self.log_path.stat().st_size < self.max_log_bytes:
+                return
+        except OSError:
+            return
+        self.log_path.replace(self.log_path.with_name(self.log_path.name + ".1"))
+
+    def quantiles(self, stage: str) -> Dict[float, float]:
+        with self._lock:
+            values = sorted(self._samples.get(stage, ()))
+        if not values:
+            return {}
+        n = len(values)
+        return {q: values[min(n - 1, int(q * n))] for q in QUANTILES}
+
+    def stages(self) -> List[str]:
+        with self._lock:
+            return sorted(self._samples)
+
+    def prometheus_text(self, prefix: str = "doorcam") -> str:
+        name = f"{prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Per-stage latency of door events (quantiles over the last {self.window} events).",
+            f"# TYPE {name} summary",
+        ]
+        for stage in self.stages():
+            for q, ms in self.quantiles(stage).items():
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {ms / 1000.0:.6f}')
+            with self._lock:
+                total, count = self._sum_ms[stage], self._count[stage]
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total / 1000.0:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+        with self._lock:
+            totals = sorted(self._totals.items())
+        for key, value in totals:
+            lines.append(f"# TYPE {prefix}_{key}_total counter")
+            lines.append(f"{prefix}_{key}_total {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path = PROMETHEUS_PATH) -> None:
+        """
+        Atomic write, for node_exporter's textfile collector.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.prometheus_text(), encoding="utf-8")
+        tmp.replace(path)
@@ -39,4 +39,3 @@ def get_processed_image_path(timestamp):
 
 def get_result_json_path(timestamp):
     return f"{LOG_DIR}/{timestamp}.json"
-ensure_directories()
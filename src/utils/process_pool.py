@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+
+def init_cv2_worker() -> None:
+    import cv2
+
+    # One process per core already; stop OpenCV from spawning its own threads on top
+    cv2.setNumThreads(1)
+
+
+class WarmPool:
+    """
+    A ProcessPoolExecutor kept alive between calls, so worker start-up and
+    whatever `initializer` loads are paid once. Asking for a different
+    worker count replaces it. workers=None means one per core.
+
+    Workers are spawned, not forked: a pool can be (re)built at any time from
+    the analyze thread, while the camera, notifier and writer threads run.
+    """
+
+    def __init__(self, initializer: Callable[[], None] = init_cv2_worker) -> None:
+        self.initializer = initializer
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = 0
+        self._lock = threading.Lock()
+
+    def get(self, workers: Optional[int] = None) -> ProcessPoolExecutor:
+        workers = workers or os.cpu_count() or 1
+        with self._lock:
+            if self._pool is None or self._workers != workers:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                )
+                self._workers = workers
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._workers = 0
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Queued by stop(): the worker thread that takes it exits
+STOP = object()
+
+
+class QueueWorker:
+    """
+    A bounded queue drained by daemon worker thread(s), with thread-safe
+    counters. Subclasses implement _handle(items); with batch_max > 1 a
+    thread hands over up to batch_max items that arrive within
+    batch_window_s (0 = whatever is already queued) in one call.
+
+    _offer() never blocks: it returns False when the queue is full and the
+    caller decides what to do (write inline, spill to the outbox, drop).
+    Optional hooks: _wait_s() bounds the wait for the next item and _idle()
+    runs when it elapses with nothing queued.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_queue: int,
+        counts: Dict[str, Any],
+        workers: int = 1,
+        batch_max: int = 1,
+        batch_window_s: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.workers = workers
+        self.batch_max = batch_max
+        self.batch_window_s = batch_window_s
+        self.jobs: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self.threads: List[threading.Thread] = []
+        self.counts = counts
+        self._counts_lock = threading.Lock()
+
+    # -----------------------------
+    # Hooks
+    # -----------------------------
+    def _handle(self, items: List[Any]) -> None:
+        raise NotImplementedError
+
+    def _wait_s(self) -> Optional[float]:
+        return None
+
+    def _idle(self) -> None:
+        pass
+
+    # -----------------------------
+    # Producer side
+    # -----------------------------
+    def _count(self, key: str, n: float = 1) -> None:
+        with self._counts_lock:
+            self.counts[key] += n
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._counts_lock:
+            return dict(self.counts)
+
+    def _offer(self, item: Any) -> bool:
+        try:
+            self.jobs.put_nowait(item)
+            return True
+        except queue.Full:
+            return False
+
+    def depth(self) -> int:
+        return self.jobs.qsize()
+
+    # -----------------------------
+    # Worker side
+    # -----------------------------
+    def start(self) -> "QueueWorker":
+        self.threads = [t for t in self.threads if t.is_alive()]
+        for i in range(len(self.threads), self.workers):
+            suffix = f"-{i}" if self.workers > 1 else ""
+            t = threading.Thread(target=self._run, name=f"{self.name}{suffix}", daemon=True)
+            t.start()
+            self.threads.append(t)
+        return self
+
+    def _collect(self, first: Any) -> List[Any]:
+        batch = [first]
+        if self.batch_max <= 1:
+            return batch
+        deadline = time.monotonic() + self.batch_window_s
+        while batch[-1] is not STOP and len(batch) < self.batch_max:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.jobs.get(timeout=remaining) if remaining > 0 else self.jobs.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self.jobs.get(timeout=self._wait_s())
+            except queue.Empty:
+                self._idle()
+                continue
+            batch = self._collect(first)
+            try:
+                items = [item for item in batch if item is not STOP]
+                if items:
+                    self._handle(items)
+            finally:
+                for _ in batch:
+                    self.jobs.task_done()
+            if batch[-1] is STOP:
+                return
+
+    def flush(self) -> None:
+        """
+        Blocks until everything queued so far has been handled.
+        """
+        if self.threads:
+            self.jobs.join()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Lets the threads finish what is queued ahead of the stop marker, for
+        up to `timeout` seconds; use _drain() for whatever is left after that.
+        """
+        for _ in self.threads:
+            try:
+                self.jobs.put(STOP, timeout=timeout)
+            except queue.Full:
+                pass
+        for t in self.threads:
+            t.join(timeout=timeout)
+        self.threads = []
+
+    def _drain(self) -> List[Any]:
+        left = []
+        while True:
+            try:
+                item = self.jobs.get_nowait()
+            except queue.Empty:
+                return left
+            self.jobs.task_done()
+            if item is not STOP:
+                left.append(item)
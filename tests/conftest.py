@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+import pytest
+
+
+class FakeTelegram:
+    """
+    Local stand-in for the Bot API (https://api.telegram.org/bot<token>/<method>).
+    Records (method, body size) of every call. close_gate() makes calls hang
+    until open_gate(); fail_with(status) answers with an HTTP error.
+    """
+
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, int]] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.arrived = threading.Event()
+        self.status = 200
+        self.lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                method = self.path.rsplit("/", 1)[-1]
+                with fake.lock:
+                    fake.calls.append((method, len(body)))
+                fake.arrived.set()
+                fake.gate.wait(timeout=10)
+                if fake.status != 200:
+                    payload = {"ok": False, "error_code": fake.status, "description": "fake failure"}
+                else:
+                    payload = {"ok": True, "result": {
+                        "message_id": len(fake.calls), "date": 0, "chat": {"id": 1, "type": "private"},
+                    }}
+                data = json.dumps(payload).encode()
+                self.send_response(fake.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/bot"
+
+    def methods(self) -> List[str]:
+        with self.lock:
+            return [m for m, _ in self.calls]
+
+    def close_gate(self) -> None:
+        self.arrived.clear()
+        self.gate.clear()
+
+    def open_gate(self) -> None:
+        self.gate.set()
+
+    def fail_with(self, status: int) -> None:
+        self.status = status
+
+    def close(self) -> None:
+        self.gate.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_telegram():
+    fake = FakeTelegram()
+    yield fake
+    fake.close()
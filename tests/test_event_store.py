@@ -0,0 +1,113 @@
+# EventStore filters / indexes and the query CLI
+from __future__ import annotations
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.storage import event_store
+from src.storage.event_store import UNKNOWN_NAME, EventStore, parse_when
+
+BASE = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _event(minutes: int, level: str = "HIGH", names=(), wifi: str = "WIFI_OK_USED_GOOGLE_VISION"):
+    return {
+        "timestamp": (BASE + timedelta(minutes=minutes)).isoformat(),
+        "verdict": {"level": level, "person_detected": level == "HIGH"},
+        "faces": [{"name": n} if n else {} for n in names],
+        "wifi_status": wifi,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = EventStore(tmp_path / "events.sqlite3")
+    s.add_many([
+        _event(0, names=["alice"]),
+        _event(10, level="LOW"),
+        _event(20, names=["alice", None], wifi="WIFI_DOWN_USED_OFFLINE_FALLBACK"),
+        _event(30, names=["bob"]),
+        _event(40, level="LOW", names=[None]),
+    ])
+    yield s
+    s.close()
+
+
+def _minutes(records):
+    return [int((datetime.fromisoformat(r["timestamp"]) - BASE).total_seconds() // 60) for r in records]
+
+
+def test_filters_by_name_level_and_wifi(store):
+    assert _minutes(store.query(name="alice")) == [20, 0]
+    assert _minutes(store.query(name=UNKNOWN_NAME)) == [40, 20]
+    assert _minutes(store.query(level="LOW")) == [40, 10]
+    assert _minutes(store.query(wifi_status="WIFI_DOWN_USED_OFFLINE_FALLBACK")) == [20]
+    assert _minutes(store.query(name=UNKNOWN_NAME, level="LOW")) == [40]
+    assert store.count(name="alice") == 2 and store.count(level="HIGH") == 3 and len(store) == 5
+
+
+def test_time_range_is_half_open(store):
+    since, until = BASE + timedelta(minutes=10), BASE + timedelta(minutes=30)
+
+    assert _minutes(store.query(since=since, until=until, newest_first=False)) == [10, 20]
+    assert store.count(since=since, until=until, name="alice") == 1
+    assert store.count(since=BASE + timedelta(minutes=41)) == 0
+
+
+def test_query_limit_and_ids(store):
+    got = store.query(limit=2)
+
+    assert _minutes(got) == [40, 30]
+    assert got[0]["id"] > got[1]["id"]
+
+
+def test_indexes_exist_and_drive_the_filtered_queries(store):
+    names = {r[0] for r in store._db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"events_ts", "events_level_ts", "events_wifi_ts", "event_faces_name_ts"} <= names
+
+    table, where, args, _ = store._where(BASE, None, None, "alice", None)
+    plan = " ".join(r[-1] for r in store._db.execute(f"EXPLAIN QUERY PLAN SELECT e.id FROM {table} {where}", args))
+    assert "event_faces_name_ts" in plan
+
+
+def test_submit_writes_on_the_thread(tmp_path):
+    s = EventStore(tmp_path / "events.sqlite3").start()
+    for m in range(3):
+        s.submit(_event(m))
+    s.flush()
+
+    assert s.count() == 3 and s.stats["written"] == 3 and s.stats["inline"] == 0
+    s.close()
+
+
+def test_parse_when_relative_and_iso():
+    assert abs((event_store.now() - timedelta(days=7) - parse_when("7d")).total_seconds()) < 5
+    assert abs((event_store.now() - timedelta(minutes=90) - parse_when("1.5h")).total_seconds()) < 5
+    assert parse_when("2026-05-01T12:00:00Z") == BASE
+    naive = parse_when("2026-05-01T08:00:00")
+    assert naive.tzinfo is not None and naive.utcoffset() == event_store.now().utcoffset()
+    with pytest.raises(ValueError):
+        parse_when("yesterday")
+
+
+def _cli(monkeypatch, capsys, *argv):
+    monkeypatch.setattr(sys, "argv", ["event_store", *argv])
+    event_store.main()
+    return capsys.readouterr().out.splitlines()
+
+
+def test_cli_count_and_query(store, monkeypatch, capsys):
+    db = str(store.path)
+
+    out = _cli(monkeypatch, capsys, "count", "--db", db, "--name", "alice")
+    assert out[0] == "2" and out[1].startswith("[events] ")
+
+    out = _cli(monkeypatch, capsys, "query", "--db", db, "--level", "LOW", "--json")
+    assert [json.loads(line)["verdict"]["level"] for line in out[:-1]] == ["LOW", "LOW"]
+
+    out = _cli(monkeypatch, capsys, "query", "--db", db, "--since", "2026-05-01T12:25:00Z", "--limit", "1")
+    assert len(out) == 2
+    assert "UNKNOWN" in out[0] and "LOW" in out[0]
@@ -0,0 +1,51 @@
+# JPEG header size vs what cv2.imdecode returns (EXIF orientation)
+from __future__ import annotations
+
+import struct
+
+import cv2
+import numpy as np
+import pytest
+
+from src.camera.frame import Frame, jpeg_size
+from src.cloud.google_vision_client import _downscale_for_upload
+
+
+def _jpeg(w: int, h: int, orientation: int = 0) -> bytes:
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    img[: h // 2, : w // 2] = 255  # top-left quadrant white
+    data = cv2.imencode(".jpg", img)[1].tobytes()
+    if not orientation:
+        return data
+    # Big-endian TIFF with one IFD0 entry: Orientation (0x0112), SHORT, count 1
+    tiff = b"MM\x00\x2a" + struct.pack(">I", 8) + struct.pack(">H", 1)
+    tiff += struct.pack(">HHIHH", 0x0112, 3, 1, orientation, 0) + struct.pack(">I", 0)
+    app1 = b"Exif\x00\x00" + tiff
+    return data[:2] + b"\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + data[2:]
+
+
+def _decoded_wh(data: bytes):
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    return img.shape[1], img.shape[0]
+
+
+@pytest.mark.parametrize("orientation", [0, 1, 3, 6, 8])
+def test_jpeg_size_matches_imdecode(orientation):
+    data = _jpeg(320, 240, orientation)
+    assert jpeg_size(data) == _decoded_wh(data)
+
+
+def test_frame_size_before_and_after_decode_agree():
+    frame = Frame(name="f", timestamp="t", jpeg=_jpeg(320, 240, orientation=6))
+    before = frame.size_wh
+    frame.array
+    assert before == frame.size_wh == (240, 320)
+
+
+def test_upload_scale_keeps_aspect_for_rotated_jpeg():
+    data = _jpeg(1600, 1200, orientation=6)
+    up = _downscale_for_upload(data, long_edge=640, jpeg_quality=85)
+
+    assert up.full_wh == (1200, 1600)
+    assert _decoded_wh(up.content) == (480, 640)
+    assert up.sx == pytest.approx(up.sy) == pytest.approx(2.5)
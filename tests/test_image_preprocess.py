@@ -0,0 +1,91 @@
+# Denoise tier selection and the burst pool path
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from src.ai import image_preprocess
+from src.ai.image_preprocess import (
+    DARK_BRIGHTNESS,
+    NOISE_SIGMA_FAST,
+    NOISE_SIGMA_QUALITY,
+    TARGET_WH,
+    estimate_noise,
+    preprocess_array,
+    preprocess_burst,
+)
+
+
+def _frame(sigma: float, level: float = 130.0, seed: int = 0) -> np.ndarray:
+    # Horizontal gradient around `level` (smooth structure the estimate must ignore) plus gray noise
+    rng = np.random.default_rng(seed)
+    w, h = TARGET_WH
+    base = np.tile(np.linspace(level - 40, level + 40, w, dtype=np.float32), (h, 1))
+    noisy = base + rng.normal(0.0, sigma, (h, w)) if sigma else base
+    return np.repeat(np.clip(noisy, 0, 255).astype(np.uint8)[..., None], 3, axis=2)
+
+
+@pytest.mark.parametrize("sigma", [2.0, 5.0, 12.0])
+def test_noise_estimate_tracks_the_added_noise(sigma):
+    gray = cv2.cvtColor(_frame(sigma), cv2.COLOR_BGR2GRAY)
+    assert estimate_noise(gray) == pytest.approx(sigma, rel=0.15)
+
+
+@pytest.mark.parametrize(
+    "sigma, expected",
+    [
+        (0.0, "none"),
+        ((NOISE_SIGMA_FAST + NOISE_SIGMA_QUALITY) / 2, "fast"),
+        (NOISE_SIGMA_QUALITY * 2, "quality"),
+    ],
+)
+def test_auto_picks_the_tier_from_measured_noise(sigma, expected):
+    _, meta = preprocess_array(_frame(sigma), mode="auto")
+    assert meta["denoise"] == expected
+
+
+def test_auto_denoises_dark_frames_after_brightening():
+    image, meta = preprocess_array(_frame(0.0, level=DARK_BRIGHTNESS - 10), mode="auto")
+
+    assert meta["brightness_before"] < DARK_BRIGHTNESS
+    assert meta["denoise"] == "quality"
+    assert image.mean() > meta["brightness_before"]
+
+
+def test_explicit_modes_skip_the_noise_estimate_and_resize():
+    image, meta = preprocess_array(np.full((960, 1280, 3), 128, np.uint8), mode="none")
+
+    assert meta["denoise"] == "none" and meta["noise_sigma"] is None
+    assert image.shape == (TARGET_WH[1], TARGET_WH[0], 3)
+    with pytest.raises(ValueError):
+        preprocess_array(image, mode="sharpen")
+
+
+@pytest.fixture
+def burst():
+    frames = [_frame(s, seed=i) for i, s in enumerate((0.0, 5.0, 0.0, 5.0))]
+    yield frames
+    image_preprocess._pool.shutdown()
+
+
+def test_burst_on_the_pool_matches_the_single_image_path(burst):
+    jpegs = [cv2.imencode(".jpg", f)[1].tobytes() for f in burst[:2]]
+    items = jpegs + burst[2:]
+
+    got = preprocess_burst(items, mode="auto", workers=2)
+
+    decoded = [cv2.imdecode(np.frombuffer(j, np.uint8), cv2.IMREAD_COLOR) for j in jpegs]
+    want = [preprocess_array(img, mode="auto") for img in decoded + burst[2:]]
+    assert len(got) == len(want)
+    for (img, meta), (want_img, want_meta) in zip(got, want):
+        assert np.array_equal(img, want_img)
+        assert meta == want_meta
+
+
+def test_burst_in_process_for_one_worker(burst):
+    got = preprocess_burst(burst, mode="fast", workers=1)
+
+    assert [m["denoise"] for _, m in got] == ["fast"] * len(burst)
+    assert np.array_equal(got[0][0], preprocess_array(burst[0], mode="fast")[0])
+    assert preprocess_burst([], workers=2) == []
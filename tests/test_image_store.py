@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+
+from src.storage.image_store import EXTRA_SUFFIX, ImageStore
+from src.utils.timestamp_utils import date_folder, now
+
+
+def _store(tmp_path, **kw) -> ImageStore:
+    kw.setdefault("batch_window_s", 0.0)
+    return ImageStore(roots={"raw": tmp_path / "raw"}, **kw)
+
+
+def test_budget_drops_extras_first_then_oldest(tmp_path):
+    store = _store(tmp_path, max_bytes=10_000).start()
+    day = store.dir_for("raw", now() - timedelta(days=1))
+    store.submit(day / "a_000.jpg", bytes(4000))
+    store.submit(day / f"a_001{EXTRA_SUFFIX}", bytes(4000))
+    store.submit(store.dir_for("raw") / "b_000.jpg", bytes(4000))
+    store.flush()
+
+    res = store.sweep()
+    assert res["deleted"] == 1
+    assert not (day / f"a_001{EXTRA_SUFFIX}").exists()
+    assert (day / "a_000.jpg").exists()
+    assert store.usage()["bytes"] == 8000
+    store.close()
+
+
+def test_old_days_are_removed(tmp_path):
+    store = _store(tmp_path, max_age_days=7).start()
+    old = store.dir_for("raw", now() - timedelta(days=10))
+    store.submit(old / "old.jpg", b"x")
+    store.submit(store.dir_for("raw") / "new.jpg", b"y")
+    store.flush()
+
+    assert store.sweep()["deleted"] == 1
+    assert not old.exists()
+    assert store.usage()["files"] == 1
+    store.close()
+
+
+def test_sweep_skips_files_still_queued(tmp_path):
+    store = _store(tmp_path, max_bytes=0)  # writer not started: submits stay queued
+    path = store.dir_for("raw") / "queued.jpg"
+    store.submit(path, bytes(100))
+
+    assert store.sweep()["deleted"] == 0
+    assert store.usage()["files"] == 1
+
+    store.writer.start()
+    store.flush()
+    assert path.exists()
+    assert store.sweep()["deleted"] == 1
+    assert not path.exists()
+    store.close()
+
+
+def test_scan_rebuilds_index(tmp_path):
+    store = _store(tmp_path).start()
+    store.submit(store.dir_for("raw") / "a.jpg", bytes(10))
+    store.submit(tmp_path / "raw" / "flat_old_layout.jpg", bytes(5))
+    store.close()
+
+    fresh = _store(tmp_path)
+    assert fresh.scan() == 2
+    assert fresh.usage()["bytes"] == 15
+    assert date_folder() in {p.name for p in (tmp_path / "raw").iterdir()}
+
+
+def test_close_writes_what_the_stuck_thread_left_queued(tmp_path):
+    store = _store(tmp_path).start()
+    stuck, release = threading.Event(), threading.Event()
+    write_batch = store.writer._write_batch
+
+    def slow(jobs):
+        if threading.current_thread() in store.writer.threads:
+            stuck.set()
+            release.wait(5)
+        write_batch(jobs)
+
+    store.writer._write_batch = slow
+    paths = [store.dir_for("raw") / f"e_{i:03d}.jpg" for i in range(4)]
+    store.submit(paths[0], b"jpeg")
+    assert stuck.wait(5)
+    for p in paths[1:]:
+        store.submit(p, b"jpeg")
+
+    store.close(timeout=0.2)
+    release.set()
+
+    # The first file was with the thread; close() wrote the other three itself
+    assert all(p.exists() for p in paths[1:])
+    assert store.writer.stats["inline"] == 3
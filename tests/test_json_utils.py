@@ -0,0 +1,122 @@
+# iter_jsonl resume / damage handling and JsonlWriter fsync grouping
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from src.utils import json_utils
+from src.utils.json_utils import JsonlWriter, dumps_line, iter_jsonl
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(json_utils, "orjson", None)
+    return request.param
+
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    calls = []
+    monkeypatch.setattr(json_utils.os, "fsync", lambda fd: calls.append(fd))
+    return calls
+
+
+def test_corrupt_and_blank_lines_are_skipped_and_counted(tmp_path, backend):
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(dumps_line({"n": 1}) + b"{not json\n\n" + dumps_line({"n": 2}))
+    errors = {}
+
+    assert list(iter_jsonl(path, errors=errors)) == [{"n": 1}, {"n": 2}]
+    assert errors == {"corrupt": 1}
+
+
+def test_resume_from_returned_offset(tmp_path, backend):
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(b"".join(dumps_line({"n": i}) for i in range(3)))
+
+    (_, offset), = [(r, o) for r, o in iter_jsonl(path, with_offsets=True) if r["n"] == 0]
+    with path.open("ab") as f:
+        f.write(dumps_line({"n": 3}))
+
+    assert [r["n"] for r in iter_jsonl(path, offset=offset)] == [1, 2, 3]
+
+
+def test_partial_last_line_waits_for_its_newline(tmp_path, backend):
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(dumps_line({"n": 1}) + b'{"n": 2')
+
+    got = list(iter_jsonl(path, with_offsets=True))
+    assert [r for r, _ in got] == [{"n": 1}]
+
+    # The writer finishes the line: resuming picks it up whole
+    with path.open("ab") as f:
+        f.write(b"}\n")
+    assert list(iter_jsonl(path, offset=got[-1][1])) == [{"n": 2}]
+
+
+def test_include_partial_returns_an_unterminated_last_record(tmp_path, backend):
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(dumps_line({"n": 1}) + b'{"n": 2}')
+
+    assert list(iter_jsonl(path)) == [{"n": 1}]
+    assert list(iter_jsonl(path, include_partial=True)) == [{"n": 1}, {"n": 2}]
+
+
+def test_missing_file_yields_nothing(tmp_path):
+    assert list(iter_jsonl(tmp_path / "nope.jsonl")) == []
+
+
+def test_numpy_values_round_trip(tmp_path, backend):
+    path = tmp_path / "log.jsonl"
+    with JsonlWriter(path) as w:
+        w.write({"box": np.array([1, 2, 3]), "score": np.float32(0.5), "ok": np.bool_(True)})
+
+    assert list(iter_jsonl(path)) == [{"box": [1, 2, 3], "score": 0.5, "ok": True}]
+
+
+def test_writer_fsyncs_once_per_group(tmp_path, fsyncs):
+    path = tmp_path / "log.jsonl"
+    w = JsonlWriter(path, fsync_every=3)
+    for i in range(7):
+        w.write({"n": i})
+    assert len(fsyncs) == 2
+    w.write_many([{"n": 7}, {"n": 8}])
+    assert len(fsyncs) == 3
+    w.close()
+
+    assert len(fsyncs) == 3            # nothing left pending at close
+    assert [r["n"] for r in iter_jsonl(path)] == list(range(9))
+
+
+def test_writer_syncs_the_tail_on_close(tmp_path, fsyncs):
+    w = JsonlWriter(tmp_path / "log.jsonl", fsync_every=10)
+    w.write({"n": 0})
+    w.close()
+    w.close()
+
+    assert len(fsyncs) == 1
+
+
+def test_writer_fsyncs_on_the_interval(tmp_path, fsyncs, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(json_utils.time, "monotonic", lambda: clock[0])
+    w = JsonlWriter(tmp_path / "log.jsonl", fsync_interval_s=1.0)
+    w.write({"n": 0})
+    clock[0] += 0.5
+    w.write({"n": 1})
+    assert fsyncs == []
+    clock[0] += 0.5
+    w.write({"n": 2})
+
+    assert len(fsyncs) == 1
+    w.close()
+
+
+def test_writer_without_fsync_policy_never_syncs(tmp_path, fsyncs):
+    with JsonlWriter(tmp_path / "log.jsonl") as w:
+        w.write_many({"n": i} for i in range(50))
+
+    assert fsyncs == []
@@ -0,0 +1,150 @@
+# KnownFaceGallery / build_encodings with the dlib encoder replaced by a stub
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.ai import offline_face_recognition as ofr
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    calls = []
+
+    def fake_encode(img_path: str):
+        calls.append(Path(img_path).parent.name)
+        return [float(len(calls))] * 128
+
+    monkeypatch.setattr(ofr, "_encode_image", fake_encode)
+    # One core: build_encodings stays in-process, where the stub is
+    monkeypatch.setattr(ofr.os, "cpu_count", lambda: 1)
+    return calls
+
+
+def _photo(known: Path, name: str, file: str = "1.jpg") -> None:
+    (known / name).mkdir(parents=True, exist_ok=True)
+    (known / name / file).write_bytes(f"{name}/{file}".encode())
+
+
+def test_photos_added_while_down_are_picked_up_on_start(tmp_path, encoder):
+    known, enc_path = tmp_path / "known", tmp_path / "encodings.json"
+    _photo(known, "alice")
+    assert ofr.KnownFaceGallery(known, enc_path).arrays()[0] == ["alice"]
+
+    # "Restart" with a photo enrolled in between
+    _photo(known, "bob")
+    gallery = ofr.KnownFaceGallery(known, enc_path)
+    assert gallery.arrays()[0] == ["alice", "bob"]
+    assert encoder == ["alice", "bob"]  # alice was not re-encoded
+
+
+def test_unchanged_tree_is_not_re_encoded(tmp_path, encoder):
+    known, enc_path = tmp_path / "known", tmp_path / "encodings.json"
+    _photo(known, "alice")
+    _photo(known, "alice", "2.jpg")
+    ofr.build_encodings(known, enc_path, workers=1)
+    assert len(encoder) == 2
+
+    payload = ofr.build_encodings(known, enc_path, workers=1)
+    assert len(encoder) == 2
+    assert payload["stats"]["reused"] == 2
+
+
+def test_encoding_pool_does_not_fork(tmp_path, monkeypatch):
+    seen = {}
+
+    class RecordingPool:
+        def __init__(self, max_workers=None, mp_context=None):
+            seen["method"] = mp_context.get_start_method() if mp_context else None
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, items, chunksize=1):
+            return [[0.5] * 128 for _ in items]
+
+    monkeypatch.setattr(ofr, "ProcessPoolExecutor", RecordingPool)
+    known = tmp_path / "known"
+    for name in ("alice", "bob", "carol"):
+        _photo(known, name)
+    payload = ofr.build_encodings(known, tmp_path / "encodings.json", workers=2)
+
+    assert seen["method"] == "spawn"
+    assert len(payload["entries"]) == 3
+
+
+# -----------------------------
+# KnownFaceGallery.match
+# -----------------------------
+def _gallery(tmp_path, monkeypatch, photos):
+    """
+    photos: {"name/file.jpg": x}; each photo encodes to x along the first axis.
+    """
+    known = tmp_path / "known"
+    for key in photos:
+        name, file = key.split("/")
+        _photo(known, name, file)
+
+    def fake_encode(img_path: str):
+        p = Path(img_path)
+        return _at(photos[f"{p.parent.name}/{p.name}"]).tolist()
+
+    monkeypatch.setattr(ofr, "_encode_image", fake_encode)
+    monkeypatch.setattr(ofr.os, "cpu_count", lambda: 1)
+    return ofr.KnownFaceGallery(known, tmp_path / "encodings.json")
+
+
+def _at(x: float) -> np.ndarray:
+    v = np.zeros(128, dtype=np.float32)
+    v[0] = x
+    return v
+
+
+def _ranked(cands):
+    return [(c.name, round(c.distance, 3)) for c in cands]
+
+
+def test_min_takes_the_closest_photo_and_centroid_the_mean(tmp_path, monkeypatch):
+    # alice's photos are far apart; bob's single photo sits near her mean
+    gallery = _gallery(tmp_path, monkeypatch, {"alice/1.jpg": 0.0, "alice/2.jpg": 1.0, "bob/1.jpg": 0.45})
+    query = _at(0.1)[None, :]
+
+    assert _ranked(gallery.match(query, aggregate="min")[0]) == [("alice", 0.1), ("bob", 0.35)]
+    assert _ranked(gallery.match(query, aggregate="centroid")[0]) == [("bob", 0.35), ("alice", 0.4)]
+
+
+def test_knn_votes_for_the_person_with_more_close_photos(tmp_path, monkeypatch):
+    photos = {"alice/1.jpg": 0.30, "alice/2.jpg": 0.31, "alice/3.jpg": 0.32, "bob/1.jpg": 0.2}
+    gallery = _gallery(tmp_path, monkeypatch, photos)
+    query = _at(0.0)[None, :]
+
+    assert gallery.match(query, aggregate="min")[0][0].name == "bob"
+    # Distances stay the per-person minimum; only the order comes from the votes
+    assert _ranked(gallery.match(query, aggregate="knn", knn=4)[0]) == [("alice", 0.3), ("bob", 0.2)]
+    # With one neighbour knn is just the nearest photo
+    assert gallery.match(query, aggregate="knn", knn=1)[0][0].name == "bob"
+
+
+def test_top_k_limits_and_orders_candidates_per_query(tmp_path, monkeypatch):
+    gallery = _gallery(tmp_path, monkeypatch, {f"p{i}/1.jpg": float(i) for i in range(5)})
+    queries = np.stack([_at(0.1), _at(3.8)])
+
+    got = gallery.match(queries, top_k=3)
+    assert [[c.name for c in row] for row in got] == [["p0", "p1", "p2"], ["p4", "p3", "p2"]]
+    assert len(gallery.match(queries, top_k=10)[0]) == 5
+    assert len(gallery.match(queries, top_k=0)[0]) == 1
+
+
+def test_match_edge_cases(tmp_path, monkeypatch):
+    gallery = _gallery(tmp_path, monkeypatch, {"alice/1.jpg": 0.0})
+
+    assert gallery.match(np.zeros((0, 128))) == []
+    with pytest.raises(ValueError):
+        gallery.match(_at(0.0), aggregate="median")
+    empty = ofr.KnownFaceGallery(tmp_path / "nobody", tmp_path / "none.json")
+    assert empty.match(np.stack([_at(0.0), _at(1.0)])) == [[], []]
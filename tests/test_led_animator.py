@@ -0,0 +1,111 @@
+# LEDAnimator / LEDControl timing on the simulated strip (no GPIO)
+from __future__ import annotations
+
+import statistics
+import time
+
+import pytest
+
+from src.sensors.led_animator import BLACK, WHITE, LEDAnimator, SimulatedPixelStrip, hold_then_fill
+from src.sensors.led_control import LEDControl, SimulatedLED
+
+RED = (255, 0, 0)
+
+
+def frames(n: int, color=RED):
+    def effect(strip):
+        for i in range(n):
+            strip[i % len(strip)] = color
+            yield
+    return effect
+
+
+def forever(strip):
+    i = 0
+    while True:
+        strip[i % len(strip)] = RED
+        i += 1
+        yield
+
+
+@pytest.fixture
+def strip():
+    # auto_write off: one history entry per frame the animator pushes out
+    return SimulatedPixelStrip(n=10, auto_write=False)
+
+
+@pytest.fixture
+def animator(strip):
+    anim = LEDAnimator(strip, fps=50.0)
+    yield anim
+    anim.close()
+
+
+def _wait_idle(animator: LEDAnimator, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while animator.busy() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert not animator.busy()
+
+
+def test_frames_are_spaced_at_the_frame_rate(strip, animator):
+    animator.play(frames(20))
+    _wait_idle(animator)
+
+    times = [t for t, _ in strip.history]
+    assert len(times) == 20
+    gaps = [b - a for a, b in zip(times, times[1:])]
+    assert statistics.median(gaps) == pytest.approx(0.02, abs=0.005)
+    # Absolute deadlines: 19 gaps take 19 frame periods, not more
+    assert times[-1] - times[0] == pytest.approx(19 * 0.02, abs=0.03)
+
+
+def test_fill_cancels_the_running_effect(strip, animator):
+    animator.play(forever)
+    time.sleep(0.1)
+    assert animator.busy()
+
+    animator.fill(BLACK)
+    assert not animator.busy()
+    assert strip.pixels == [BLACK] * 10  # applied at once, in the caller's thread
+    shown = len(strip.history)
+    time.sleep(0.1)
+    assert len(strip.history) == shown
+    assert strip.pixels == [BLACK] * 10
+
+
+def test_hold_then_fill(strip, animator):
+    animator.fill(WHITE)
+    t0 = time.monotonic()
+    animator.play(hold_then_fill(0.2, BLACK))
+    time.sleep(0.1)
+    assert strip.pixels == [WHITE] * 10
+
+    _wait_idle(animator)
+    went_dark = next(t for t, px in strip.history if px == [BLACK] * 10)
+    assert went_dark - t0 == pytest.approx(0.2, abs=0.05)
+
+
+def test_play_replaces_the_running_effect(strip, animator):
+    animator.play(forever)
+    time.sleep(0.05)
+    animator.play(frames(3, color=WHITE))
+    _wait_idle(animator)
+    assert strip.pixels[:3] == [WHITE] * 3
+
+
+def test_led_control_without_gpio():
+    strip, led = SimulatedPixelStrip(n=10), SimulatedLED()
+    control = LEDControl(pixels=strip, led=led, fps=100.0)
+
+    control.on()
+    assert led.is_lit
+    assert strip.pixels == [WHITE] * 10  # lit before the sweep starts
+
+    control.off(hold_s=0.05)
+    assert not led.is_lit
+    _wait_idle(control.animator)
+    assert strip.pixels == [BLACK] * 10
+
+    control.close()
+    assert led.closed
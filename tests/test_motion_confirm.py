@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from src.ai.motion_confirm import MotionConfirmer, region_mask
+from src.camera.frame import Frame
+
+
+def _frame(i: int, box_x: int = -1) -> Frame:
+    img = np.full((480, 640, 3), 120, dtype=np.uint8)
+    if box_x >= 0:
+        img[150:350, box_x:box_x + 120] = 30  # a dark "person"
+    return Frame(name=f"f{i}", timestamp="t", jpeg=cv2.imencode(".jpg", img)[1].tobytes())
+
+
+def test_exclude_covering_everything_is_rejected():
+    with pytest.raises(ValueError):
+        MotionConfirmer(exclude=[(0.0, 0.0, 1.0, 1.0)])
+    with pytest.raises(ValueError):
+        MotionConfirmer(include=[(0.1, 0.1, 0.4, 0.4)], exclude=[(0.0, 0.0, 0.5, 0.5)])
+
+
+def test_region_mask_include_minus_exclude():
+    mask = region_mask((10, 10), include=[(0.0, 0.0, 0.5, 1.0)], exclude=[(0.0, 0.0, 0.5, 0.5)])
+    assert mask.sum() == 25
+    assert mask[5:, :5].all()
+
+
+def test_static_scene_rejected_moving_object_confirmed():
+    confirmer = MotionConfirmer()
+    assert not confirmer.check([_frame(i) for i in range(4)]).confirmed
+    assert confirmer.check([_frame(i, box_x=100 + 60 * i) for i in range(4)]).confirmed
+
+
+def test_motion_only_in_excluded_region_rejected():
+    confirmer = MotionConfirmer(exclude=[(0.0, 0.0, 0.6, 1.0)])
+    assert not confirmer.check([_frame(i, box_x=40 + 40 * i) for i in range(4)]).confirmed
@@ -0,0 +1,94 @@
+# NotifierWorker against a local fake Bot API server (tests/conftest.py)
+from __future__ import annotations
+
+import time
+
+import pytest
+
+pytest.importorskip("telegram")
+
+from src.notifications import telegram_notifier
+from src.notifications.notifier_worker import NotifierWorker
+from src.notifications.outbox import Outbox
+from src.notifications.telegram_notifier import TelegramConfig
+
+EVENT = {"verdict": {"level": "HIGH", "person_detected": True, "face_detected": True}, "faces": [], "objects": []}
+
+
+@pytest.fixture
+def outbox(tmp_path, monkeypatch):
+    box = Outbox(tmp_path / "outbox.sqlite3", base_backoff_s=0.0)
+    monkeypatch.setattr(telegram_notifier, "_outbox", box)
+    yield box
+    box.close()
+
+
+def _worker(fake, **kw) -> NotifierWorker:
+    cfg = TelegramConfig(bot_token="123456:TEST", chat_id="42", base_url=fake.base_url)
+    kw.setdefault("flush_every_s", 60.0)
+    return NotifierWorker(cfg=cfg, **kw).start()
+
+
+def test_sends_photo_from_memory(fake_telegram, outbox):
+    worker = _worker(fake_telegram)
+    assert worker.submit(EVENT, photo_bytes=b"\xff\xd8jpeg" * 100)
+    assert worker.submit(EVENT)
+    worker.stop()
+
+    assert fake_telegram.methods() == ["sendPhoto", "sendMessage"]
+    assert worker.stats["sent"] == 2
+    assert worker.stats["bytes_sent"] == 600
+    assert len(outbox) == 0
+
+
+def test_failed_send_goes_to_outbox(fake_telegram, outbox):
+    fake_telegram.fail_with(500)
+    worker = _worker(fake_telegram)
+    worker.submit(EVENT)
+    worker.stop()
+
+    assert worker.stats["queued_for_retry"] == 1
+    assert len(outbox) == 1
+
+
+def test_full_queue_spills_to_outbox(fake_telegram, outbox):
+    fake_telegram.close_gate()
+    worker = _worker(fake_telegram, max_queue=1)
+
+    assert worker.submit(EVENT)                      # taken by the worker, hangs in the upload
+    assert fake_telegram.arrived.wait(5)
+    assert worker.submit(EVENT)                      # waits in the queue
+    assert not worker.submit(EVENT)                  # queue full: straight to the outbox
+    assert worker.stats["spilled"] == 1
+    assert [j["reason"] for _, j in outbox.due()] == ["LocalQueueFull"]
+
+    fake_telegram.open_gate()
+    worker.stop()
+    assert worker.stats["sent"] == 2
+
+
+def test_stop_moves_pending_alerts_to_outbox(fake_telegram, outbox):
+    fake_telegram.close_gate()
+    worker = _worker(fake_telegram, max_queue=4)
+    for _ in range(3):
+        worker.submit(EVENT)
+    assert fake_telegram.arrived.wait(5)
+
+    worker.stop(timeout=0.3)                         # the first upload is still hanging
+    assert [j["reason"] for _, j in outbox.due()] == ["ShutdownPending", "ShutdownPending"]
+    fake_telegram.open_gate()
+
+
+def test_outbox_drains_under_steady_traffic(fake_telegram, outbox):
+    for i in range(3):
+        outbox.enqueue({"text": f"retry {i}", "attempts": 1})
+    worker = _worker(fake_telegram, flush_every_s=0.2)
+
+    # An alert every 50 ms: the worker is never idle for flush_every_s
+    deadline = time.monotonic() + 2.0
+    while len(outbox) and time.monotonic() < deadline:
+        worker.submit(EVENT)
+        time.sleep(0.05)
+    assert len(outbox) == 0
+    worker.stop()
+    assert worker.stats["flushed"] == 3
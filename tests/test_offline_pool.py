@@ -0,0 +1,91 @@
+# The offline burst path must keep dlib out of the main process, even when the pool breaks
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from src.ai import offline_pool
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_SCRIPT = textwrap.dedent("""
+    import sys
+    import cv2
+    import numpy as np
+    from src.ai import offline_pool
+
+    ok, jpeg = cv2.imencode(".jpg", np.full((120, 160, 3), 128, dtype=np.uint8))
+    tracked = offline_pool.recognize_burst([jpeg.tobytes()], detection="fast", workers=2)
+    offline_pool.shutdown()
+    print(len(tracked.per_frame), "dlib" in sys.modules)
+""")
+
+
+def test_single_frame_burst_runs_on_the_pool(tmp_path):
+    pytest.importorskip("face_recognition")
+
+    # Fresh interpreter, run from tmp_path so the default gallery lands there
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    out = subprocess.run(
+        [sys.executable, "-c", _SCRIPT], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120, check=True,
+    )
+
+    assert out.stdout.split() == ["1", "False"]
+
+
+class _FakePool:
+    def __init__(self, fail_times: int) -> None:
+        self.fail_times = fail_times
+        self.workers = []
+        self.shutdowns = 0
+
+    def get(self, workers=None):
+        self.workers.append(workers)
+        return self
+
+    def map(self, fn, items):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise BrokenProcessPool("worker died")
+        return map(fn, items)
+
+    def shutdown(self):
+        self.shutdowns += 1
+
+
+def _boom(item):
+    raise AssertionError("ran in the main process")
+
+
+def test_one_worker_still_uses_the_pool(monkeypatch):
+    pool = _FakePool(fail_times=0)
+    monkeypatch.setattr(offline_pool, "_pool", pool)
+
+    assert offline_pool._run(abs, [-1, -2], workers=1) == [1, 2]
+    assert pool.workers == [1]
+
+
+def test_broken_pool_is_rebuilt_and_retried_once(monkeypatch):
+    pool = _FakePool(fail_times=1)
+    monkeypatch.setattr(offline_pool, "_pool", pool)
+
+    assert offline_pool._run(abs, [-3], workers=2) == [3]
+    assert pool.shutdowns == 1
+
+
+def test_pool_that_keeps_breaking_makes_offline_unavailable(monkeypatch, caplog):
+    pool = _FakePool(fail_times=4)
+    monkeypatch.setattr(offline_pool, "_pool", pool)
+
+    assert offline_pool._run(_boom, [1], workers=2) is None
+    tracked = offline_pool.recognize_burst([b"a", b"b"], workers=2)
+
+    assert pool.shutdowns == 4
+    assert tracked.per_frame == [[], []] and tracked.tracks == []
+    assert "unavailable" in caplog.text
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from src.notifications.outbox import Outbox
+
+
+def test_len_tracks_enqueue_ack_and_reopen(tmp_path):
+    path = tmp_path / "outbox.sqlite3"
+    outbox = Outbox(path)
+    first = outbox.enqueue({"text": "a"})
+    outbox.enqueue_many([{"text": "b"}, {"text": "c"}])
+    assert len(outbox) == 3
+
+    outbox.ack(first)
+    outbox.ack(first)  # already gone: no double count
+    assert len(outbox) == 2
+    outbox.close()
+
+    assert len(Outbox(path)) == 2
+
+
+def test_retry_pushes_job_out_of_due(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.sqlite3", base_backoff_s=60.0)
+    job_id = outbox.enqueue({"text": "a"})
+    assert [j for j, _ in outbox.due()] == [job_id]
+
+    assert outbox.retry(job_id) >= 60.0 * 0.8
+    assert outbox.due() == []
+    assert len(outbox) == 1
@@ -0,0 +1,97 @@
+# Stage drop policies and shutdown
+from __future__ import annotations
+
+import threading
+import time
+
+from src.pipeline import BLOCK, DROP_NEWEST, DROP_OLDEST, Pipeline, Stage
+from src.utils.queue_worker import STOP
+
+
+class _Gate:
+    """Handler that records items and holds each one until released."""
+
+    def __init__(self) -> None:
+        self.seen = []
+        self.started = threading.Semaphore(0)
+        self.release = threading.Event()
+
+    def __call__(self, item):
+        self.seen.append(item)
+        self.started.release()
+        self.release.wait(5)
+        return None
+
+
+def _queued(stage: Stage):
+    return list(stage.jobs.queue)
+
+
+def test_drop_newest_refuses_items_when_full():
+    stage = Stage("s", lambda x: None, maxsize=2, policy=DROP_NEWEST)
+
+    assert [stage.put(i) for i in range(3)] == [True, True, False]
+    assert _queued(stage) == [0, 1]
+    assert stage.stats()["dropped"] == 1 and stage.stats()["accepted"] == 2
+
+
+def test_drop_oldest_evicts_to_keep_the_freshest():
+    stage = Stage("s", lambda x: None, maxsize=2, policy=DROP_OLDEST)
+
+    assert [stage.put(i) for i in range(4)] == [True, True, True, True]
+    assert _queued(stage) == [2, 3]
+    assert stage.stats()["dropped"] == 2
+
+
+def test_block_waits_for_room():
+    gate = _Gate()
+    stage = Stage("s", gate, maxsize=1, policy=BLOCK).start()
+    stage.put(0)
+    gate.started.acquire(timeout=5)  # worker holds 0, queue is empty
+    stage.put(1)                     # queue is full now
+
+    done = threading.Event()
+    threading.Thread(target=lambda: (stage.put(2), done.set()), daemon=True).start()
+    assert not done.wait(0.2)
+    gate.release.set()
+    assert done.wait(5)
+    stage.stop(timeout=5)
+    assert gate.seen == [0, 1, 2]
+
+
+def test_downstream_gets_the_handlers_output():
+    out = []
+    pipe = Pipeline([Stage("double", lambda x: x * 2), Stage("sink", out.append, maxsize=8, policy=BLOCK)])
+    pipe.start()
+    for i in range(3):
+        pipe.put(i)
+        time.sleep(0.05)
+    pipe.stop()
+
+    assert out == [0, 2, 4]
+
+
+def test_drop_oldest_never_evicts_the_stop_marker():
+    stage = Stage("s", lambda x: None, maxsize=1, policy=DROP_OLDEST)
+    stage.jobs.put(STOP)
+
+    assert stage.put("late") is False
+    assert _queued(stage) == [STOP]
+
+
+def test_stop_while_full_and_busy_still_joins():
+    gate = _Gate()
+    stage = Stage("s", gate, maxsize=1, policy=DROP_OLDEST).start()
+    stage.put("a")
+    gate.started.acquire(timeout=5)   # worker is busy with "a"
+
+    stopper = threading.Thread(target=stage.stop, kwargs={"timeout": 5}, daemon=True)
+    stopper.start()
+    time.sleep(0.1)                   # the stop marker is queued behind "a"
+    assert stage.put("late") is False
+    gate.release.set()
+
+    t0 = time.monotonic()
+    stopper.join(5)
+    assert not stopper.is_alive() and time.monotonic() - t0 < 2
+    assert gate.seen == ["a"] and stage.threads == []
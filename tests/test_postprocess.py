@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.ai.face_tracker import blur_factor
+from src.ai.postprocess import normalize_google_faces
+from src.notifications.telegram_notifier import summarize_emotion
+
+vision = pytest.importorskip("google.cloud.vision")
+
+
+def _face(**likelihoods):
+    box = SimpleNamespace(vertices=[SimpleNamespace(x=10, y=20), SimpleNamespace(x=60, y=90)])
+    kw = {f"{k}_likelihood": vision.Likelihood.VERY_UNLIKELY
+          for k in ("joy", "anger", "sorrow", "surprise", "blurred", "under_exposed")}
+    kw.update({f"{k}_likelihood": v for k, v in likelihoods.items()})
+    return SimpleNamespace(bounding_poly=box, detection_confidence=0.9, **kw)
+
+
+def test_likelihoods_are_stored_by_name():
+    (face,) = normalize_google_faces([_face(blurred=vision.Likelihood.VERY_LIKELY, joy=vision.Likelihood.LIKELY)])
+
+    assert face["quality"] == {"blurred": "VERY_LIKELY", "underexposed": "VERY_UNLIKELY"}
+    assert face["emotion"]["joy"] == "LIKELY"
+
+
+def test_blurred_faces_are_down_weighted():
+    sharp, blurred = normalize_google_faces([_face(), _face(blurred=vision.Likelihood.VERY_LIKELY)])
+
+    assert blur_factor(sharp["quality"]["blurred"]) == 1.0
+    assert blur_factor(blurred["quality"]["blurred"]) == 0.1
+
+
+def test_emotions_are_scored():
+    faces = normalize_google_faces([_face(joy=vision.Likelihood.VERY_LIKELY), _face(joy=vision.Likelihood.POSSIBLE)])
+
+    assert summarize_emotion(faces)["top_emotions"][0] == ("joy", 8)
@@ -0,0 +1,76 @@
+# GoogleVisionClient.analyze_burst against the local annotator stub
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("google.cloud.vision")
+
+from benchmarks.vision_stub import StubAnnotatorClient, _response
+from src.cloud.google_vision_client import MAX_IMAGES_PER_BATCH, GoogleVisionClient, VisionConfig
+
+
+class TaggingStub(StubAnnotatorClient):
+    """Labels each response with the content it was asked about; can fail one image."""
+
+    def __init__(self, fail_content: bytes = b"") -> None:
+        super().__init__(rtt_s=0.0)
+        self.fail_content = fail_content
+
+    def respond(self, request):
+        resp = _response()
+        content = bytes(request.image.content)
+        resp.label_annotations = [SimpleNamespace(description=content.decode(), score=1.0)]
+        if content == self.fail_content:
+            resp.error = SimpleNamespace(message="quota exceeded")
+        return resp
+
+
+def _client(stub: StubAnnotatorClient, **kw) -> GoogleVisionClient:
+    # upload_long_edge=0: images go out untouched, so the stub can read them back
+    return GoogleVisionClient(VisionConfig(upload_long_edge=0, **kw), client=stub)
+
+
+def _frames(n: int):
+    return [f"frame-{i}".encode() for i in range(n)]
+
+
+def test_result_shape_and_order():
+    stub = TaggingStub()
+    results = _client(stub).analyze_burst(_frames(5))
+
+    assert len(results) == 5
+    for i, r in enumerate(results):
+        assert set(r) == {"faces", "labels", "objects"}
+        assert r["labels"] == [{"label": f"frame-{i}", "confidence": 1.0}]
+        assert r["objects"][0]["label"] == "Person"
+        assert len(r["faces"]) == 1
+    assert stub.rpcs == 1
+
+
+def test_empty_burst_makes_no_call():
+    stub = TaggingStub()
+    assert _client(stub).analyze_burst([]) == []
+    assert stub.rpcs == 0
+
+
+def test_timeout_is_passed():
+    stub = TaggingStub()
+    _client(stub, timeout_seconds=7).analyze_burst(_frames(3))
+    assert stub.timeouts == [7]
+
+
+def test_per_image_error_raises():
+    stub = TaggingStub(fail_content=b"frame-2")
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        _client(stub).analyze_burst(_frames(4))
+
+
+def test_large_burst_is_split_into_batches():
+    stub = TaggingStub()
+    n = MAX_IMAGES_PER_BATCH * 2 + 3
+    results = _client(stub, max_concurrent_batches=2).analyze_burst(_frames(n))
+
+    assert sorted(stub.batch_sizes) == [3, MAX_IMAGES_PER_BATCH, MAX_IMAGES_PER_BATCH]
+    assert [r["labels"][0]["label"] for r in results] == [f"frame-{i}" for i in range(n)]
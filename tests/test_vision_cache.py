@@ -0,0 +1,114 @@
+# VisionCache lookups / expiry / eviction and burst de-duplication in run_google_on_burst
+from __future__ import annotations
+
+import cv2
+import numpy as np
+
+from src.camera.frame import Frame
+from src.cloud.vision_cache import BURST_MAX_DISTANCE, VisionCache, dhash, group_near_duplicates, hamming
+
+
+def _faces(x: int):
+    return [{"bbox_xyxy": [x, 10, x + 50, 60], "emotion": {"joy": "LIKELY"}}]
+
+
+def test_lookup_hits_the_closest_entry_within_max_distance():
+    cache = VisionCache(max_distance=3)
+    cache.put(0b0000, _faces(1), [], now=0.0)
+    cache.put(0b1111_0000, _faces(2), [], now=0.0)
+
+    assert cache.get(0b0001, now=1.0)[0] == _faces(1)
+    assert cache.get(0b1110_0000, now=1.0)[0] == _faces(2)
+    assert cache.get(0b1111_1111, now=1.0) is None    # 4 bits from both
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_hits_are_copies():
+    cache = VisionCache()
+    cache.put(7, _faces(1), [], now=0.0)
+    cache.get(7, now=0.0)[0][0]["track_id"] = 3
+
+    assert "track_id" not in cache.get(7, now=0.0)[0][0]
+
+
+def test_entries_expire_after_ttl():
+    cache = VisionCache(ttl_s=30.0)
+    cache.put(7, _faces(1), [], now=100.0)
+
+    assert cache.get(7, now=129.9) is not None
+    assert cache.get(7, now=130.0) is None
+    assert len(cache) == 0 and cache.stats()["expired"] == 1 and cache.stats()["bytes"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes():
+    one = VisionCache()
+    one.put(0, _faces(1), [], now=0.0)
+    cache = VisionCache(max_distance=0, max_bytes=3 * one.stats()["bytes"])
+    for h in (1, 2, 3):
+        cache.put(h, _faces(1), [], now=0.0)
+    cache.get(1, now=0.0)              # 2 is now the least recently used
+    cache.put(4, _faces(1), [], now=0.0)
+
+    assert [h for h in (1, 2, 3, 4) if cache.get(h, now=0.0) is not None] == [1, 3, 4]
+    assert cache.stats()["evicted"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_grouping_points_each_hash_at_its_first_near_duplicate():
+    assert group_near_duplicates([0b0000, 0b1111_0000, 0b0001, 0b1111_0011, 0b0111], max_distance=2) == [0, 1, 0, 1, 4]
+
+
+# -----------------------------
+# run_google_on_burst
+# -----------------------------
+class _CountingVision:
+    def __init__(self) -> None:
+        self.sent = 0
+
+    def analyze_burst(self, images):
+        out = []
+        for jpeg in images:
+            self.sent += 1
+            out.append({"faces": [], "objects": [{"label": "person", "confidence": 0.9, "bbox_xyxy": [self.sent] * 4}]})
+        return out
+
+
+def _scene(dx: int) -> bytes:
+    # Textured background with a bright "visitor" block dx pixels further along
+    rng = np.random.default_rng(0)
+    img = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (0, 0), 8)
+    img[120:360, 100 + dx:260 + dx] = 230
+    ok, jpeg = cv2.imencode(".jpg", img)
+    return jpeg.tobytes()
+
+
+def test_moving_visitor_never_gets_another_frames_boxes():
+    from src.main import run_google_on_burst
+
+    jpegs = [_scene(dx) for dx in (0, 40, 80)]
+    vision = _CountingVision()
+
+    results = run_google_on_burst(vision, [Frame(f"f{i}", "t", j) for i, j in enumerate(jpegs)], cache=VisionCache())
+
+    # 0 -> 40 px is 5 bits: both frames are sent. 40 -> 80 px is only 2 bits, so the last
+    # frame rides on the second one's request but keeps just its labels
+    assert hamming(dhash(jpegs[0]), dhash(jpegs[1])) > BURST_MAX_DISTANCE
+    assert vision.sent == 2
+    assert [r["objects"][0].get("bbox_xyxy") for r in results] == [[1] * 4, [2] * 4, None]
+
+
+def test_duplicate_frames_share_one_request():
+    from src.main import run_google_on_burst
+
+    vision = _CountingVision()
+    cache = VisionCache()
+    burst = [Frame(f"f{i}", "t", _scene(0)) for i in range(3)]
+
+    results = run_google_on_burst(vision, burst, cache=cache)
+
+    assert vision.sent == 1
+    assert cache.stats()["deduped"] == 2
+    # The duplicates borrow the labels, never the boxes
+    assert results[0]["objects"][0]["bbox_xyxy"] == [1, 1, 1, 1]
+    assert [r["objects"] for r in results[1:]] == [[{"label": "person", "confidence": 0.9}]] * 2
+    assert [r["faces"] for r in results[1:]] == [[], []]